@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Date Parsing Micro-Benchmark.
+
+Compares the per-event cost of parsing EventKit helper dates with the original
+four-format strptime loop against the current DateParser.
+
+Usage:
+    python benchmarks/bench_date_parsing.py [--events 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mac_calendar_exporter.calendar.calendar_event import DateParser
+
+
+def legacy_parse(date_string: str) -> datetime:
+    """Parse a date the way ICSGenerator._parse_macos_date originally did."""
+    if date_string.startswith("date "):
+        date_string = date_string[5:]
+
+    formats = [
+        "%A, %B %d, %Y at %I:%M:%S %p",
+        "%Y-%m-%d %H:%M:%S %z",
+        "%Y-%m-%dT%H:%M:%S%z",
+        "%Y-%m-%d %H:%M:%S",
+    ]
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+
+    import dateutil.parser
+    return dateutil.parser.parse(date_string)
+
+
+def make_dates(count: int):
+    """Build start/end date strings in the EventKit helper format."""
+    base = datetime(2024, 1, 1, 8, 0, 0)
+    dates = []
+    for i in range(count):
+        start = base + timedelta(minutes=37 * i)
+        dates.append(start.strftime("%Y-%m-%d %H:%M:%S"))
+        dates.append((start + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"))
+    return dates
+
+
+def main():
+    """Run the benchmark and print the per-event cost of each parser."""
+    parser = argparse.ArgumentParser(description="Benchmark event date parsing")
+    parser.add_argument("--events", type=int, default=20000, help="Number of events (two dates each)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timing runs (best is reported)")
+    args = parser.parse_args()
+
+    dates = make_dates(args.events)
+
+    def run_legacy():
+        for date_string in dates:
+            legacy_parse(date_string)
+
+    def run_current():
+        date_parser = DateParser()
+        for date_string in dates:
+            date_parser.parse(date_string)
+
+    # Both parsers must agree before their speed is worth comparing
+    date_parser = DateParser()
+    assert all(legacy_parse(d) == date_parser.parse(d) for d in dates[:1000])
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    current = min(timeit.repeat(run_current, number=1, repeat=args.repeat))
+
+    print(f"Events: {args.events} ({len(dates)} dates)")
+    print(f"Legacy strptime loop: {legacy / args.events * 1e6:8.2f} us/event")
+    print(f"DateParser:           {current / args.events * 1e6:8.2f} us/event")
+    print(f"Speedup:              {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+End-to-End Export Pipeline Benchmark.
+
+Runs the export pipeline against the fake EventKit helper with canned calendars
+of several sizes and times each stage: fetch (helper process and pipe), parse
+(JSON decoding), build (CalendarEvent models), render (VEVENT serialization),
+write (ICS file output) and upload (to the local SFTP server stand-in). The
+stages run as one streaming pass, as in a real export, and each stage's time
+excludes the stages feeding it. The end-to-end time goes through
+EventKitCalendarAccess and ICSGenerator.generate_ics unchanged.
+
+Results can be written as JSON and compared with an earlier run, e.g. from the
+previous commit, to spot regressions.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--events 1000 10000 100000] [--repeat 3] [--json results.json]
+    python benchmarks/bench_pipeline.py --compare baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent, DateParser
+from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
+from mac_calendar_exporter.ics.ics_generator import ICSGenerator
+from fake_eventkit_helper import DATA_ENV, write_canned_events
+
+HELPER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_eventkit_helper.py")
+
+STAGES = ["fetch", "parse", "build", "render", "write", "upload"]
+
+
+class StageTimer:
+    """Accumulates the time spent in each pipeline stage."""
+
+    def __init__(self):
+        """Initialize the StageTimer."""
+        self.inclusive = {}
+
+    def iterate(self, iterable: Iterable, stage: str) -> Iterator:
+        """Yield from an iterable, timing only the calls that produce items."""
+        iterator = iter(iterable)
+        total = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    total += time.perf_counter() - started
+                yield item
+        finally:
+            self.inclusive[stage] = total
+
+
+class TimedWriter:
+    """Binary stream that times writes to the underlying file."""
+
+    def __init__(self, raw):
+        """
+        Initialize the TimedWriter.
+
+        Args:
+            raw: Binary file object to write to
+        """
+        self.raw = raw
+        self.elapsed = 0.0
+
+    def write(self, data: bytes) -> int:
+        started = time.perf_counter()
+        written = self.raw.write(data)
+        self.elapsed += time.perf_counter() - started
+        return written
+
+    def sync(self) -> None:
+        """Flush the file to disk, counting the time as writing."""
+        started = time.perf_counter()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.elapsed += time.perf_counter() - started
+
+
+def make_helper_wrapper(work_dir: str) -> str:
+    """Create an executable that runs the fake helper with this interpreter."""
+    wrapper = os.path.join(work_dir, "eventkit_calendar")
+    with open(wrapper, "w") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{HELPER_SCRIPT}" "$@"\n')
+    os.chmod(wrapper, os.stat(wrapper).st_mode | stat.S_IXUSR)
+    return wrapper
+
+
+def staged_run(helper: str, output_file: str, include_details: bool, collapse_recurring: bool) -> Dict[str, float]:
+    """
+    Run fetch, parse, build, render and write as one streaming pass.
+
+    Args:
+        helper: Helper executable
+        output_file: ICS file to write
+        include_details: Whether to render descriptions and locations
+        collapse_recurring: Whether to write recurring events as RRULE series
+
+    Returns:
+        Dict[str, float]: Seconds spent in each stage, excluding upstream stages
+    """
+    timer = StageTimer()
+    date_parser = DateParser()
+    process = subprocess.Popen([helper, "--events", "--ndjson"], stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    try:
+        lines = timer.iterate(process.stdout, "fetch")
+        records = timer.iterate((json.loads(line) for line in lines), "parse")
+        events = timer.iterate(
+            (CalendarEvent.from_dict(record, date_parser) for record in records if record.get("type") == "event"),
+            "build",
+        )
+
+        with open(output_file, "wb") as f:
+            writer = TimedWriter(f)
+            started = time.perf_counter()
+            ICSGenerator().write_ics(writer, events, include_details=include_details, title_length_limit=0,
+                                     collapse_recurring=collapse_recurring)
+            writer.sync()
+            total = time.perf_counter() - started
+    finally:
+        process.wait()
+
+    fetch = timer.inclusive["fetch"]
+    parse = timer.inclusive["parse"]
+    build = timer.inclusive["build"]
+    return {
+        "fetch": fetch,
+        "parse": parse - fetch,
+        "build": build - parse,
+        "render": total - build - writer.elapsed,
+        "write": writer.elapsed,
+    }
+
+
+def end_to_end_run(helper: str, output_file: str, include_details: bool, collapse_recurring: bool) -> float:
+    """Export through EventKitCalendarAccess and ICSGenerator.generate_ics, returning seconds."""
+    started = time.perf_counter()
+    calendar_access = EventKitCalendarAccess(helper_path=helper)
+    ICSGenerator().generate_ics(
+        calendar_access.iter_events(days_ahead=30),
+        output_file=output_file,
+        include_details=include_details,
+        title_length_limit=0,
+        collapse_recurring=collapse_recurring,
+    )
+    return time.perf_counter() - started
+
+
+def upload_run(local_file: str, repeat: int) -> Optional[float]:
+    """Upload a file to the local SFTP server stand-in, returning the best seconds."""
+    try:
+        from mac_calendar_exporter.sftp.sftp_uploader import SFTPUploader
+        from sftp_server import LocalSFTPServer
+    except ImportError as e:
+        print(f"Skipping upload stage: {e}")
+        return None
+
+    with tempfile.TemporaryDirectory() as root:
+        with LocalSFTPServer(root) as server:
+            uploader = SFTPUploader(server.host, server.port, username="bench", password="bench")
+            if not uploader.connect():
+                print("Could not connect to the local SFTP server")
+                return None
+            try:
+                best = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    uploader.upload_file(local_file, "/calendar.ics", skip_unchanged=False)
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                return best
+            finally:
+                uploader.disconnect()
+
+
+def benchmark_size(count: int, work_dir: str, helper: str, args) -> Dict:
+    """Benchmark all stages for one calendar size, keeping the best of each."""
+    data_file = os.path.join(work_dir, f"events_{count}.ndjson")
+    write_canned_events(data_file, count, seed=args.seed)
+    os.environ[DATA_ENV] = data_file
+    output_file = os.path.join(work_dir, f"calendar_{count}.ics")
+
+    stages = {}
+    for _ in range(args.repeat):
+        for stage, seconds in staged_run(helper, output_file, args.details, args.collapse).items():
+            stages[stage] = min(seconds, stages.get(stage, seconds))
+
+    end_to_end = min(end_to_end_run(helper, output_file, args.details, args.collapse) for _ in range(args.repeat))
+    if not args.no_upload:
+        upload = upload_run(output_file, args.repeat)
+        if upload is not None:
+            stages["upload"] = upload
+
+    return {
+        "events": count,
+        "ndjson_bytes": os.path.getsize(data_file),
+        "ics_bytes": os.path.getsize(output_file),
+        "stages": {stage: round(seconds, 4) for stage, seconds in stages.items()},
+        "end_to_end": round(end_to_end, 4),
+        "events_per_second": round(count / end_to_end),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit of the repository, if it is a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(HELPER_SCRIPT), capture_output=True, text=True, check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict]) -> None:
+    """Print a table of stage times, with changes against a baseline run if given."""
+    baseline_by_size = {entry["events"]: entry for entry in (baseline or {}).get("results", [])}
+    columns = STAGES + ["end_to_end"]
+    print(f"{'Events':>9}" + "".join(f"{name:>12}" for name in columns) + "   (seconds)")
+    for result in results:
+        values = dict(result["stages"], end_to_end=result["end_to_end"])
+        print(f"{result['events']:>9}" + "".join(
+            f"{values[name]:>12.3f}" if name in values else f"{'-':>12}" for name in columns
+        ))
+
+        previous = baseline_by_size.get(result["events"])
+        if previous:
+            previous_values = dict(previous["stages"], end_to_end=previous["end_to_end"])
+            changes = []
+            for name in columns:
+                if values.get(name) and previous_values.get(name):
+                    changes.append(f"{(values[name] / previous_values[name] - 1) * 100:>+11.1f}%")
+                else:
+                    changes.append(f"{'-':>12}")
+            print(f"{'vs base':>9}" + "".join(changes))
+
+
+def main():
+    """Run the benchmark for each calendar size and print the stage times."""
+    parser = argparse.ArgumentParser(description="Benchmark the export pipeline with a fake EventKit helper")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Calendar sizes in events (up to 1000000 and more)")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timing runs (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the canned calendars")
+    parser.add_argument("--details", action="store_true", help="Render descriptions and locations")
+    parser.add_argument("--collapse", action="store_true", help="Write recurring events as RRULE series")
+    parser.add_argument("--no-upload", action="store_true", help="Skip the SFTP upload stage")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Print changes against results from an earlier --json run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("details") != args.details:
+            print(f"Note: {args.compare} was run with --details={baseline.get('details')}, stages are not comparable")
+        if baseline.get("collapse", False) != args.collapse:
+            print(f"Note: {args.compare} was run with --collapse={baseline.get('collapse', False)}, "
+                  f"stages are not comparable")
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        helper = make_helper_wrapper(work_dir)
+        for count in args.events:
+            results.append(benchmark_size(count, work_dir, helper, args))
+
+    print_results(results, baseline)
+
+    if args.json:
+        report = {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "details": args.details,
+            "collapse": args.collapse,
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SFTP Upload Throughput Benchmark.
+
+Uploads files of several sizes to a local SFTP server stand-in and reports the
+throughput of paramiko's SFTPClient.put against SFTPUploader with different
+write request sizes. A local server has no network latency, so the numbers show
+the per-request overhead of the client and server, not WAN behavior.
+
+Usage:
+    python benchmarks/bench_sftp_throughput.py [--sizes 1 8 32] [--request-sizes 32768 131072] [--repeat 3]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mac_calendar_exporter.sftp.sftp_uploader import SFTPUploader
+from sftp_server import LocalSFTPServer
+
+
+def best_rate(upload, size_bytes: int, repeat: int) -> float:
+    """Run an upload several times and return the best throughput in MB/s."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        upload()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return size_bytes / best / (1024 * 1024)
+
+
+def main():
+    """Run the benchmark and print MB/s per file size and upload method."""
+    parser = argparse.ArgumentParser(description="Benchmark SFTP upload throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32], help="File sizes in MB")
+    parser.add_argument("--request-sizes", type=int, nargs="+", default=[32768, 131072],
+                        help="SFTP write request sizes in bytes")
+    parser.add_argument("--window-size", type=int, default=None, help="SSH window size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timing runs (best is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    warnings.filterwarnings("ignore")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        root = os.path.join(work_dir, "root")
+        os.makedirs(root)
+
+        with LocalSFTPServer(root) as server:
+            uploaders = {}
+            for request_size in args.request_sizes:
+                uploader = SFTPUploader(
+                    server.host, server.port, username="bench", password="bench",
+                    window_size=args.window_size, request_size=request_size,
+                )
+                if not uploader.connect():
+                    print("Could not connect to the local SFTP server")
+                    return 1
+                uploaders[request_size] = uploader
+
+            columns = ["SFTPClient.put"] + [f"request {size // 1024} KB" for size in args.request_sizes]
+            print(f"{'Size':>8}" + "".join(f"{name:>18}" for name in columns) + "   (MB/s)")
+
+            for size_mb in args.sizes:
+                local_file = os.path.join(work_dir, f"upload_{size_mb}mb.bin")
+                with open(local_file, "wb") as f:
+                    f.write(os.urandom(size_mb * 1024 * 1024))
+                size_bytes = os.path.getsize(local_file)
+
+                baseline = uploaders[args.request_sizes[0]]
+                rates = [best_rate(lambda: baseline._sftp.put(local_file, "/baseline.bin"), size_bytes, args.repeat)]
+                for request_size, uploader in uploaders.items():
+                    rates.append(best_rate(
+                        lambda: uploader.upload_file(local_file, "/upload.bin", skip_unchanged=False, atomic=False),
+                        size_bytes, args.repeat,
+                    ))
+                print(f"{size_mb:>6} MB" + "".join(f"{rate:>18.1f}" for rate in rates))
+                os.remove(local_file)
+
+            for uploader in uploaders.values():
+                uploader.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
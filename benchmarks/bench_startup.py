@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Import Benchmark.
+
+Measures the import time of each CLI subcommand with `python -X importtime`.
+Each subcommand is represented by the modules it imports before doing any work,
+so the benchmark runs on any platform without calendar access. The interpreter's
+own startup imports are measured separately and subtracted.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 5] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported by each subcommand on its way to doing work
+SUBCOMMANDS: Dict[str, List[str]] = {
+    "show-config": [
+        "mac_calendar_exporter.cli",
+        "dotenv",
+    ],
+    "list-calendars": [
+        "mac_calendar_exporter.cli",
+        "dotenv",
+        "mac_calendar_exporter.calendar.eventkit_calendar",
+    ],
+    "export": [
+        "mac_calendar_exporter.cli",
+        "dotenv",
+        "mac_calendar_exporter.main",
+        "mac_calendar_exporter.ics.ics_generator",
+        "mac_calendar_exporter.sftp.fanout",
+    ],
+    "serve": [
+        "mac_calendar_exporter.cli",
+        "dotenv",
+        "mac_calendar_exporter.main",
+        "mac_calendar_exporter.server.http_server",
+        "mac_calendar_exporter.ics.ics_generator",
+    ],
+    "daemon": [
+        "mac_calendar_exporter.cli",
+        "dotenv",
+        "mac_calendar_exporter.daemon",
+        "mac_calendar_exporter.ics.ics_generator",
+        "mac_calendar_exporter.sftp.fanout",
+    ],
+}
+
+
+def import_times(modules: List[str]) -> Dict[str, int]:
+    """
+    Import modules in a fresh interpreter and collect top-level import times.
+
+    Args:
+        modules: Modules to import (none measures interpreter startup only)
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds per top-level module
+    """
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented; only top-level entries add up to the total
+        if not name.startswith("  "):
+            name = name.strip()
+            times[name] = times.get(name, 0) + int(cumulative)
+    return times
+
+
+def measure(modules: List[str], baseline: Dict[str, int], repeat: int) -> Tuple[float, Dict[str, int]]:
+    """
+    Measure the best-of-N import time of a subcommand, minus interpreter startup.
+
+    Args:
+        modules: Modules imported by the subcommand
+        baseline: Import times of interpreter startup
+        repeat: Number of runs
+
+    Returns:
+        Tuple[float, Dict[str, int]]: Total milliseconds and per-module microseconds of the best run
+    """
+    best_total = None
+    best_times = None
+    for _ in range(repeat):
+        times = {name: us for name, us in import_times(modules).items() if name not in baseline}
+        total = sum(times.values()) / 1000
+        if best_total is None or total < best_total:
+            best_total, best_times = total, times
+    return best_total, best_times
+
+
+def main():
+    """Run the benchmark and print the import time of each subcommand."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup imports")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs per subcommand (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Number of heaviest imports listed per subcommand")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first subcommand is not penalized
+    import_times(sorted({module for modules in SUBCOMMANDS.values() for module in modules}))
+    baseline = import_times([])
+
+    results = {}
+    for command, modules in SUBCOMMANDS.items():
+        total, times = measure(modules, baseline, args.repeat)
+        heaviest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        results[command] = {
+            "import_ms": round(total, 1),
+            "heaviest": {name: round(us / 1000, 1) for name, us in heaviest},
+        }
+
+        print(f"{command:15s} {total:7.1f} ms")
+        for name, us in heaviest:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "subcommands": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
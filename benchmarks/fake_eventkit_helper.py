@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Fake EventKit Helper.
+
+Stand-in for the compiled eventkit_calendar.swift helper, speaking the same
+command line and serve-mode protocol, so the export pipeline can be benchmarked
+on any platform. Events are canned: they are generated once with
+SyntheticCalendar into an NDJSON file and replayed from that file on every
+request, so the helper itself costs little more than copying bytes to stdout.
+The requested date range is ignored; every request returns the whole file.
+
+Usage:
+    python benchmarks/fake_eventkit_helper.py --generate 100000 --data events.ndjson
+    FAKE_EVENTKIT_DATA=events.ndjson python benchmarks/fake_eventkit_helper.py --events --ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Environment variable with the path of the canned NDJSON events
+DATA_ENV = "FAKE_EVENTKIT_DATA"
+
+
+def write_canned_events(path: str, count: int, seed: int = 0, **options) -> None:
+    """
+    Generate synthetic events into an NDJSON file in the helper's streaming format.
+
+    Args:
+        path: Output file
+        count: Number of events
+        seed: Random seed
+        **options: Further SyntheticCalendar options
+    """
+    from mac_calendar_exporter.calendar.mock_calendar import SyntheticCalendar
+
+    calendar = SyntheticCalendar(seed=seed, **options)
+    start_date = datetime(2025, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        for event in calendar.events(start_date, days_ahead=None, limit=count):
+            f.write(json.dumps(dict(type="event", **event.to_dict()), ensure_ascii=False) + "\n")
+
+
+class CannedEvents:
+    """Replays canned event lines in the response formats of the Swift helper."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the CannedEvents.
+
+        Args:
+            path: NDJSON file written by write_canned_events
+        """
+        self.path = path
+
+    def calendars(self) -> Dict:
+        """Build the calendars response from the calendar names in the data."""
+        names = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                name = json.loads(line)["calendar_name"]
+                if name not in names:
+                    names.append(name)
+        return {"calendars": [{"title": name, "id": name, "type": 1, "source": "Fake"} for name in names]}
+
+    def stream(self, out, names: List[str], request: Dict, request_id: Optional[int] = None) -> None:
+        """
+        Write the events as NDJSON lines followed by an "end" line.
+
+        Args:
+            out: Text stream to write to
+            names: Calendars to include (all if empty)
+            request: Request with start_date and end_date
+            request_id: Id added to every line in serve mode
+        """
+        prefix = "{" if request_id is None else f'{{"id": {request_id}, '
+        count = 0
+        seen = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if names:
+                    name = json.loads(line)["calendar_name"]
+                    if name not in names:
+                        continue
+                    seen.add(name)
+                out.write(prefix + line[1:])
+                count += 1
+
+        for name in names:
+            if name not in seen:
+                error = {"type": "calendar_error", "calendar": name, "error": f"Calendar not found: {name}"}
+                out.write(json.dumps(self._with_id(error, request_id)) + "\n")
+        end = {"type": "end", "count": count,
+               "start_date": request.get("start_date"), "end_date": request.get("end_date")}
+        out.write(json.dumps(self._with_id(end, request_id)) + "\n")
+
+    def fetch(self, names: List[str], request: Dict) -> Dict:
+        """Build the single-document events response."""
+        events = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                del event["type"]
+                if not names or event["calendar_name"] in names:
+                    events.append(event)
+
+        found = {event["calendar_name"] for event in events}
+        response = {"events": events, "start_date": request.get("start_date"), "end_date": request.get("end_date")}
+        errors = {name: f"Calendar not found: {name}" for name in names if name not in found}
+        if errors:
+            response["calendar_errors"] = errors
+        return response
+
+    @staticmethod
+    def _with_id(response: Dict, request_id: Optional[int]) -> Dict:
+        return response if request_id is None else dict(response, id=request_id)
+
+
+def serve(canned: CannedEvents) -> None:
+    """Answer one JSON request per stdin line until stdin closes."""
+    out = sys.stdout
+    out.write(json.dumps({"status": "ready"}) + "\n")
+    out.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            out.write(json.dumps({"error": "Invalid request"}) + "\n")
+            out.flush()
+            continue
+
+        request_id = request.get("id")
+        operation = request.get("operation")
+        names = request.get("calendars") or []
+        if operation == "events" and request.get("format") == "ndjson":
+            canned.stream(out, names, request, request_id)
+        else:
+            if operation == "ping":
+                response = {"status": "ok"}
+            elif operation == "calendars":
+                response = canned.calendars()
+            elif operation == "events":
+                response = canned.fetch(names, request)
+            else:
+                response = {"error": "Unknown operation"}
+            if request_id is not None:
+                response["id"] = request_id
+            out.write(json.dumps(response, ensure_ascii=False) + "\n")
+        out.flush()
+
+
+def main():
+    """Run one helper operation, mirroring the Swift helper's command line."""
+    parser = argparse.ArgumentParser(description="Fake EventKit helper for benchmarks")
+    parser.add_argument("--calendars", dest="operation", action="store_const", const="calendars")
+    parser.add_argument("--events", dest="operation", action="store_const", const="events")
+    parser.add_argument("--serve", dest="operation", action="store_const", const="serve")
+    parser.add_argument("--ndjson", action="store_true")
+    parser.add_argument("--calendar", action="append", default=[])
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="Write COUNT canned events and exit")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --generate")
+    parser.add_argument("--data", default=os.environ.get(DATA_ENV), help=f"Canned events file (default: ${DATA_ENV})")
+    args = parser.parse_args()
+
+    if not args.data:
+        print(json.dumps({"error": f"No canned events, set {DATA_ENV}"}))
+        return 1
+
+    if args.generate is not None:
+        write_canned_events(args.data, args.generate, args.seed)
+        return 0
+
+    canned = CannedEvents(args.data)
+    request = {"start_date": args.start_date, "end_date": args.end_date}
+    operation = args.operation or "calendars"
+    if operation == "serve":
+        serve(canned)
+    elif operation == "events" and args.ndjson:
+        canned.stream(sys.stdout, args.calendar, request)
+    elif operation == "events":
+        print(json.dumps(canned.fetch(args.calendar, request), ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(canned.calendars(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local SFTP Server Stand-In.
+
+A minimal paramiko-based SFTP server that serves a local directory and accepts
+any username and password. It is used to exercise SFTPUploader without a real
+server and can be run on its own or started in-process by the benchmarks.
+
+Usage:
+    python benchmarks/sftp_server.py --root /tmp/sftp-root --port 2222
+"""
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+import paramiko
+from paramiko import SFTPAttributes, SFTPHandle, SFTPServer, SFTPServerInterface
+from paramiko.sftp import SFTP_FAILURE, SFTP_OK, SFTP_OP_UNSUPPORTED
+
+logger = logging.getLogger(__name__)
+
+
+def _to_sftp_error(e: OSError) -> int:
+    """Map an OSError to an SFTP status code."""
+    return SFTPServer.convert_errno(e.errno)
+
+
+class _Handle(SFTPHandle):
+    """File handle backed by a local file."""
+
+    def stat(self):
+        try:
+            return SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return _to_sftp_error(e)
+
+    def chattr(self, attr):
+        return SFTP_OK
+
+
+class _LocalDirectorySFTP(SFTPServerInterface):
+    """SFTP interface exposing a local directory as the server root."""
+
+    def __init__(self, server, *args, root: str = "/", rename_delay: float = 0.0, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.root = root
+        self.rename_delay = rename_delay
+
+    def _local(self, path: str) -> str:
+        path = self.canonicalize(path)
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def canonicalize(self, path):
+        return os.path.normpath("/" + path).replace("//", "/")
+
+    def list_folder(self, path):
+        local = self._local(path)
+        try:
+            result = []
+            for name in os.listdir(local):
+                attr = SFTPAttributes.from_stat(os.stat(os.path.join(local, name)))
+                attr.filename = name
+                result.append(attr)
+            return result
+        except OSError as e:
+            return _to_sftp_error(e)
+
+    def stat(self, path):
+        try:
+            return SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return _to_sftp_error(e)
+
+    def lstat(self, path):
+        try:
+            return SFTPAttributes.from_stat(os.lstat(self._local(path)))
+        except OSError as e:
+            return _to_sftp_error(e)
+
+    def open(self, path, flags, attr):
+        local = self._local(path)
+        try:
+            fd = os.open(local, flags | getattr(os, "O_BINARY", 0), 0o644)
+        except OSError as e:
+            return _to_sftp_error(e)
+
+        if flags & os.O_WRONLY:
+            mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            mode = "rb"
+        try:
+            f = os.fdopen(fd, mode)
+        except OSError as e:
+            return _to_sftp_error(e)
+
+        handle = _Handle(flags)
+        handle.filename = local
+        handle.readfile = f
+        handle.writefile = f
+        return handle
+
+    def remove(self, path):
+        try:
+            os.remove(self._local(path))
+        except OSError as e:
+            return _to_sftp_error(e)
+        return SFTP_OK
+
+    def rename(self, oldpath, newpath):
+        # Standard SFTP rename fails if the target exists
+        if os.path.exists(self._local(newpath)):
+            return SFTP_FAILURE
+        return self.posix_rename(oldpath, newpath)
+
+    def posix_rename(self, oldpath, newpath):
+        if self.rename_delay:
+            time.sleep(self.rename_delay)
+        try:
+            os.replace(self._local(oldpath), self._local(newpath))
+        except OSError as e:
+            return _to_sftp_error(e)
+        return SFTP_OK
+
+    def mkdir(self, path, attr):
+        try:
+            os.mkdir(self._local(path))
+        except OSError as e:
+            return _to_sftp_error(e)
+        return SFTP_OK
+
+    def rmdir(self, path):
+        try:
+            os.rmdir(self._local(path))
+        except OSError as e:
+            return _to_sftp_error(e)
+        return SFTP_OK
+
+    def chattr(self, path, attr):
+        return SFTP_OK
+
+    def symlink(self, target_path, path):
+        return SFTP_OP_UNSUPPORTED
+
+    def readlink(self, path):
+        return SFTP_OP_UNSUPPORTED
+
+
+class _AcceptAllServer(paramiko.ServerInterface):
+    """SSH server interface that accepts any password and opens SFTP sessions."""
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_auth_publickey(self, username, key):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password,publickey"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+
+class LocalSFTPServer:
+    """SFTP server stand-in running on a background thread."""
+
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0, rename_delay: float = 0.0):
+        """
+        Initialize the server.
+
+        Args:
+            root: Local directory served as the SFTP root
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            rename_delay: Seconds to wait inside each rename, to widen race windows
+        """
+        self.root = root
+        self.rename_delay = rename_delay
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen(16)
+        self.host, self.port = self._socket.getsockname()
+        self._transports = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> "LocalSFTPServer":
+        """Start accepting connections on a background thread."""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop accepting connections and close open sessions."""
+        self._stopped.set()
+        self._socket.close()
+        for transport in self._transports:
+            transport.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                client, _ = self._socket.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key)
+            transport.set_subsystem_handler(
+                "sftp", SFTPServer, _LocalDirectorySFTP, root=self.root, rename_delay=self.rename_delay
+            )
+            transport.start_server(server=_AcceptAllServer())
+            self._transports.append(transport)
+
+
+def main():
+    """Run the server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local SFTP server stand-in")
+    parser.add_argument("--root", required=True, help="Directory served as the SFTP root")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=2222, help="Port to listen on")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    os.makedirs(args.root, exist_ok=True)
+    server = LocalSFTPServer(args.root, args.host, args.port).start()
+    print(f"Serving {args.root} over SFTP on {server.host}:{server.port} (any username/password)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Calendar Event Model Module.
+
+This module defines the CalendarEvent type passed between the calendar access
+layer and the ICS generator. Events are built once from the helper's JSON output,
+with dates parsed into native datetime/date values, so later stages never parse
+date strings again.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Date format used by the EventKit helper for event start and end dates
+EVENTKIT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Fallback formats, tried in order when the fast path does not apply
+DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S %z",          # 2021-11-13 09:00:00 +0100
+    "%Y-%m-%dT%H:%M:%S%z",           # 2021-11-13T09:00:00+0100
+    "%Y-%m-%d %H:%M:%S",             # 2021-11-13 09:00:00
+    "%A, %B %d, %Y at %I:%M:%S %p",  # Saturday, November 13, 2021 at 9:00:00 AM
+]
+
+
+class DateParser:
+    """
+    Parse event date strings.
+
+    Strings in the fixed EventKit format are parsed by a fast path. For anything
+    else, the format that matched last is tried first, so a batch of events in
+    one format only searches the format list once. Use one parser per batch.
+    """
+
+    __slots__ = ("_format",)
+
+    def __init__(self):
+        """Initialize the DateParser."""
+        self._format = None
+
+    def parse(self, date_string: str) -> datetime:
+        """
+        Parse a date string from the EventKit helper or the MacOS Calendar format.
+
+        Args:
+            date_string: Date string, e.g. "2021-11-13 09:00:00"
+
+        Returns:
+            datetime: Parsed datetime object
+
+        Raises:
+            ValueError: If the string matches no known format
+        """
+        # Fast path for the EventKit helper's "yyyy-MM-dd HH:mm:ss" output
+        if len(date_string) == 19 and date_string[10] == " ":
+            try:
+                return datetime.fromisoformat(date_string)
+            except ValueError:
+                pass
+
+        # Remove the "date " prefix if present
+        if date_string.startswith("date "):
+            date_string = date_string[5:]
+
+        if self._format is not None:
+            try:
+                return datetime.strptime(date_string, self._format)
+            except ValueError:
+                pass
+
+        for fmt in DATE_FORMATS:
+            if fmt == self._format:
+                continue
+            try:
+                parsed = datetime.strptime(date_string, fmt)
+            except ValueError:
+                continue
+            self._format = fmt
+            return parsed
+
+        # If none of the formats match, try a more flexible approach
+        try:
+            import dateutil.parser
+            return dateutil.parser.parse(date_string)
+        except (ImportError, ValueError, OverflowError):
+            logger.error(f"Failed to parse date: {date_string}")
+            raise ValueError(f"Cannot parse date format: {date_string}")
+
+
+def parse_event_date(date_string: str) -> datetime:
+    """
+    Parse a single date string from the EventKit helper or the MacOS Calendar format.
+
+    Args:
+        date_string: Date string, e.g. "2021-11-13 09:00:00"
+
+    Returns:
+        datetime: Parsed datetime object
+    """
+    return DateParser().parse(date_string)
+
+
+class CalendarEvent:
+    """
+    A single calendar event.
+
+    Start and end are datetime values for timed events and date values for
+    all-day events. Uses __slots__ to keep per-event memory small.
+    """
+
+    __slots__ = (
+        "event_id",
+        "calendar_name",
+        "title",
+        "start",
+        "end",
+        "all_day",
+        "location",
+        "description",
+        "url",
+        "recurrence_rule",
+        "occurrence_start",
+        "detached",
+    )
+
+    def __init__(
+        self,
+        event_id: str,
+        calendar_name: str,
+        title: str,
+        start: Union[datetime, date],
+        end: Union[datetime, date],
+        all_day: bool = False,
+        location: Optional[str] = None,
+        description: Optional[str] = None,
+        url: Optional[str] = None,
+        recurrence_rule: Optional[str] = None,
+        occurrence_start: Optional[Union[datetime, date]] = None,
+        detached: bool = False,
+    ):
+        """
+        Initialize the CalendarEvent.
+
+        Args:
+            event_id: Event identifier (shared by all occurrences of a recurring event)
+            calendar_name: Name of the calendar the event belongs to
+            title: Event title
+            start: Start as datetime, or date for all-day events
+            end: End as datetime, or date for all-day events
+            all_day: Whether this is an all-day event
+            location: Event location
+            description: Event notes
+            url: Event URL
+            recurrence_rule: RRULE value of the series this occurrence belongs to, without
+                             its end, e.g. "FREQ=WEEKLY;BYDAY=MO" (None if not recurring)
+            occurrence_start: Start of this occurrence as defined by the series; differs
+                              from start if the occurrence was moved
+            detached: Whether this occurrence was modified independently of its series
+        """
+        self.event_id = event_id
+        self.calendar_name = calendar_name
+        self.title = title
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.location = location
+        self.description = description
+        self.url = url
+        self.recurrence_rule = recurrence_rule
+        self.occurrence_start = occurrence_start
+        self.detached = detached
+
+    @classmethod
+    def from_dict(cls, event_data: Dict[str, Any], date_parser: Optional[DateParser] = None) -> "CalendarEvent":
+        """
+        Create a CalendarEvent from an event dictionary produced by the EventKit helper.
+
+        Args:
+            event_data: Dictionary with event data and string dates
+            date_parser: Parser shared by a batch of events (a new one if None)
+
+        Returns:
+            CalendarEvent: The parsed event
+
+        Raises:
+            ValueError: If the start or end date cannot be parsed
+            KeyError: If a required field is missing
+        """
+        if date_parser is None:
+            date_parser = DateParser()
+        all_day = bool(event_data.get("all_day", False))
+        start = date_parser.parse(event_data["start_date"])
+        end = date_parser.parse(event_data["end_date"])
+        occurrence_start = None
+        if event_data.get("occurrence_date"):
+            occurrence_start = date_parser.parse(event_data["occurrence_date"])
+        if all_day:
+            start = start.date()
+            end = end.date()
+            if occurrence_start is not None:
+                occurrence_start = occurrence_start.date()
+
+        return cls(
+            event_id=event_data["event_id"],
+            calendar_name=event_data.get("calendar_name", ""),
+            title=event_data["title"],
+            start=start,
+            end=end,
+            all_day=all_day,
+            location=event_data.get("location") or None,
+            description=event_data.get("description") or None,
+            url=event_data.get("url") or None,
+            recurrence_rule=event_data.get("recurrence_rule") or None,
+            occurrence_start=occurrence_start,
+            detached=bool(event_data.get("detached", False)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the event to the dictionary format used by the EventKit helper.
+
+        Returns:
+            Dict[str, Any]: Event dictionary with string dates
+        """
+        event_data = {
+            "event_id": self.event_id,
+            "calendar_name": self.calendar_name,
+            "title": self.title,
+            "start_date": self._format_date(self.start),
+            "end_date": self._format_date(self.end),
+            "all_day": self.all_day,
+        }
+        if self.location:
+            event_data["location"] = self.location
+        if self.description:
+            event_data["description"] = self.description
+        if self.url:
+            event_data["url"] = self.url
+        if self.recurrence_rule:
+            event_data["recurrence_rule"] = self.recurrence_rule
+        if self.occurrence_start is not None:
+            event_data["occurrence_date"] = self._format_date(self.occurrence_start)
+        if self.detached:
+            event_data["detached"] = True
+        return event_data
+
+    @staticmethod
+    def _format_date(value: Union[datetime, date]) -> str:
+        """
+        Format a start or end value the way the EventKit helper does.
+
+        Args:
+            value: datetime, or date for all-day events
+
+        Returns:
+            str: Date string in EVENTKIT_DATE_FORMAT
+        """
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        return value.strftime(EVENTKIT_DATE_FORMAT)
+
+    def _values(self) -> tuple:
+        """Return all field values in slot order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CalendarEvent):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self) -> str:
+        return (f"CalendarEvent(event_id={self.event_id!r}, title={self.title!r}, "
+                f"start={self.start!r}, end={self.end!r}, all_day={self.all_day!r})")
@@ -4,33 +4,85 @@ EventKit Calendar Access Module.
 
 This module provides access to calendar data using Swift's EventKit framework.
 It works by executing a Swift script that interfaces with EventKit and returns
-JSON data with calendar information and events.
+JSON data with calendar information and events. The helper can either be run once
+per request or kept alive in serve mode, where it answers line-delimited JSON
+requests on stdin. Events can be streamed as NDJSON, one event per line, so they
+are never held in memory all at once.
 """
 
 import json
 import logging
 import os
+import queue
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent, DateParser
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of unread helper output lines buffered in memory
+HELPER_QUEUE_SIZE = 1024
+
 
 class EventKitCalendarAccess:
     """Access calendar data from macOS Calendar app using EventKit via Swift."""
 
-    def __init__(self):
-        """Initialize the EventKitCalendarAccess class."""
+    def __init__(
+        self,
+        helper_path: Optional[str] = None,
+        persistent: bool = False,
+        timeout: int = 30,
+        max_concurrency: int = 1
+    ):
+        """
+        Initialize the EventKitCalendarAccess class.
+        
+        Args:
+            helper_path: Path to a helper executable speaking the same protocol as
+                         eventkit_calendar.swift. If None, the bundled Swift helper is
+                         compiled and used.
+            persistent: Keep one helper process alive in serve mode and send all
+                        requests to it instead of launching a process per request
+            timeout: Timeout in seconds for a single helper request
+            max_concurrency: Maximum number of helper processes fetching calendars
+                             in parallel. With 1 (the default), all calendars are
+                             fetched by a single helper run.
+        """
         logger.info("Initializing EventKit calendar access")
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        swift_script = os.path.join(script_dir, "eventkit_calendar.swift")
-        binary_path = os.path.join(script_dir, "eventkit_calendar")
+        self.persistent = persistent
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._helper = None
+        self._helper_lines = None
+        self._helper_lock = threading.Lock()
+        self._request_id = 0
+        
+        # Helper processes started and requests sent, for run reports
+        self.processes_started = 0
+        self.requests_sent = 0
+        self._stats_lock = threading.Lock()
         
-        # Compile Swift script to binary if binary doesn't exist or is older than script
-        self.script_path = self._ensure_compiled_binary(swift_script, binary_path)
+        if helper_path:
+            self.script_path = helper_path
+        else:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            swift_script = os.path.join(script_dir, "eventkit_calendar.swift")
+            binary_path = os.path.join(script_dir, "eventkit_calendar")
+            
+            # Compile Swift script to binary if binary doesn't exist or is older than script
+            self.script_path = self._ensure_compiled_binary(swift_script, binary_path)
         logger.info(f"Using EventKit binary at: {self.script_path}")
 
+    def close(self) -> None:
+        """Stop the persistent helper process, if one is running."""
+        with self._helper_lock:
+            self._stop_helper()
+
     def list_calendars(self) -> List[Dict[str, str]]:
         """
         Get a list of available calendars.
@@ -39,8 +91,7 @@ class EventKitCalendarAccess:
             List[Dict[str, str]]: List of dictionaries with calendar info
         """
         try:
-            # Run the Swift script with --calendars operation
-            result = self._run_script(["--calendars"])
+            result = self._request({"operation": "calendars"})
             
             if not result or "error" in result:
                 error_msg = result.get("error", "Unknown error") if result else "No result from script"
@@ -73,10 +124,13 @@ class EventKitCalendarAccess:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         days_ahead: Optional[int] = 30
-    ) -> List[Dict]:
+    ) -> List[CalendarEvent]:
         """
         Get events from specified calendars within the given date range.
         
+        Errors are logged and give an empty list. Use iter_events to stream the
+        events and to tell a failed fetch from an empty calendar.
+        
         Args:
             calendar_names: List of calendar names to fetch events from. 
                            If None, all calendars are used.
@@ -85,7 +139,50 @@ class EventKitCalendarAccess:
             days_ahead: Number of days ahead to fetch events if end_date is None.
             
         Returns:
-            List[Dict]: List of event dictionaries
+            List[CalendarEvent]: List of events
+        """
+        try:
+            started = time.monotonic()
+            events_data = list(self.iter_events(calendar_names, start_date, end_date, days_ahead))
+            logger.info(f"Retrieved {len(events_data)} events in {time.monotonic() - started:.2f}s")
+            return events_data
+                
+        except Exception as e:
+            logger.error(f"Failed to get events using EventKit: {e}")
+            return []
+            
+    def iter_events(
+        self,
+        calendar_names: Optional[List[str]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        days_ahead: Optional[int] = 30
+    ) -> Iterator[CalendarEvent]:
+        """
+        Yield events from specified calendars as the helper streams them.
+        
+        The helper writes one compact JSON line per event, which is parsed and
+        yielded as soon as it is read from the pipe, so memory use does not grow
+        with the number of events. In parallel mode (max_concurrency above 1 with
+        several calendars), each calendar is fetched in full before its events
+        are yielded.
+        
+        A stream that does not finish cleanly raises instead of ending early, so
+        a crashed or timed-out helper never passes for a calendar with fewer events.
+        
+        Args:
+            calendar_names: List of calendar names to fetch events from. 
+                           If None, all calendars are used.
+            start_date: Start date for events. If None, today is used.
+            end_date: End date for events. If None, calculated from days_ahead.
+            days_ahead: Number of days ahead to fetch events if end_date is None.
+            
+        Yields:
+            CalendarEvent: Event parsed from the helper output
+            
+        Raises:
+            RuntimeError: If the helper reports an error, exits with an error, times
+                          out or stops before its "end" record
         """
         if start_date is None:
             start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -93,56 +190,130 @@ class EventKitCalendarAccess:
         if end_date is None and days_ahead is not None:
             end_date = start_date + timedelta(days=days_ahead)
         
+        request = {
+            "operation": "events",
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "end_date": end_date.strftime("%Y-%m-%d"),
+            "calendars": []
+        }
+        
+        # Fetch calendars in parallel one-shot runs when concurrency is enabled.
+        # The persistent helper handles one request at a time, so it always
+        # gets a single combined request.
+        if (calendar_names and len(calendar_names) > 1
+                and self.max_concurrency > 1 and not self.persistent):
+            yield from self._get_events_parallel(calendar_names, request)
+            return
+        
+        request["format"] = "ndjson"
+        
+        # Add calendar filter if provided. All calendars are passed to a single
+        # request so the process launch and EventKit warm-up are paid once.
+        if calendar_names and len(calendar_names) > 0:
+            logger.info(f"Getting events for calendars: {', '.join(calendar_names)}")
+            request["calendars"] = list(calendar_names)
+        else:
+            logger.info("Getting events from all calendars")
+        
+        if self.persistent:
+            records = self._stream_helper(request)
+        else:
+            records = self._stream_script(self._request_to_args(request))
+        
+        count = 0
+        ended = False
+        date_parser = DateParser()
         try:
-            # Prepare arguments for the Swift script
-            args = ["--events"]
-            
-            # Add date range
-            args.extend([
-                "--start-date", start_date.strftime("%Y-%m-%d"),
-                "--end-date", end_date.strftime("%Y-%m-%d")
-            ])
-            
-            # Add calendar filter if provided
-            if calendar_names and len(calendar_names) > 0:
-                # Currently, the Swift script only supports filtering by a single calendar
-                # If multiple calendars are provided, we'll query each and combine the results
-                all_events = []
-                
-                for calendar_name in calendar_names:
-                    logger.info(f"Getting events for calendar: {calendar_name}")
-                    calendar_args = args + ["--calendar", calendar_name]
-                    
-                    result = self._run_script(calendar_args)
-                    
-                    if not result or "error" in result:
-                        error_msg = result.get("error", "Unknown error") if result else "No result from script"
-                        logger.warning(f"Failed to get events for calendar {calendar_name}: {error_msg}")
-                        continue
-                    
-                    events_data = result.get("events", [])
-                    all_events.extend(events_data)
-                
-                logger.info(f"Retrieved {len(all_events)} events from {len(calendar_names)} calendars")
-                return all_events
-            else:
-                # Get events from all calendars
-                logger.info("Getting events from all calendars")
-                result = self._run_script(args)
-                
+            for record in records:
+                if ended:
+                    continue
+                record_type = record.pop("type", None)
+                if record_type == "event":
+                    event = self._to_event(record, date_parser)
+                    if event is not None:
+                        count += 1
+                        yield event
+                elif record_type == "calendar_error":
+                    # Missing calendars are reported per calendar instead of failing the whole run
+                    logger.warning(f"Failed to get events for calendar {record.get('calendar')}: "
+                                   f"{record.get('error')}")
+                elif record_type == "end":
+                    # Keep reading so a one-shot helper's exit status is still checked
+                    ended = True
+                else:
+                    raise RuntimeError(f"EventKit helper reported an error: {record.get('error', 'Unknown error')}")
+            
+            if not ended:
+                raise RuntimeError(f"Event stream ended unexpectedly after {count} events")
+        finally:
+            records.close()
+
+    def _get_events_parallel(self, calendar_names: List[str], request: Dict) -> List[CalendarEvent]:
+        """
+        Fetch events for each calendar in its own helper run, using a bounded pool.
+        
+        Args:
+            calendar_names: List of calendar names to fetch events from
+            request: Events request without a calendar filter
+            
+        Returns:
+            List[CalendarEvent]: List of events, ordered by calendar_names
+            
+        Raises:
+            RuntimeError: If the helper failed for any calendar, so a partial
+                          result is never mistaken for the complete one
+        """
+        workers = min(self.max_concurrency, len(calendar_names))
+        logger.info(f"Getting events for {len(calendar_names)} calendars with {workers} parallel workers")
+        
+        def fetch(calendar_name: str):
+            started = time.monotonic()
+            result = self._request(dict(request, calendars=[calendar_name]))
+            return result, time.monotonic() - started
+        
+        started = time.monotonic()
+        all_events = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in submission order, keeping the output deterministic
+            for calendar_name, (result, elapsed) in zip(calendar_names, executor.map(fetch, calendar_names)):
                 if not result or "error" in result:
                     error_msg = result.get("error", "Unknown error") if result else "No result from script"
-                    logger.error(f"Failed to get events: {error_msg}")
-                    return []
+                    raise RuntimeError(f"Failed to get events for calendar {calendar_name} "
+                                       f"after {elapsed:.2f}s: {error_msg}")
                 
-                events_data = result.get("events", [])
-                logger.info(f"Retrieved {len(events_data)} events from all calendars")
-                return events_data
+                error_msg = result.get("calendar_errors", {}).get(calendar_name)
+                if error_msg:
+                    logger.warning(f"Failed to get events for calendar {calendar_name}: {error_msg}")
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Failed to get events using EventKit: {e}")
-            return []
+                date_parser = DateParser()
+                events = [self._to_event(event_data, date_parser) for event_data in result.get("events", [])]
+                events = [event for event in events if event is not None]
+                logger.info(f"Retrieved {len(events)} events for calendar {calendar_name} in {elapsed:.2f}s")
+                all_events.extend(events)
+        
+        logger.info(f"Retrieved {len(all_events)} events from {len(calendar_names)} calendars "
+                    f"in {time.monotonic() - started:.2f}s")
+        return all_events
+
+    @staticmethod
+    def _to_event(event_data: Dict, date_parser: Optional[DateParser] = None) -> Optional[CalendarEvent]:
+        """
+        Build a CalendarEvent from an event dictionary returned by the helper.
+        
+        Args:
+            event_data: Event dictionary with string dates
+            date_parser: Parser shared by the events of one batch
             
+        Returns:
+            Optional[CalendarEvent]: The event, or None if it could not be parsed
+        """
+        try:
+            return CalendarEvent.from_dict(event_data, date_parser)
+        except Exception as e:
+            logger.error(f"Failed to parse event {event_data.get('title', 'unknown')}: {e}")
+            return None
+
     def _ensure_compiled_binary(self, swift_script: str, binary_path: str) -> str:
         """
         Compile Swift script to binary if needed.
@@ -200,6 +371,78 @@ class EventKitCalendarAccess:
                 os.chmod(swift_script, 0o755)
             return swift_script
 
+    def _request(self, request: Dict) -> Optional[Dict]:
+        """
+        Send a request to the helper, using the persistent process if enabled.
+        
+        Args:
+            request: Request dictionary with an "operation" key and its parameters
+            
+        Returns:
+            Optional[Dict]: Parsed JSON response from the helper, or None if failed
+        """
+        if self.persistent:
+            return self._helper_request(request)
+        return self._run_script(self._request_to_args(request))
+
+    @staticmethod
+    def _request_to_args(request: Dict) -> List[str]:
+        """
+        Convert a request dictionary into command line arguments for a one-shot run.
+        
+        Args:
+            request: Request dictionary with an "operation" key and its parameters
+            
+        Returns:
+            List[str]: Command line arguments for the helper
+        """
+        args = [f"--{request['operation']}"]
+        if request.get("start_date"):
+            args.extend(["--start-date", request["start_date"]])
+        if request.get("end_date"):
+            args.extend(["--end-date", request["end_date"]])
+        for calendar_name in request.get("calendars", []):
+            args.extend(["--calendar", calendar_name])
+        if request.get("format") == "ndjson":
+            args.append("--ndjson")
+        return args
+
+    def _count_process(self) -> None:
+        """Count a one-shot helper run, which is both a process and a request."""
+        with self._stats_lock:
+            self.processes_started += 1
+            self.requests_sent += 1
+
+    def _build_command(self, args: List[str]) -> Optional[List[str]]:
+        """
+        Build the command line used to run the helper.
+        
+        Args:
+            args: List of arguments to pass to the helper
+            
+        Returns:
+            Optional[List[str]]: Command to execute, or None if Swift is unavailable
+        """
+        # If script_path is a binary, run it directly
+        # If it's a Swift script, run it with swift
+        if self.script_path.endswith('.swift'):
+            # Use explicit Swift path to ensure it works in cron environment
+            swift_path = "/usr/bin/swift"
+            if not os.path.exists(swift_path):
+                # Try alternative path
+                swift_path = subprocess.run(
+                    ["which", "swift"],
+                    capture_output=True,
+                    text=True
+                ).stdout.strip()
+                if not swift_path:
+                    logger.error("Swift not found in PATH")
+                    return None
+            return [swift_path, self.script_path] + args
+        
+        # It's a compiled binary, run it directly
+        return [self.script_path] + args
+
     def _run_script(self, args: List[str]) -> Optional[Dict]:
         """
         Run the Swift script with provided arguments.
@@ -211,34 +454,19 @@ class EventKitCalendarAccess:
             Optional[Dict]: Parsed JSON output from the script, or None if failed
         """
         try:
-            # If script_path is a binary, run it directly
-            # If it's a Swift script, run it with swift
-            if self.script_path.endswith('.swift'):
-                # Use explicit Swift path to ensure it works in cron environment
-                swift_path = "/usr/bin/swift"
-                if not os.path.exists(swift_path):
-                    # Try alternative path
-                    swift_path = subprocess.run(
-                        ["which", "swift"],
-                        capture_output=True,
-                        text=True
-                    ).stdout.strip()
-                    if not swift_path:
-                        logger.error("Swift not found in PATH")
-                        return None
-                cmd = [swift_path, self.script_path] + args
-            else:
-                # It's a compiled binary, run it directly
-                cmd = [self.script_path] + args
+            cmd = self._build_command(args)
+            if cmd is None:
+                return None
             
             # Execute the Swift script
             logger.debug(f"Running: {' '.join(cmd)}")
+            self._count_process()
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
                 check=False,
-                timeout=30  # Add timeout to prevent hanging
+                timeout=self.timeout  # Add timeout to prevent hanging
             )
             
             if result.returncode != 0:
@@ -267,12 +495,339 @@ class EventKitCalendarAccess:
                 return None
                 
         except subprocess.TimeoutExpired:
-            logger.error("Swift script timed out after 30 seconds")
+            logger.error(f"Swift script timed out after {self.timeout} seconds")
             return None
         except Exception as e:
             logger.error(f"Failed to run Swift script: {e}")
             return None
 
+    def _helper_request(self, request: Dict) -> Optional[Dict]:
+        """
+        Send a request to the persistent helper process and wait for its response.
+        
+        The helper is started on first use and restarted if it has crashed. A
+        request that times out kills the helper so the next request starts fresh.
+        
+        Args:
+            request: Request dictionary with an "operation" key and its parameters
+            
+        Returns:
+            Optional[Dict]: Parsed JSON response from the helper, or None if failed
+        """
+        with self._helper_lock:
+            # Retry once if the helper dies while handling the request
+            for attempt in range(2):
+                request_id = self._send_helper_request(request)
+                if request_id is None:
+                    return None
+                
+                response = self._read_helper_response(request_id)
+                if response is not None or self._helper is None:
+                    return response
+                # Helper closed its output mid-request: restart it and try again
+                self._stop_helper()
+            
+            logger.error("EventKit helper failed to answer the request")
+            return None
+
+    def _send_helper_request(self, request: Dict) -> Optional[int]:
+        """
+        Write a request to the persistent helper, starting or restarting it as needed.
+        
+        Must be called with self._helper_lock held.
+        
+        Args:
+            request: Request dictionary with an "operation" key and its parameters
+            
+        Returns:
+            Optional[int]: Id assigned to the request, or None if it could not be sent
+        """
+        for attempt in range(2):
+            if self._helper is None or self._helper.poll() is not None:
+                if self._helper is not None:
+                    logger.warning("EventKit helper exited unexpectedly, restarting")
+                self._stop_helper()
+                if not self._start_helper():
+                    return None
+            
+            self._request_id += 1
+            try:
+                self._helper.stdin.write(json.dumps(dict(request, id=self._request_id)) + "\n")
+                self._helper.stdin.flush()
+                with self._stats_lock:
+                    self.requests_sent += 1
+                return self._request_id
+            except (BrokenPipeError, OSError) as e:
+                logger.warning(f"Failed to send request to EventKit helper: {e}")
+                self._stop_helper()
+        
+        return None
+
+    def _stream_helper(self, request: Dict) -> Iterator[Dict]:
+        """
+        Send a streamed request to the persistent helper and yield each response line.
+        
+        Args:
+            request: Request dictionary with "format" set to "ndjson"
+            
+        Yields:
+            Dict: Parsed response line, ending with an "end" line or an error
+        """
+        with self._helper_lock:
+            request_id = self._send_helper_request(request)
+            if request_id is None:
+                return
+            
+            while True:
+                response = self._read_helper_response(request_id)
+                if response is None:
+                    if self._helper is not None:
+                        logger.error("EventKit helper exited while streaming events")
+                        self._stop_helper()
+                    return
+                
+                # Responses without a type are errors and end the stream like "end" does
+                done = response.get("type") in ("end", None)
+                yield response
+                if done:
+                    return
+
+    def _stream_script(self, args: List[str]) -> Iterator[Dict]:
+        """
+        Run the Swift script and yield each JSON line of its output as it arrives.
+        
+        The timeout applies to the gap between lines rather than the whole run, so
+        large streams are not cut off while the helper is still making progress.
+        
+        Args:
+            args: List of arguments to pass to the script
+            
+        Yields:
+            Dict: Parsed JSON line
+            
+        Raises:
+            RuntimeError: If the script produces no output within the timeout or
+                          exits with an error
+        """
+        cmd = self._build_command(args)
+        if cmd is None:
+            return
+        
+        logger.debug(f"Running: {' '.join(cmd)}")
+        self._count_process()
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        lines = queue.Queue(maxsize=HELPER_QUEUE_SIZE)
+        threading.Thread(target=self._pump_output, args=(process.stdout, lines), daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(process.stderr,), daemon=True).start()
+        
+        finished = False
+        try:
+            while True:
+                try:
+                    line = lines.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise RuntimeError(f"Swift script produced no output for {self.timeout} seconds")
+                
+                if line is None:
+                    finished = True
+                    break
+                
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse JSON line from Swift script: {e}")
+                    logger.error(f"Raw line (first 1000 chars): {line[:1000]}")
+                    continue
+                yield record
+            
+            returncode = process.wait(timeout=self.timeout)
+            if returncode != 0:
+                raise RuntimeError(f"Swift script returned error code {returncode}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            if not finished:
+                self._drain_queue(lines)
+
+    def _read_helper_response(self, request_id: int) -> Optional[Dict]:
+        """
+        Read the helper's response to the given request.
+        
+        Args:
+            request_id: Id the response must carry
+            
+        Returns:
+            Optional[Dict]: Parsed response, or None if the helper closed its output
+            or timed out (in which case it is stopped and self._helper is None)
+        """
+        while True:
+            try:
+                line = self._helper_lines.get(timeout=self.timeout)
+            except queue.Empty:
+                logger.error(f"EventKit helper timed out after {self.timeout} seconds, stopping it")
+                self._stop_helper()
+                return None
+            
+            if line is None:
+                return None
+            
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response from EventKit helper: {e}")
+                logger.error(f"Raw line (first 1000 chars): {line[:1000]}")
+                continue
+            
+            if response.get("id") != request_id:
+                # Stale response to a request we already gave up on
+                logger.debug(f"Ignoring EventKit helper response with id {response.get('id')}")
+                continue
+            response.pop("id", None)
+            return response
+
+    def _start_helper(self) -> bool:
+        """
+        Start the helper in serve mode and wait until it reports readiness.
+        
+        Returns:
+            bool: True if the helper is ready to accept requests, False otherwise
+        """
+        cmd = self._build_command(["--serve"])
+        if cmd is None:
+            return False
+        
+        try:
+            logger.info(f"Starting persistent EventKit helper: {' '.join(cmd)}")
+            self._helper = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1
+            )
+        except Exception as e:
+            logger.error(f"Failed to start EventKit helper: {e}")
+            self._helper = None
+            return False
+        
+        with self._stats_lock:
+            self.processes_started += 1
+        
+        # Read output on background threads so requests can time out
+        self._helper_lines = queue.Queue(maxsize=HELPER_QUEUE_SIZE)
+        threading.Thread(
+            target=self._pump_output,
+            args=(self._helper.stdout, self._helper_lines),
+            daemon=True
+        ).start()
+        threading.Thread(
+            target=self._drain_stderr,
+            args=(self._helper.stderr,),
+            daemon=True
+        ).start()
+        
+        # The first line is either a readiness message or an access error
+        try:
+            line = self._helper_lines.get(timeout=self.timeout)
+        except queue.Empty:
+            logger.error(f"EventKit helper did not become ready within {self.timeout} seconds")
+            self._stop_helper()
+            return False
+        
+        try:
+            status = json.loads(line) if line else None
+        except json.JSONDecodeError:
+            status = None
+        
+        if not status or status.get("status") != "ready":
+            error_msg = status.get("error", "Unknown error") if status else "No output from helper"
+            logger.error(f"EventKit helper failed to start: {error_msg}")
+            self._stop_helper()
+            return False
+        
+        return True
+
+    def _stop_helper(self) -> None:
+        """Terminate the persistent helper process if it is running."""
+        helper = self._helper
+        lines = self._helper_lines
+        self._helper = None
+        self._helper_lines = None
+        if helper is None:
+            return
+        
+        try:
+            if helper.poll() is None:
+                # Closing stdin lets the helper exit its request loop cleanly
+                helper.stdin.close()
+                try:
+                    helper.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    helper.kill()
+                    helper.wait()
+            logger.info("Stopped persistent EventKit helper")
+        except Exception as e:
+            logger.debug(f"Error stopping EventKit helper: {e}")
+        
+        if lines is not None:
+            self._drain_queue(lines)
+
+    @staticmethod
+    def _drain_queue(lines: "queue.Queue") -> None:
+        """
+        Discard unread output of a finished process.
+        
+        This unblocks the output pump if it is waiting on a full queue, letting its
+        thread exit once it reaches the end of the stream.
+        
+        Args:
+            lines: Queue fed by _pump_output
+        """
+        try:
+            while lines.get(timeout=0.5) is not None:
+                pass
+        except queue.Empty:
+            pass
+
+    @staticmethod
+    def _pump_output(stream, lines: "queue.Queue") -> None:
+        """
+        Forward lines from the helper's stdout to a queue.
+        
+        Args:
+            stream: Helper stdout stream
+            lines: Queue receiving each line, followed by None at end of stream
+        """
+        try:
+            for line in stream:
+                if line.strip():
+                    lines.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            lines.put(None)
+
+    @staticmethod
+    def _drain_stderr(stream) -> None:
+        """
+        Log the helper's stderr so the pipe never fills up.
+        
+        Args:
+            stream: Helper stderr stream
+        """
+        try:
+            for line in stream:
+                logger.debug(f"EventKit helper: {line.rstrip()}")
+        except (OSError, ValueError):
+            pass
 
 if __name__ == "__main__":
     # Simple test function when run directly
@@ -286,6 +841,6 @@ if __name__ == "__main__":
     print("\nEvents for next 7 days:")
     events = calendar.get_events(days_ahead=7)
     for event in events:
-        print(f" - {event['title']} ({event['start_date']})")
-        if event.get('location'):
-            print(f"   Location: {event['location']}")
+        print(f" - {event.title} ({event.start})")
+        if event.location:
+            print(f"   Location: {event.location}")
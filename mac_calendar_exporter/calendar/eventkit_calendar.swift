@@ -6,9 +6,10 @@ import EventKit
 // Command line arguments
 let args = CommandLine.arguments
 var operation = "calendars"  // Default operation
-var calendarName: String? = nil
+var calendarNames: [String] = []
 var startDateStr: String? = nil
 var endDateStr: String? = nil
+var ndjson = false
 
 // Parse arguments
 var i = 1
@@ -18,10 +19,17 @@ while i < args.count {
         operation = "calendars"
     case "--events":
         operation = "events"
+    case "--serve":
+        // Long-lived mode: read one JSON request per line from stdin
+        operation = "serve"
+    case "--ndjson":
+        // Stream one compact JSON line per event instead of a single document
+        ndjson = true
     case "--calendar":
         i += 1
         if i < args.count {
-            calendarName = args[i]
+            // May be given multiple times to fetch several calendars in one run
+            calendarNames.append(args[i])
         }
     case "--start-date":
         i += 1
@@ -44,27 +52,267 @@ let dateFormatter = DateFormatter()
 dateFormatter.dateFormat = "yyyy-MM-dd"
 dateFormatter.timeZone = TimeZone.current
 
-// Parse dates
-let startDate: Date
-if let dateStr = startDateStr, let date = dateFormatter.date(from: dateStr) {
-    startDate = date
-} else {
-    startDate = Date() // Today
-}
-
-let endDate: Date
-if let dateStr = endDateStr, let date = dateFormatter.date(from: dateStr) {
-    endDate = date
-} else {
-    // Default to 30 days ahead
-    endDate = Calendar.current.date(byAdding: .day, value: 30, to: startDate)!
-}
-
 // Output date formatter (for event dates)
 let outputDateFormatter = DateFormatter()
 outputDateFormatter.dateFormat = "yyyy-MM-dd HH:mm:ss"
 outputDateFormatter.timeZone = TimeZone.current
 
+// Parse a date range, defaulting to today and 30 days ahead
+func parseDateRange(_ startStr: String?, _ endStr: String?) -> (Date, Date) {
+    let startDate: Date
+    if let dateStr = startStr, let date = dateFormatter.date(from: dateStr) {
+        startDate = date
+    } else {
+        startDate = Date() // Today
+    }
+
+    let endDate: Date
+    if let dateStr = endStr, let date = dateFormatter.date(from: dateStr) {
+        endDate = date
+    } else {
+        // Default to 30 days ahead
+        endDate = Calendar.current.date(byAdding: .day, value: 30, to: startDate)!
+    }
+    return (startDate, endDate)
+}
+
+// List all event calendars
+func listCalendars(_ eventStore: EKEventStore) -> [String: Any] {
+    let calendars = eventStore.calendars(for: .event)
+    var calendarList: [[String: Any]] = []
+
+    for calendar in calendars {
+        let calendarDict: [String: Any] = [
+            "title": calendar.title,
+            "id": calendar.calendarIdentifier,
+            "type": calendar.type.rawValue,
+            "source": calendar.source.title
+        ]
+        calendarList.append(calendarDict)
+    }
+    return ["calendars": calendarList]
+}
+
+// iCalendar weekday names, indexed by EKWeekday raw value - 1 (Sunday first)
+let weekdayNames = ["SU", "MO", "TU", "WE", "TH", "FR", "SA"]
+
+// Convert a recurrence rule to an RRULE value. The end of the series (UNTIL or
+// COUNT) is left out; the exporter bounds the series to the exported date range.
+func recurrenceRuleString(_ rule: EKRecurrenceRule) -> String {
+    var parts: [String] = []
+    switch rule.frequency {
+    case .daily:
+        parts.append("FREQ=DAILY")
+    case .weekly:
+        parts.append("FREQ=WEEKLY")
+    case .monthly:
+        parts.append("FREQ=MONTHLY")
+    case .yearly:
+        parts.append("FREQ=YEARLY")
+    @unknown default:
+        parts.append("FREQ=DAILY")
+    }
+    if rule.interval > 1 {
+        parts.append("INTERVAL=\(rule.interval)")
+    }
+    if let days = rule.daysOfTheWeek, !days.isEmpty {
+        let byDay = days.map { day -> String in
+            let name = weekdayNames[day.dayOfTheWeek.rawValue - 1]
+            return day.weekNumber != 0 ? "\(day.weekNumber)\(name)" : name
+        }
+        parts.append("BYDAY=" + byDay.joined(separator: ","))
+    }
+
+    let numberLists: [(String, [NSNumber]?)] = [
+        ("BYMONTHDAY", rule.daysOfTheMonth),
+        ("BYMONTH", rule.monthsOfTheYear),
+        ("BYWEEKNO", rule.weeksOfTheYear),
+        ("BYYEARDAY", rule.daysOfTheYear),
+        ("BYSETPOS", rule.setPositions)
+    ]
+    for (name, numbers) in numberLists {
+        if let numbers = numbers, !numbers.isEmpty {
+            parts.append("\(name)=" + numbers.map { $0.stringValue }.joined(separator: ","))
+        }
+    }
+    if rule.firstDayOfTheWeek >= 1 && rule.firstDayOfTheWeek <= 7 {
+        parts.append("WKST=\(weekdayNames[rule.firstDayOfTheWeek - 1])")
+    }
+    return parts.joined(separator: ";")
+}
+
+// Convert an event to its JSON dictionary
+func eventDictionary(_ event: EKEvent) -> [String: Any] {
+    var eventDict: [String: Any] = [
+        "event_id": event.eventIdentifier ?? UUID().uuidString,
+        "calendar_name": event.calendar.title,
+        "title": event.title ?? "(No Title)",
+        "start_date": outputDateFormatter.string(from: event.startDate),
+        "end_date": outputDateFormatter.string(from: event.endDate),
+        "all_day": event.isAllDay
+    ]
+
+    if let loc = event.location, !loc.isEmpty {
+        eventDict["location"] = loc
+    }
+
+    if let notes = event.notes, !notes.isEmpty {
+        eventDict["description"] = notes
+    }
+
+    if let url = event.url?.absoluteString {
+        eventDict["url"] = url
+    }
+
+    // Occurrences of a recurring series carry the series rule and their original
+    // start, so the exporter can collapse them back into one recurring event
+    if let rule = event.recurrenceRules?.first {
+        eventDict["recurrence_rule"] = recurrenceRuleString(rule)
+    }
+    if event.hasRecurrenceRules || event.isDetached {
+        if let occurrenceDate = event.occurrenceDate {
+            eventDict["occurrence_date"] = outputDateFormatter.string(from: occurrenceDate)
+        }
+        if event.isDetached {
+            eventDict["detached"] = true
+        }
+    }
+
+    return eventDict
+}
+
+// Pass each event of the given calendars (all calendars if empty) to emit,
+// returning an error message for every calendar that could not be found
+func enumerateEvents(_ eventStore: EKEventStore, _ names: [String], _ startDate: Date, _ endDate: Date,
+                     _ emit: ([String: Any]) -> Void) -> [String: String] {
+    var targetCalendars: [EKCalendar]?
+    var calendarErrors: [String: String] = [:]
+
+    if !names.isEmpty {
+        // Filter calendars by name, reporting missing ones instead of aborting
+        let allCalendars = eventStore.calendars(for: .event)
+        var matched: [EKCalendar] = []
+        for name in names {
+            let found = allCalendars.filter { $0.title == name }
+            if found.isEmpty {
+                calendarErrors[name] = "Calendar '\(name)' not found"
+            } else {
+                matched.append(contentsOf: found)
+            }
+        }
+        targetCalendars = matched
+    }
+
+    // An empty calendar list would match all calendars, so only query when something matched
+    if targetCalendars == nil || !(targetCalendars!.isEmpty) {
+        let predicate = eventStore.predicateForEvents(withStart: startDate, end: endDate, calendars: targetCalendars)
+        // Enumerate instead of events(matching:) so events are never all held at once
+        eventStore.enumerateEvents(matching: predicate) { (event, _) in
+            emit(eventDictionary(event))
+        }
+    }
+
+    return calendarErrors
+}
+
+// Fetch events for the given calendars (all calendars if empty) as one document
+func fetchEvents(_ eventStore: EKEventStore, _ names: [String], _ startDate: Date, _ endDate: Date) -> [String: Any] {
+    var outputDict: [String: Any] = [:]
+    var eventList: [[String: Any]] = []
+
+    let calendarErrors = enumerateEvents(eventStore, names, startDate, endDate) { eventDict in
+        eventList.append(eventDict)
+    }
+
+    outputDict["events"] = eventList
+    outputDict["start_date"] = outputDateFormatter.string(from: startDate)
+    outputDict["end_date"] = outputDateFormatter.string(from: endDate)
+    if !names.isEmpty {
+        outputDict["calendar_names"] = names
+    }
+    if !calendarErrors.isEmpty {
+        outputDict["calendar_errors"] = calendarErrors
+    }
+    return outputDict
+}
+
+// Stream events as NDJSON: one "event" line per event, one "calendar_error" line
+// per missing calendar and a final "end" line. Extra fields (such as a request id)
+// are added to every line.
+func streamEvents(_ eventStore: EKEventStore, _ names: [String], _ startDate: Date, _ endDate: Date,
+                  _ extra: [String: Any]) {
+    var count = 0
+    let calendarErrors = enumerateEvents(eventStore, names, startDate, endDate) { eventDict in
+        var line = eventDict.merging(extra) { current, _ in current }
+        line["type"] = "event"
+        printJSON(line, pretty: false)
+        count += 1
+    }
+
+    for (name, message) in calendarErrors {
+        var line: [String: Any] = ["type": "calendar_error", "calendar": name, "error": message]
+        line.merge(extra) { current, _ in current }
+        printJSON(line, pretty: false)
+    }
+
+    var end: [String: Any] = [
+        "type": "end",
+        "count": count,
+        "start_date": outputDateFormatter.string(from: startDate),
+        "end_date": outputDateFormatter.string(from: endDate)
+    ]
+    end.merge(extra) { current, _ in current }
+    printJSON(end, pretty: false)
+}
+
+// Print a dictionary as JSON
+func printJSON(_ dict: [String: Any], pretty: Bool) {
+    do {
+        let options: JSONSerialization.WritingOptions = pretty ? .prettyPrinted : []
+        let jsonData = try JSONSerialization.data(withJSONObject: dict, options: options)
+        if let jsonString = String(data: jsonData, encoding: .utf8) {
+            print(jsonString)
+        }
+    } catch {
+        print("{\"error\": \"JSON serialization failed: \(error.localizedDescription)\"}")
+    }
+}
+
+// Handle one request in serve mode, returning nil if the response was already streamed
+func handleRequest(_ eventStore: EKEventStore, _ line: String) -> [String: Any]? {
+    guard let data = line.data(using: .utf8),
+          let request = (try? JSONSerialization.jsonObject(with: data, options: [])) as? [String: Any] else {
+        return ["error": "Invalid request"]
+    }
+
+    var response: [String: Any]
+    switch request["operation"] as? String ?? "" {
+    case "ping":
+        response = ["status": "ok"]
+    case "calendars":
+        response = listCalendars(eventStore)
+    case "events":
+        let names = request["calendars"] as? [String] ?? []
+        let (startDate, endDate) = parseDateRange(request["start_date"] as? String, request["end_date"] as? String)
+        if request["format"] as? String == "ndjson" {
+            var extra: [String: Any] = [:]
+            if let requestId = request["id"] {
+                extra["id"] = requestId
+            }
+            streamEvents(eventStore, names, startDate, endDate, extra)
+            return nil
+        }
+        response = fetchEvents(eventStore, names, startDate, endDate)
+    default:
+        response = ["error": "Unknown operation"]
+    }
+
+    if let requestId = request["id"] {
+        response["id"] = requestId
+    }
+    return response
+}
+
 // EventKit store
 let eventStore = EKEventStore()
 
@@ -72,111 +320,56 @@ let eventStore = EKEventStore()
 let group = DispatchGroup()
 group.enter()
 
+var accessGranted = false
+var accessError: Error? = nil
+
 // Request access to calendar
 eventStore.requestAccess(to: .event) { (granted, error) in
-    if granted {
-        do {
-            // Prepare output JSON
-            var outputDict: [String: Any] = [:]
-            
-            switch operation {
-            case "calendars":
-                let calendars = eventStore.calendars(for: .event)
-                var calendarList: [[String: Any]] = []
-                
-                for calendar in calendars {
-                    let calendarDict: [String: Any] = [
-                        "title": calendar.title,
-                        "id": calendar.calendarIdentifier,
-                        "type": calendar.type.rawValue,
-                        "source": calendar.source.title
-                    ]
-                    calendarList.append(calendarDict)
-                }
-                outputDict["calendars"] = calendarList
-                
-            case "events":
-                var targetCalendars: [EKCalendar]?
-                
-                if let name = calendarName {
-                    // Filter calendars by name
-                    targetCalendars = eventStore.calendars(for: .event).filter { $0.title == name }
-                    if targetCalendars?.isEmpty ?? true {
-                        print("Error: Calendar '\(name)' not found")
-                        exit(1)
-                    }
-                }
-                
-                let predicate = eventStore.predicateForEvents(withStart: startDate, end: endDate, calendars: targetCalendars)
-                let events = eventStore.events(matching: predicate)
-                
-                var eventList: [[String: Any]] = []
-                for event in events {
-                    var eventDict: [String: Any] = [
-                        "event_id": event.eventIdentifier ?? UUID().uuidString,
-                        "calendar_name": event.calendar.title,
-                        "title": event.title ?? "(No Title)",
-                        "start_date": outputDateFormatter.string(from: event.startDate),
-                        "end_date": outputDateFormatter.string(from: event.endDate),
-                        "all_day": event.isAllDay
-                    ]
-                    
-                    if let loc = event.location, !loc.isEmpty {
-                        eventDict["location"] = loc
-                    }
-                    
-                    if let notes = event.notes, !notes.isEmpty {
-                        eventDict["description"] = notes
-                    }
-                    
-                    if let url = event.url?.absoluteString {
-                        eventDict["url"] = url
-                    }
-                    
-                    eventList.append(eventDict)
-                }
-                
-                outputDict["events"] = eventList
-                outputDict["start_date"] = outputDateFormatter.string(from: startDate)
-                outputDict["end_date"] = outputDateFormatter.string(from: endDate)
-                if let name = calendarName {
-                    outputDict["calendar_name"] = name
-                }
-            default:
-                outputDict["error"] = "Unknown operation"
-            }
-            
-            // Convert to JSON and print
-            let jsonData = try JSONSerialization.data(withJSONObject: outputDict, options: .prettyPrinted)
-            if let jsonString = String(data: jsonData, encoding: .utf8) {
-                print(jsonString)
-            }
-        } catch {
-            print("Error: \(error.localizedDescription)")
-        }
-    } else {
-        // Output error as JSON for better parsing
-        var errorDict: [String: Any] = [
-            "error": "Access denied to calendar",
-            "message": error?.localizedDescription ?? "Unknown error"
-        ]
-        if let error = error {
-            errorDict["error_code"] = (error as NSError).code
-            errorDict["error_domain"] = (error as NSError).domain
-        }
-        
-        do {
-            let jsonData = try JSONSerialization.data(withJSONObject: errorDict, options: [])
-            if let jsonString = String(data: jsonData, encoding: .utf8) {
-                print(jsonString)
-            }
-        } catch {
-            print("{\"error\": \"Access denied or error: \(String(describing: error))\"}")
-        }
-    }
-    
+    accessGranted = granted
+    accessError = error
     group.leave()
 }
 
 // Wait for the async operation to complete
 group.wait()
+
+if accessGranted {
+    switch operation {
+    case "calendars":
+        printJSON(listCalendars(eventStore), pretty: true)
+    case "events":
+        let (startDate, endDate) = parseDateRange(startDateStr, endDateStr)
+        if ndjson {
+            streamEvents(eventStore, calendarNames, startDate, endDate, [:])
+        } else {
+            printJSON(fetchEvents(eventStore, calendarNames, startDate, endDate), pretty: true)
+        }
+    case "serve":
+        // Announce readiness, then answer one compact JSON line per request until stdin closes
+        printJSON(["status": "ready"], pretty: false)
+        fflush(stdout)
+        while let line = readLine() {
+            if line.trimmingCharacters(in: .whitespaces).isEmpty {
+                continue
+            }
+            if let response = handleRequest(eventStore, line) {
+                printJSON(response, pretty: false)
+            }
+            // Responses are only flushed once complete so streamed events stay buffered
+            fflush(stdout)
+        }
+    default:
+        printJSON(["error": "Unknown operation"], pretty: true)
+    }
+} else {
+    // Output error as JSON for better parsing
+    var errorDict: [String: Any] = [
+        "error": "Access denied to calendar",
+        "message": accessError?.localizedDescription ?? "Unknown error"
+    ]
+    if let error = accessError {
+        errorDict["error_code"] = (error as NSError).code
+        errorDict["error_domain"] = (error as NSError).domain
+    }
+    printJSON(errorDict, pretty: false)
+}
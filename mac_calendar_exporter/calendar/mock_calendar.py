@@ -3,11 +3,16 @@
 Mock Calendar Data Module.
 
 This module provides mock calendar data for testing or when Calendar app access fails.
+For scale testing, SyntheticCalendar lazily generates large, seeded calendars with
+recurring series, all-day events, Unicode and long titles and sizable notes.
 """
 
 import logging
-from datetime import datetime, timedelta, time
-from typing import Dict, List, Optional
+import random
+from datetime import date, datetime, timedelta, time
+from typing import Dict, Iterator, List, Optional
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +40,7 @@ class MockCalendarData:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         days_ahead: Optional[int] = 30
-    ) -> List[Dict]:
+    ) -> List[CalendarEvent]:
         """
         Generate mock events.
         
@@ -46,7 +51,7 @@ class MockCalendarData:
             days_ahead: Number of days ahead to generate events
             
         Returns:
-            List[Dict]: List of mock event dictionaries
+            List[CalendarEvent]: List of mock events
         """
         if start_date is None:
             start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -70,78 +75,423 @@ class MockCalendarData:
             if current_date.weekday() < 5:  # Monday to Friday
                 meeting_start = datetime.combine(current_date.date(), time(9, 0))
                 meeting_end = datetime.combine(current_date.date(), time(10, 0))
-                events.append({
-                    "event_id": f"event-{event_id}",
-                    "calendar_name": cal_name,
-                    "title": "Morning Team Meeting",
-                    "location": "Conference Room",
-                    "description": "Daily team sync-up",
-                    "start_date": meeting_start.strftime("%Y-%m-%d %H:%M:%S"),
-                    "end_date": meeting_end.strftime("%Y-%m-%d %H:%M:%S"),
-                    "all_day": False
-                })
+                events.append(CalendarEvent(
+                    event_id=f"event-{event_id}",
+                    calendar_name=cal_name,
+                    title="Morning Team Meeting",
+                    location="Conference Room",
+                    description="Daily team sync-up",
+                    start=meeting_start,
+                    end=meeting_end,
+                    all_day=False
+                ))
                 event_id += 1
             
             # Lunch every day
             lunch_start = datetime.combine(current_date.date(), time(12, 0))
             lunch_end = datetime.combine(current_date.date(), time(13, 0))
-            events.append({
-                "event_id": f"event-{event_id}",
-                "calendar_name": cal_name,
-                "title": "Lunch Break",
-                "location": "",
-                "description": "",
-                "start_date": lunch_start.strftime("%Y-%m-%d %H:%M:%S"),
-                "end_date": lunch_end.strftime("%Y-%m-%d %H:%M:%S"),
-                "all_day": False
-            })
+            events.append(CalendarEvent(
+                event_id=f"event-{event_id}",
+                calendar_name=cal_name,
+                title="Lunch Break",
+                location=None,
+                description=None,
+                start=lunch_start,
+                end=lunch_end,
+                all_day=False
+            ))
             event_id += 1
             
             # Weekly review on Fridays
             if current_date.weekday() == 4:  # Friday
                 review_start = datetime.combine(current_date.date(), time(15, 0))
                 review_end = datetime.combine(current_date.date(), time(16, 0))
-                events.append({
-                    "event_id": f"event-{event_id}",
-                    "calendar_name": cal_name,
-                    "title": "Weekly Review",
-                    "location": "Main Conference Room",
-                    "description": "Review of the week's progress",
-                    "start_date": review_start.strftime("%Y-%m-%d %H:%M:%S"),
-                    "end_date": review_end.strftime("%Y-%m-%d %H:%M:%S"),
-                    "all_day": False
-                })
+                events.append(CalendarEvent(
+                    event_id=f"event-{event_id}",
+                    calendar_name=cal_name,
+                    title="Weekly Review",
+                    location="Main Conference Room",
+                    description="Review of the week's progress",
+                    start=review_start,
+                    end=review_end,
+                    all_day=False
+                ))
                 event_id += 1
                 
             # Weekend events
             if current_date.weekday() == 5:  # Saturday
-                events.append({
-                    "event_id": f"event-{event_id}",
-                    "calendar_name": cal_name,
-                    "title": "Weekend Brunch",
-                    "location": "Cafe Central",
-                    "description": "Brunch with friends",
-                    "start_date": current_date.strftime("%Y-%m-%d"),
-                    "end_date": current_date.strftime("%Y-%m-%d"),
-                    "all_day": True
-                })
+                events.append(CalendarEvent(
+                    event_id=f"event-{event_id}",
+                    calendar_name=cal_name,
+                    title="Weekend Brunch",
+                    location="Cafe Central",
+                    description="Brunch with friends",
+                    start=current_date.date(),
+                    end=current_date.date(),
+                    all_day=True
+                ))
                 event_id += 1
             
             # Add holiday or special events
             if current_date.day == 1 and current_date.month == 5:  # May 1
-                events.append({
-                    "event_id": f"event-{event_id}",
-                    "calendar_name": cal_name,
-                    "title": "Labor Day",
-                    "location": "",
-                    "description": "Public Holiday",
-                    "start_date": current_date.strftime("%Y-%m-%d"),
-                    "end_date": current_date.strftime("%Y-%m-%d"),
-                    "all_day": True
-                })
+                events.append(CalendarEvent(
+                    event_id=f"event-{event_id}",
+                    calendar_name=cal_name,
+                    title="Labor Day",
+                    location=None,
+                    description="Public Holiday",
+                    start=current_date.date(),
+                    end=current_date.date(),
+                    all_day=True
+                ))
                 event_id += 1
                 
             current_date += timedelta(days=1)
         
         logger.info(f"Generated {len(events)} mock events for calendar '{cal_name}'")
         return events
+
+    @staticmethod
+    def get_synthetic_events(
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        days_ahead: Optional[int] = 30,
+        limit: Optional[int] = None,
+        **options
+    ) -> Iterator[CalendarEvent]:
+        """
+        Lazily generate a large synthetic calendar for scale testing.
+        
+        Args:
+            start_date: Start date for events
+            end_date: End date for events
+            days_ahead: Number of days ahead to generate events (None to run until limit)
+            limit: Maximum number of events to generate
+            **options: SyntheticCalendar options (seed, calendars, events_per_day, ...)
+            
+        Returns:
+            Iterator[CalendarEvent]: Synthetic events in start order
+        """
+        return SyntheticCalendar(**options).events(start_date, end_date, days_ahead, limit)
+
+
+# Recurrence patterns of synthetic series and their expected occurrences per day
+RECURRENCE_PATTERNS = {
+    "daily": 1.0,
+    "weekdays": 5 / 7,
+    "weekly": 1 / 7,
+    "biweekly": 1 / 14,
+    "monthly": 12 / 365,
+}
+
+# iCalendar weekday names, Monday first like date.weekday()
+WEEKDAY_NAMES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+SYNTHETIC_CALENDAR_NAMES = ["Work", "Personal", "Family", "Projekte Übersicht", "Sports", "Holidays"]
+
+SYNTHETIC_TITLES = [
+    "Team Meeting", "Project Sync", "1:1", "Code Review", "Sprint Planning", "Customer Call",
+    "Lunch", "Dentist", "Gym", "Site Visit", "Budget Review", "Interview", "Workshop",
+]
+
+SYNTHETIC_TOPICS = ["Q3", "Roadmap", "Release 2.4", "Berlin Office", "Onboarding", "Backlog", "Hiring", "Infra"]
+
+# Non-ASCII titles exercising UTF-8 encoding and line folding across multi-byte characters
+SYNTHETIC_UNICODE_TITLES = [
+    "Überprüfung der Jahresplanung",
+    "Café mit Jörg & Søren",
+    "会議: 四半期レビュー",
+    "Встреча команды по проекту",
+    "مراجعة المشروع الأسبوعية",
+    "🎉 Geburtstag 🎂 von Zoë",
+    "Ελληνικό μάθημα",
+    "Zürich ↔ München Reise",
+]
+
+SYNTHETIC_LOCATIONS = [
+    "Conference Room", "Main Conference Room", "Cafe Central", "Zoom", "Büro München, Raum 3.14",
+    "Home Office", "Hauptstraße 1, 10115 Berlin", "Customer Site; Building B",
+]
+
+SYNTHETIC_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua agenda notes follow-up action items "
+    "Grüße Straße naïve façade 日本語 テキスト данные ✓ →"
+).split()
+
+# Event durations in minutes, weighted towards common meeting lengths
+SYNTHETIC_DURATIONS = [15, 30, 30, 30, 45, 60, 60, 60, 90, 120, 180]
+
+
+class SyntheticCalendar:
+    """
+    Generate large, seeded synthetic calendars for scale testing.
+    
+    Events are generated day by day and yielded lazily, so millions of events
+    can be streamed through the pipeline without holding them in memory. The
+    same seed and options always produce the same events. Occurrences of a
+    recurring series share their event_id and carry the series' RRULE and their
+    original start, as they do in EventKit.
+    """
+    
+    def __init__(
+        self,
+        seed: int = 0,
+        calendars: int = 3,
+        events_per_day: float = 10.0,
+        recurring_ratio: float = 0.3,
+        patterns: Optional[Dict[str, float]] = None,
+        all_day_ratio: float = 0.05,
+        unicode_ratio: float = 0.1,
+        long_title_ratio: float = 0.02,
+        long_title_length: int = 300,
+        description_ratio: float = 0.5,
+        description_size: int = 200,
+        exception_ratio: float = 0.0,
+    ):
+        """
+        Initialize the SyntheticCalendar.
+        
+        Args:
+            seed: Random seed
+            calendars: Number of calendars
+            events_per_day: Average number of events per calendar and day
+            recurring_ratio: Share of events that are occurrences of recurring series
+            patterns: Relative weights of the recurrence patterns of new series, keyed
+                      by RECURRENCE_PATTERNS names, e.g. {"daily": 1, "weekly": 3}
+                      (None for all patterns with equal weight)
+            all_day_ratio: Share of one-off events that are all-day events
+            unicode_ratio: Share of titles with non-ASCII characters
+            long_title_ratio: Share of titles of about long_title_length characters
+            long_title_length: Length of long titles, not negative
+            description_ratio: Share of events with a description
+            description_size: Average description length in characters
+            exception_ratio: Share of recurring occurrences that are deleted or moved
+                             by an hour, half each
+        """
+        self.seed = seed
+        self.calendar_names = [
+            SYNTHETIC_CALENDAR_NAMES[i] if i < len(SYNTHETIC_CALENDAR_NAMES) else f"Calendar {i + 1}"
+            for i in range(calendars)
+        ]
+        self.events_per_day = events_per_day
+        self.recurring_ratio = recurring_ratio
+        if patterns is None:
+            patterns = dict.fromkeys(RECURRENCE_PATTERNS, 1.0)
+        unknown = set(patterns) - set(RECURRENCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown recurrence patterns: {', '.join(sorted(unknown))}")
+        self.patterns = {name: weight for name, weight in patterns.items() if weight > 0}
+        if recurring_ratio > 0 and not self.patterns:
+            raise ValueError("Recurring events need at least one pattern with a positive weight")
+        if long_title_length < 0:
+            raise ValueError(f"long_title_length must not be negative, got {long_title_length}")
+        self.all_day_ratio = all_day_ratio
+        self.unicode_ratio = unicode_ratio
+        self.long_title_ratio = long_title_ratio
+        self.long_title_length = long_title_length
+        self.description_ratio = description_ratio
+        self.description_size = description_size
+        self.exception_ratio = exception_ratio
+        
+        # Descriptions and long titles are slices of one text block, far cheaper than
+        # building each from words. The block is longer than any slice taken from it.
+        rng = random.Random(seed)
+        words = []
+        length = 0
+        while length < max(65536, description_size * 4, long_title_length + 1):
+            word = rng.choice(SYNTHETIC_WORDS)
+            separator = rng.choice(["\n", ", ", "; ", ". ", " ", " ", " ", " "])
+            words.append(word + separator)
+            length += len(word) + len(separator)
+        self._text = "".join(words)
+    
+    def get_calendars(self) -> List[Dict[str, str]]:
+        """
+        Return the synthetic calendars.
+        
+        Returns:
+            List[Dict[str, str]]: List of dictionaries with calendar info
+        """
+        return [{"title": name} for name in self.calendar_names]
+    
+    def events(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        days_ahead: Optional[int] = 30,
+        limit: Optional[int] = None
+    ) -> Iterator[CalendarEvent]:
+        """
+        Lazily generate events, day by day in start order.
+        
+        Args:
+            start_date: Start date for events
+            end_date: End date for events
+            days_ahead: Number of days ahead to generate events (None to run until limit)
+            limit: Maximum number of events to generate
+            
+        Returns:
+            Iterator[CalendarEvent]: Synthetic events
+            
+        Raises:
+            ValueError: If neither an end date, days_ahead nor limit bounds the output
+        """
+        if start_date is None:
+            start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if end_date is None and days_ahead is not None:
+            end_date = start_date + timedelta(days=days_ahead)
+        if end_date is None and limit is None:
+            raise ValueError("Synthetic calendar needs an end date, days_ahead or a limit")
+        
+        return self._generate(start_date.date(), end_date.date() if end_date else None, limit)
+    
+    def _generate(self, first_day: date, last_day: Optional[date], limit: Optional[int]) -> Iterator[CalendarEvent]:
+        """Yield events for each day from first_day through last_day until limit is reached."""
+        rng = random.Random(self.seed)
+        series = [self._make_series(rng, calendar, first_day) for calendar in range(len(self.calendar_names))]
+        one_off_mean = self.events_per_day * (1 - self.recurring_ratio)
+        
+        count = 0
+        event_number = 0
+        day = first_day
+        while last_day is None or day <= last_day:
+            day_events = []
+            for calendar, calendar_name in enumerate(self.calendar_names):
+                for pattern, anchor, minute, duration, fields in series[calendar]:
+                    if self._occurs(pattern, anchor, day):
+                        occurrence_start = datetime.combine(day, time()) + timedelta(minutes=minute)
+                        start = occurrence_start
+                        detached = False
+                        if self.exception_ratio:
+                            exception = rng.random()
+                            if exception < self.exception_ratio / 2:
+                                continue
+                            if exception < self.exception_ratio:
+                                start += timedelta(hours=1)
+                                detached = True
+                        day_events.append(CalendarEvent(
+                            calendar_name=calendar_name,
+                            start=start,
+                            end=start + timedelta(minutes=duration),
+                            occurrence_start=occurrence_start,
+                            detached=detached,
+                            **fields
+                        ))
+                
+                for _ in range(int(rng.random() * 2 * one_off_mean + 0.5)):
+                    event_number += 1
+                    day_events.append(self._make_event(rng, f"synthetic-{self.seed}-{event_number}",
+                                                       calendar_name, day))
+            
+            # All-day events sort as starting at midnight, before any timed event
+            day_events.sort(key=lambda e: datetime.combine(e.start, time()) if e.all_day else e.start)
+            for event in day_events:
+                if limit is not None and count >= limit:
+                    return
+                yield event
+                count += 1
+            day += timedelta(days=1)
+    
+    def _make_series(self, rng: random.Random, calendar: int, first_day: date) -> List[tuple]:
+        """Create the recurring series of a calendar, adding up to its share of events per day."""
+        target = self.events_per_day * self.recurring_ratio
+        series = []
+        expected = 0.0
+        while expected < target:
+            pattern = self._pattern(rng)
+            anchor = first_day + timedelta(days=rng.randrange(28))
+            minute = rng.randrange(7 * 4, 20 * 4) * 15
+            duration = rng.choice(SYNTHETIC_DURATIONS)
+            fields = {
+                "event_id": f"synthetic-{self.seed}-series-{calendar}-{len(series)}",
+                "title": self._title(rng),
+                "location": self._location(rng),
+                "description": self._description(rng),
+                "recurrence_rule": self._rule(pattern, anchor),
+            }
+            series.append((pattern, anchor, minute, duration, fields))
+            expected += RECURRENCE_PATTERNS[pattern]
+        return series
+    
+    def _pattern(self, rng: random.Random) -> str:
+        """Pick the recurrence pattern of a new series by weight."""
+        names = list(self.patterns)
+        weights = list(self.patterns.values())
+        if len(set(weights)) == 1:
+            # Equal weights pick with one choice() draw rather than the float draw of
+            # choices(), so a given seed keeps producing the same stream of events
+            return rng.choice(names)
+        return rng.choices(names, weights)[0]
+    
+    @staticmethod
+    def _rule(pattern: str, anchor: date) -> str:
+        """Return the RRULE value of a series with the given pattern and anchor day."""
+        if pattern == "daily":
+            return "FREQ=DAILY"
+        if pattern == "weekdays":
+            return "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"
+        if pattern == "weekly":
+            return f"FREQ=WEEKLY;BYDAY={WEEKDAY_NAMES[anchor.weekday()]}"
+        if pattern == "biweekly":
+            return f"FREQ=WEEKLY;INTERVAL=2;BYDAY={WEEKDAY_NAMES[anchor.weekday()]}"
+        return f"FREQ=MONTHLY;BYMONTHDAY={anchor.day}"
+    
+    @staticmethod
+    def _occurs(pattern: str, anchor: date, day: date) -> bool:
+        """Check whether a series with the given pattern and anchor day occurs on a day."""
+        if pattern == "daily":
+            return True
+        if pattern == "weekdays":
+            return day.weekday() < 5
+        if pattern == "weekly":
+            return day.weekday() == anchor.weekday()
+        if pattern == "biweekly":
+            return (day - anchor).days % 14 == 0
+        return day.day == anchor.day
+    
+    def _make_event(self, rng: random.Random, event_id: str, calendar_name: str, day: date) -> CalendarEvent:
+        """Create a one-off event on a day."""
+        if rng.random() < self.all_day_ratio:
+            # EventKit reports the last day of an all-day event as its end
+            start = day
+            end = day + timedelta(days=rng.choice([0, 0, 0, 1, 2]))
+            all_day = True
+        else:
+            start = datetime.combine(day, time()) + timedelta(minutes=rng.randrange(7 * 4, 20 * 4) * 15)
+            end = start + timedelta(minutes=rng.choice(SYNTHETIC_DURATIONS))
+            all_day = False
+        
+        return CalendarEvent(
+            event_id=event_id,
+            calendar_name=calendar_name,
+            title=self._title(rng),
+            start=start,
+            end=end,
+            all_day=all_day,
+            location=self._location(rng),
+            description=self._description(rng),
+        )
+    
+    def _title(self, rng: random.Random) -> str:
+        """Pick a title: long, Unicode or plain according to the configured ratios."""
+        r = rng.random()
+        if r < self.long_title_ratio:
+            start = rng.randrange(len(self._text) - self.long_title_length)
+            return self._text[start:start + self.long_title_length].replace("\n", " ")
+        if r < self.long_title_ratio + self.unicode_ratio:
+            return rng.choice(SYNTHETIC_UNICODE_TITLES)
+        return f"{rng.choice(SYNTHETIC_TITLES)} {rng.choice(SYNTHETIC_TOPICS)}"
+    
+    @staticmethod
+    def _location(rng: random.Random) -> Optional[str]:
+        """Pick a location for about half of the events."""
+        return rng.choice(SYNTHETIC_LOCATIONS) if rng.random() < 0.5 else None
+    
+    def _description(self, rng: random.Random) -> Optional[str]:
+        """Slice a description of around description_size characters from the text block."""
+        if rng.random() >= self.description_ratio or self.description_size <= 0:
+            return None
+        size = rng.randint(self.description_size // 2, self.description_size * 3 // 2)
+        start = rng.randrange(len(self._text) - size)
+        return self._text[start:start + size]
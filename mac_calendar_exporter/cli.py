@@ -7,18 +7,21 @@ This module provides a CLI for the macOS Calendar Exporter using the Click libra
 
 import logging
 import os
+import signal
 import sys
 from typing import List, Optional
 
 import click
 
-from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
 from mac_calendar_exporter.config.config_manager import ConfigManager
-from mac_calendar_exporter.main import MacCalendarExporter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Commands import the exporter, EventKit, ICS and SFTP modules when they run, so
+# commands that do not need them (and --help) start without paying for paramiko,
+# icalendar and their dependencies.
+
 
 def setup_logging(level=logging.INFO):
     """Configure logging for the application."""
@@ -85,9 +88,51 @@ def cli(ctx, debug, config):
     "--no-upload", is_flag=True,
     help="Skip uploading to SFTP server"
 )
+@click.option(
+    "--compress",
+    type=click.Choice(["gzip", "zstd"]),
+    multiple=True,
+    help="Also write a compressed copy of the ICS file (can be used multiple times)"
+)
+@click.option(
+    "--force", is_flag=True,
+    help="Regenerate and upload even if the events are unchanged since the last export"
+)
+@click.option(
+    "--collapse-recurring", is_flag=True,
+    help="Write each recurring event as one event with an RRULE instead of one event per occurrence"
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False),
+    help="Write stage timings and counters of the run to this JSON file"
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False),
+    help="Profile the run with cProfile and write the statistics to this .pstats file"
+)
+@click.option(
+    "--profile-top",
+    type=int,
+    default=25,
+    show_default=True,
+    help="Number of functions listed in the profile summary"
+)
+@click.option(
+    "--profile-memory", is_flag=True,
+    help="Also report peak memory and allocation sites with tracemalloc (slow)"
+)
+@click.option(
+    "--profile-sampling", is_flag=True,
+    help="Profile with the pyinstrument sampling profiler instead of cProfile, if installed"
+)
 @click.pass_context
-def export_calendar(ctx, calendar, days, output, name, title_length, no_upload):
+def export_calendar(ctx, calendar, days, output, name, title_length, no_upload, compress, force,
+                    collapse_recurring, report, profile, profile_top, profile_memory, profile_sampling):
     """Export calendar entries to ICS file and upload to SFTP server."""
+    from mac_calendar_exporter.main import MacCalendarExporter
+    
     config_path = ctx.obj.get("config_path")
     
     # Convert tuple to list or None
@@ -110,9 +155,23 @@ def export_calendar(ctx, calendar, days, output, name, title_length, no_upload):
             exporter.config['title_length_limit'] = title_length
         if no_upload:
             exporter.config['enable_sftp'] = False
+        if compress:
+            exporter.config['ics_compression'] = list(compress)
+        if force:
+            exporter.config['incremental_export'] = False
+        if collapse_recurring:
+            exporter.config['collapse_recurring'] = True
+        if report:
+            exporter.config['run_report_file'] = report
             
         # Run export
-        success = exporter.run()
+        if profile:
+            from mac_calendar_exporter.utils.profiling import PipelineProfiler
+            with PipelineProfiler(profile, top=profile_top, memory=profile_memory, sampling=profile_sampling) as profiler:
+                success = exporter.run()
+            click.echo(profiler.summary)
+        else:
+            success = exporter.run()
         ics_file = exporter.config.get('ics_file', './calendar_export.ics')
         
         click.echo(f"Export completed successfully. ICS file: {ics_file}")
@@ -120,12 +179,147 @@ def export_calendar(ctx, calendar, days, output, name, title_length, no_upload):
         logger.exception("Export failed")
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
+    finally:
+        exporter.close()
+
+
+@cli.command("serve")
+@click.option(
+    "--host",
+    help="Address to listen on (default: 127.0.0.1)"
+)
+@click.option(
+    "--port", "-p",
+    type=int,
+    help="Port to listen on (default: 8080)"
+)
+@click.option(
+    "--interval", "-i",
+    type=int,
+    help="Seconds between exports (default: 900)"
+)
+@click.option(
+    "--path",
+    help="URL path of the calendar (default: /calendar.ics)"
+)
+@click.pass_context
+def serve(ctx, host, port, interval, path):
+    """Serve the exported ICS file over HTTP, re-exporting it periodically."""
+    from mac_calendar_exporter.main import MacCalendarExporter
+    from mac_calendar_exporter.server.http_server import DEFAULT_REFRESH_INTERVAL, ICSServer
+    
+    exporter = MacCalendarExporter(config=None)
+    config = exporter.config
+    
+    try:
+        server = ICSServer(
+            export=exporter.export_calendar,
+            host=host or config.get('http_host', '127.0.0.1'),
+            port=port if port is not None else config.get('http_port', 8080),
+            path=path or config.get('http_path', '/calendar.ics'),
+            refresh_interval=interval or config.get('http_refresh_interval', DEFAULT_REFRESH_INTERVAL)
+        )
+    except OSError as e:
+        click.echo(f"Error: Cannot start HTTP server: {e}", err=True)
+        exporter.close()
+        sys.exit(1)
+    
+    server.start()
+    click.echo(f"Serving calendar at http://{server.host}:{server.port}{server.path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        exporter.close()
+
+
+@cli.command("daemon")
+@click.option(
+    "--interval",
+    type=click.Choice(["hourly", "daily"]),
+    help="Export interval (default: schedule.interval from the config)"
+)
+@click.option(
+    "--time",
+    help="Time for daily exports, or minute for hourly exports, in 24h format HH:MM "
+         "(default: schedule.time from the config)"
+)
+@click.option(
+    "--run-now/--no-run-now",
+    default=True,
+    help="Run an export immediately on start (default: yes)"
+)
+@click.option(
+    "--metrics-port",
+    type=int,
+    help="Serve Prometheus metrics of the runs on this port (default: metrics_port from the config)"
+)
+@click.pass_context
+def daemon(ctx, interval, time, run_now, metrics_port):
+    """Run exports in a long-lived process on the configured schedule."""
+    from mac_calendar_exporter.daemon import ExportDaemon
+    from mac_calendar_exporter.main import MacCalendarExporter
+    
+    config_manager = ctx.obj.get("config_manager")
+    schedule = config_manager.get_schedule_config()
+    
+    if not schedule.get("enabled", False) and not interval:
+        click.echo("Scheduled exports are disabled. Enable them with configure-schedule "
+                   "or pass --interval.", err=True)
+        sys.exit(1)
+    
+    exporter = MacCalendarExporter(config=None)
+    # Keep the EventKit helper running between exports, unless PERSISTENT_HELPER says otherwise
+    exporter.config.setdefault('persistent_helper', True)
+    
+    try:
+        export_daemon = ExportDaemon(
+            exporter,
+            interval=interval or schedule.get("interval", "daily"),
+            at=time or schedule.get("time", "04:00"),
+            run_on_start=run_now
+        )
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        exporter.close()
+        sys.exit(1)
+    
+    metrics_server = None
+    metrics_port = metrics_port or exporter.config.get('metrics_port')
+    if metrics_port:
+        from mac_calendar_exporter.server.metrics_server import MetricsServer
+        try:
+            metrics_server = MetricsServer(
+                exporter.get_metrics(),
+                host=exporter.config.get('metrics_host', '127.0.0.1'),
+                port=metrics_port
+            ).start()
+        except OSError as e:
+            click.echo(f"Error: cannot serve metrics on port {metrics_port}: {e}", err=True)
+            exporter.close()
+            sys.exit(1)
+    
+    # Finish the current export and shut down cleanly on SIGTERM or Ctrl+C
+    def handle_signal(signum, frame):
+        export_daemon.stop()
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    try:
+        export_daemon.run_forever()
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
 
 @cli.command("list-calendars")
 @click.pass_context
 def list_calendars(ctx):
     """List available calendars in macOS Calendar app."""
+    from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
+    
     try:
         calendar_access = EventKitCalendarAccess()
         calendars = calendar_access.list_calendars()
@@ -301,9 +495,10 @@ def configure_schedule(ctx, enabled, interval, time):
                 
             # Note about actually setting up the schedule
             click.echo("\nIMPORTANT: This only saves the schedule configuration.")
-            click.echo("To actually schedule the export, you need to set up:")
-            click.echo(" - For macOS: A launchd plist file (see documentation)")
-            click.echo(" - For manual scheduling: A cron job or other scheduler")
+            click.echo("To actually schedule the export, either:")
+            click.echo(" - Keep the 'daemon' command running, which exports on this schedule")
+            click.echo(" - For macOS: Set up a launchd plist file (see documentation)")
+            click.echo(" - For manual scheduling: Set up a cron job or other scheduler")
     else:
         click.echo("Failed to save schedule configuration.", err=True)
         sys.exit(1)
@@ -12,9 +12,6 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-import keyring
-from dotenv import load_dotenv
-
 logger = logging.getLogger(__name__)
 
 # Default config file location
@@ -43,6 +40,7 @@ class ConfigManager:
             self.load_config()
         
         # Load environment variables
+        from dotenv import load_dotenv
         load_dotenv()
         self._apply_env_vars()
 
@@ -68,7 +66,18 @@ class ConfigManager:
                 "username": "",
                 "key_file": "",
                 "remote_path": "/calendar/calendar.ics",
-                "create_dirs": True
+                "create_dirs": True,
+                "atomic_upload": True,  # Upload to a temp file and rename it into place
+                "pool_idle_timeout": 300,  # Seconds an unused connection is kept open
+                "keepalive_interval": 30,  # Seconds between SSH keepalives, 0 to disable
+                "timeout": 30,  # Seconds to wait for the connection and each SFTP operation
+                "retries": 2,  # Retries after a failed upload to one destination
+                "max_concurrent_uploads": 4,  # Destinations uploaded to at the same time
+                "window_size": None,  # SSH window size in bytes, None for paramiko's default
+                "max_packet_size": None,  # SSH max packet size in bytes, None for paramiko's default
+                "request_size": 32768,  # Bytes per pipelined SFTP write request
+                "upload_compressed": True,  # Upload compressed sidecars next to the ICS file
+                "destinations": []  # Targets replacing the one above, each inheriting the settings it does not set
             },
             "schedule": {
                 "enabled": False,
@@ -132,6 +141,8 @@ class ConfigManager:
         # Remove sensitive fields (don't save passwords to file)
         if "sftp" in config_copy and "password" in config_copy["sftp"]:
             del config_copy["sftp"]["password"]
+        for destination in config_copy.get("sftp", {}).get("destinations", []):
+            destination.pop("password", None)
             
         return config_copy
 
@@ -184,6 +195,17 @@ class ConfigManager:
             except ValueError:
                 pass
         
+        # Number of calendars fetched in parallel
+        if os.environ.get("FETCH_CONCURRENCY"):
+            try:
+                self.config["fetch_concurrency"] = int(os.environ.get("FETCH_CONCURRENCY"))
+            except ValueError:
+                pass
+        
+        # Keep one helper process running between exports
+        if os.environ.get("PERSISTENT_HELPER"):
+            self.config["persistent_helper"] = os.environ.get("PERSISTENT_HELPER").lower() in ('true', 'yes', '1')
+        
         # ICS file path
         if os.environ.get("ICS_FILE"):
             self.config["ics_file"] = os.path.expanduser(os.environ.get("ICS_FILE"))
@@ -200,6 +222,77 @@ class ConfigManager:
         if os.environ.get("USE_MOCK_ON_FAILURE"):
             self.config["use_mock_on_failure"] = os.environ.get("USE_MOCK_ON_FAILURE").lower() in ('true', 'yes', '1')
         
+        # Skip regeneration and upload when the events are unchanged
+        if os.environ.get("INCREMENTAL_EXPORT"):
+            self.config["incremental_export"] = os.environ.get("INCREMENTAL_EXPORT").lower() in ('true', 'yes', '1')
+        
+        # Write recurring events as RRULE series
+        if os.environ.get("COLLAPSE_RECURRING"):
+            self.config["collapse_recurring"] = os.environ.get("COLLAPSE_RECURRING").lower() in ('true', 'yes', '1')
+        
+        # Cache rendered VEVENTs between exports
+        if os.environ.get("RENDER_CACHE"):
+            self.config["render_cache"] = os.environ.get("RENDER_CACHE").lower() in ('true', 'yes', '1')
+        
+        if os.environ.get("RENDER_CACHE_MAX_ENTRIES"):
+            try:
+                self.config["render_cache_max_entries"] = int(os.environ.get("RENDER_CACHE_MAX_ENTRIES"))
+            except ValueError:
+                pass
+        
+        # Compressed sidecar files written next to the ICS file
+        if os.environ.get("ICS_COMPRESSION"):
+            self.config["ics_compression"] = [name.strip() for name in os.environ.get("ICS_COMPRESSION").split(",")]
+        
+        # JSON report of each run, for monitoring
+        if os.environ.get("RUN_REPORT_FILE"):
+            self.config["run_report_file"] = os.environ.get("RUN_REPORT_FILE")
+        
+        # Schedule of the daemon command
+        if os.environ.get("SCHEDULE_ENABLED"):
+            self.config["schedule"]["enabled"] = os.environ.get("SCHEDULE_ENABLED").lower() in ('true', 'yes', '1')
+        
+        if os.environ.get("SCHEDULE_INTERVAL"):
+            self.config["schedule"]["interval"] = os.environ.get("SCHEDULE_INTERVAL").lower()
+        
+        if os.environ.get("SCHEDULE_TIME"):
+            self.config["schedule"]["time"] = os.environ.get("SCHEDULE_TIME")
+        
+        # Built-in HTTP server (serve command)
+        if os.environ.get("HTTP_HOST"):
+            self.config["http_host"] = os.environ.get("HTTP_HOST")
+        
+        if os.environ.get("HTTP_PORT"):
+            try:
+                self.config["http_port"] = int(os.environ.get("HTTP_PORT"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("HTTP_PATH"):
+            self.config["http_path"] = os.environ.get("HTTP_PATH")
+        
+        if os.environ.get("HTTP_REFRESH_INTERVAL"):
+            try:
+                self.config["http_refresh_interval"] = int(os.environ.get("HTTP_REFRESH_INTERVAL"))
+            except ValueError:
+                pass
+        
+        # Prometheus metrics of each run
+        if os.environ.get("METRICS_FILE"):
+            self.config["metrics_file"] = os.environ.get("METRICS_FILE")
+        
+        if os.environ.get("METRICS_FORMAT"):
+            self.config["metrics_format"] = os.environ.get("METRICS_FORMAT").lower()
+        
+        if os.environ.get("METRICS_HOST"):
+            self.config["metrics_host"] = os.environ.get("METRICS_HOST")
+        
+        if os.environ.get("METRICS_PORT"):
+            try:
+                self.config["metrics_port"] = int(os.environ.get("METRICS_PORT"))
+            except ValueError:
+                pass
+        
         # Include event details
         if os.environ.get("INCLUDE_DETAILS"):
             self.config["include_details"] = os.environ.get("INCLUDE_DETAILS").lower() in ('true', 'yes', '1')
@@ -252,6 +345,83 @@ class ConfigManager:
                 self.config["sftp"] = {}
             self.config["sftp"]["remote_path"] = os.environ.get("SFTP_PATH")
         
+        if os.environ.get("SFTP_UPLOAD_COMPRESSED"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            self.config["sftp"]["upload_compressed"] = os.environ.get("SFTP_UPLOAD_COMPRESSED").lower() in ('true', 'yes', '1')
+        
+        if os.environ.get("SFTP_ATOMIC_UPLOAD"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            self.config["sftp"]["atomic_upload"] = os.environ.get("SFTP_ATOMIC_UPLOAD").lower() in ('true', 'yes', '1')
+        
+        # Connection reuse between uploads
+        if os.environ.get("SFTP_POOL_IDLE_TIMEOUT"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["pool_idle_timeout"] = int(os.environ.get("SFTP_POOL_IDLE_TIMEOUT"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("SFTP_KEEPALIVE_INTERVAL"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["keepalive_interval"] = int(os.environ.get("SFTP_KEEPALIVE_INTERVAL"))
+            except ValueError:
+                pass
+        
+        # Timeouts, retries and parallelism of uploads
+        if os.environ.get("SFTP_TIMEOUT"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["timeout"] = int(os.environ.get("SFTP_TIMEOUT"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("SFTP_RETRIES"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["retries"] = int(os.environ.get("SFTP_RETRIES"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("SFTP_MAX_CONCURRENT_UPLOADS"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["max_concurrent_uploads"] = int(os.environ.get("SFTP_MAX_CONCURRENT_UPLOADS"))
+            except ValueError:
+                pass
+        
+        # Transfer tuning for large files and high-latency links
+        if os.environ.get("SFTP_WINDOW_SIZE"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["window_size"] = int(os.environ.get("SFTP_WINDOW_SIZE"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("SFTP_MAX_PACKET_SIZE"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["max_packet_size"] = int(os.environ.get("SFTP_MAX_PACKET_SIZE"))
+            except ValueError:
+                pass
+        
+        if os.environ.get("SFTP_REQUEST_SIZE"):
+            if "sftp" not in self.config:
+                self.config["sftp"] = {}
+            try:
+                self.config["sftp"]["request_size"] = int(os.environ.get("SFTP_REQUEST_SIZE"))
+            except ValueError:
+                pass
+        
         # Password (only set in memory, not saved to file)
         if os.environ.get("SFTP_PASSWORD"):
             if "sftp" not in self.config:
@@ -279,6 +449,8 @@ class ConfigManager:
         key = f"{self.config['sftp']['username']}@{self.config['sftp']['hostname']}"
         
         try:
+            # Imported on demand, keyring and its backends are slow to import
+            import keyring
             return keyring.get_password(KEYRING_SERVICE, key)
         except Exception as e:
             logger.error(f"Failed to get SFTP password from keyring: {e}")
@@ -302,6 +474,7 @@ class ConfigManager:
         key = f"{self.config['sftp']['username']}@{self.config['sftp']['hostname']}"
         
         try:
+            import keyring
             keyring.set_password(KEYRING_SERVICE, key, password)
             logger.info(f"Saved SFTP password for {key}")
             return True
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+macOS Calendar Exporter Daemon Module.
+
+This module runs exports in a long-lived process on the schedule from the
+'schedule' config section, instead of starting a new process per export from
+cron or launchd. The exporter stays warm between runs: the EventKit helper
+process, the render cache and the SFTP connections are reused.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from mac_calendar_exporter.main import MacCalendarExporter
+
+logger = logging.getLogger(__name__)
+
+# Longest single sleep, so the schedule follows wall-clock changes and system sleep
+MAX_WAIT_SECONDS = 60
+
+
+def parse_schedule_time(value: str) -> Tuple[int, int]:
+    """
+    Parse a schedule time in 24h "HH:MM" format.
+
+    Args:
+        value: Time string, e.g. "04:00"
+
+    Returns:
+        Tuple[int, int]: Hour and minute
+
+    Raises:
+        ValueError: If the string is not a valid time
+    """
+    try:
+        hour, minute = value.split(":")
+        hour = int(hour)
+        minute = int(minute)
+    except ValueError:
+        raise ValueError(f"Invalid schedule time: {value}")
+    if hour < 0 or hour > 23 or minute < 0 or minute > 59:
+        raise ValueError(f"Invalid schedule time: {value}")
+    return hour, minute
+
+
+def next_run_time(now: datetime, interval: str = "daily", at: str = "04:00") -> datetime:
+    """
+    Compute the next scheduled run after a point in time.
+
+    Daily schedules run at the configured time. Hourly schedules run every hour at
+    the minute of the configured time.
+
+    Args:
+        now: Current local time
+        interval: "daily" or "hourly"
+        at: Time of day in "HH:MM" format
+
+    Returns:
+        datetime: Next run time, strictly after now
+
+    Raises:
+        ValueError: If the interval or time is invalid
+    """
+    hour, minute = parse_schedule_time(at)
+    now = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+    if interval == "hourly":
+        candidate = now.replace(minute=minute)
+        if candidate < now:
+            candidate += timedelta(hours=1)
+        return candidate
+
+    if interval == "daily":
+        candidate = now.replace(hour=hour, minute=minute)
+        if candidate < now:
+            candidate += timedelta(days=1)
+        return candidate
+
+    raise ValueError(f"Unsupported schedule interval: {interval}")
+
+
+class ExportDaemon:
+    """Run exports on a schedule until stopped."""
+
+    def __init__(
+        self,
+        exporter: MacCalendarExporter,
+        interval: str = "daily",
+        at: str = "04:00",
+        run_on_start: bool = True,
+    ):
+        """
+        Initialize the ExportDaemon.
+
+        Args:
+            exporter: Exporter kept alive and reused for every run
+            interval: "daily" or "hourly"
+            at: Time of day in "HH:MM" format (only the minute is used for hourly runs)
+            run_on_start: Run an export immediately instead of waiting for the first slot
+
+        Raises:
+            ValueError: If the interval or time is invalid
+        """
+        # Validate the schedule up front rather than on the first wait
+        next_run_time(datetime.now(), interval, at)
+
+        self.exporter = exporter
+        self.interval = interval
+        self.at = at
+        self.run_on_start = run_on_start
+        self.runs = 0
+        self.failures = 0
+        self._stopped = threading.Event()
+
+    def run_forever(self) -> None:
+        """Run exports on schedule until stop() is called, then close the exporter."""
+        logger.info(f"Export daemon started ({self.interval} at {self.at})")
+        try:
+            if self.run_on_start:
+                self.run_once()
+
+            while not self._stopped.is_set():
+                next_run = next_run_time(datetime.now(), self.interval, self.at)
+                logger.info(f"Next export at {next_run:%Y-%m-%d %H:%M}")
+                if not self._wait_until(next_run):
+                    break
+                self.run_once()
+        finally:
+            self.exporter.close()
+            logger.info(f"Export daemon stopped after {self.runs} run(s), {self.failures} failed")
+
+    def run_once(self) -> bool:
+        """
+        Run one export and upload, logging instead of raising on failure.
+
+        Returns:
+            bool: True if the run succeeded
+        """
+        self.runs += 1
+        try:
+            success = bool(self.exporter.run())
+        except Exception as e:
+            logger.error(f"Scheduled export failed: {e}", exc_info=True)
+            success = False
+        if not success:
+            self.failures += 1
+        return success
+
+    def stop(self) -> None:
+        """Ask the daemon to stop. A run in progress is finished first."""
+        logger.info("Stopping export daemon")
+        self._stopped.set()
+
+    def _wait_until(self, when: datetime) -> bool:
+        """
+        Sleep until a local time, waking early if the daemon is stopped.
+
+        Args:
+            when: Local time to wait for
+
+        Returns:
+            bool: True if the time was reached, False if the daemon was stopped
+        """
+        while True:
+            remaining = (when - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            if self._stopped.wait(min(remaining, MAX_WAIT_SECONDS)):
+                return False
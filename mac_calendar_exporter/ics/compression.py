@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compressed ICS Output Module.
+
+This module writes compressed copies of the ICS document ("sidecars") next to
+the plain file, so consumers that support compressed fetches can download a
+fraction of the bytes. Gzip is always available; zstd is used if the optional
+zstandard package is installed.
+"""
+
+import gzip
+import importlib.util
+import logging
+from typing import BinaryIO, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# File suffix of each supported compression
+SIDECAR_SUFFIXES: Dict[str, str] = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# Compression levels, chosen for a good ratio at streaming speed
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def available_compressions(compressions: Iterable[str]) -> List[str]:
+    """
+    Filter requested compressions down to the supported and installed ones.
+
+    Args:
+        compressions: Compression names, e.g. ["gzip", "zstd"]
+
+    Returns:
+        List[str]: Usable compression names, in the requested order without duplicates
+    """
+    result = []
+    for compression in compressions:
+        compression = compression.strip().lower()
+        if not compression or compression in result:
+            continue
+        if compression not in SIDECAR_SUFFIXES:
+            logger.warning(f"Unknown ICS compression '{compression}', ignoring it")
+        # Checked without importing zstandard, which is only needed once a sidecar is written
+        elif compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+            logger.warning("zstd compression requested but the zstandard package is not installed, skipping it")
+        else:
+            result.append(compression)
+    return result
+
+
+def sidecar_path(path: str, compression: str) -> str:
+    """
+    Get the path of a compressed sidecar.
+
+    Args:
+        path: Path of the plain file
+        compression: Compression name
+
+    Returns:
+        str: Path of the sidecar, e.g. "calendar.ics.gz"
+    """
+    return f"{path}{SIDECAR_SUFFIXES[compression]}"
+
+
+class CompressedWriter:
+    """Binary stream that compresses everything written to it into a file object."""
+
+    def __init__(self, raw: BinaryIO, compression: str):
+        """
+        Initialize the CompressedWriter.
+
+        Args:
+            raw: Binary file object receiving the compressed bytes; not closed by close()
+            compression: Compression name from SIDECAR_SUFFIXES
+        """
+        if compression == "gzip":
+            # Fixed mtime and no file name, so unchanged content gives identical bytes
+            self._stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0)
+        elif compression == "zstd":
+            # Imported on demand, so commands that never compress do not pay for it
+            import zstandard
+            self._stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+        else:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+    def write(self, data: bytes) -> int:
+        return self._stream.write(data)
+
+    def close(self) -> None:
+        """Finish the compressed stream."""
+        self._stream.close()
+
+
+class TeeWriter:
+    """Binary stream that writes the same bytes to several streams."""
+
+    def __init__(self, streams: List[BinaryIO]):
+        """
+        Initialize the TeeWriter.
+
+        Args:
+            streams: Streams receiving every write
+        """
+        self._streams = streams
+
+    def write(self, data: bytes) -> int:
+        for stream in self._streams:
+            stream.write(data)
+        return len(data)
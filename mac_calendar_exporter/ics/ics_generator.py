@@ -3,191 +3,438 @@
 ICS Generator Module.
 
 This module generates ICS files from calendar events using the icalendar package.
+Events are serialized one at a time and streamed to the output file, so the
+writer never builds a Calendar tree of the whole document. Compressed copies of
+the file can be written in the same pass.
 """
 
 import logging
 import os
 import tempfile
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Union
 
-from icalendar import Calendar, Event, vCalAddress, vText
+from icalendar import Calendar, Event, vCalAddress, vRecur, vText
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent, parse_event_date
+from mac_calendar_exporter.ics.compression import CompressedWriter, TeeWriter, available_compressions, sidecar_path
+from mac_calendar_exporter.ics.recurrence import collapse_series, is_occurrence
+from mac_calendar_exporter.ics.render_cache import VEventCache
 
 logger = logging.getLogger(__name__)
 
+# Closing line of the VCALENDAR component
+CALENDAR_END = b'END:VCALENDAR\r\n'
+
 
 class ICSGenerator:
     """Generate ICS files from calendar events."""
 
     def __init__(self):
         """Initialize the ICSGenerator class."""
-        pass
+        # Number of events written by the last generate_ics() call
+        self.last_event_count = 0
 
     def generate_ics(
         self, 
-        events: List[Dict], 
+        events: Iterable[Union[CalendarEvent, Dict]], 
         calendar_name: str = "Exported Calendar",
         output_file: Optional[str] = None,
         include_details: bool = False,
-        title_length_limit: int = 36  # Default to 50 characters
+        title_length_limit: int = 36,  # Default to 50 characters
+        render_cache: Optional[VEventCache] = None,
+        compressions: Iterable[str] = (),
+        collapse_recurring: bool = False,
+        keep_existing: Optional[Callable[[], bool]] = None
     ) -> str:
         """
         Generate an ICS file from the provided events.
         
         Args:
-            events: List of event dictionaries from MacOSCalendarAccess
+            events: CalendarEvent objects (or event dictionaries) from EventKitCalendarAccess.
+                    May be any iterable, including a generator; it is consumed once.
             calendar_name: Name to use for the calendar in the ICS file
             output_file: Path to save the ICS file (if None, uses temp file)
+            include_details: Whether to include description and location details
+            title_length_limit: Maximum length for event titles (0 for unlimited)
+            render_cache: Optional cache of serialized VEVENTs. Only events missing
+                          from it are rendered; it is saved after writing.
+            compressions: Compressions ("gzip", "zstd") of sidecar files written
+                          next to the ICS file in the same pass, e.g. calendar.ics.gz
+            collapse_recurring: Write the occurrences of each recurring event as one
+                                event with an RRULE instead of one event per occurrence
+            keep_existing: Called once all events are written. If it returns True,
+                           the new files are discarded and the existing ones kept,
+                           e.g. because they were generated from the same events.
             
         Returns:
             str: Path to the generated ICS file
         """
-        logger.info(f"Generating ICS file with {len(events)} events")
+        # Determine output file
+        if output_file is None:
+            fd, output_file = tempfile.mkstemp(suffix='.ics')
+            os.close(fd)
         
-        # Create calendar
-        cal = Calendar()
-        cal.add('prodid', '-//macOS Calendar Exporter//mac-calendar-exporter//EN')
-        cal.add('version', '2.0')
-        cal.add('calscale', 'GREGORIAN')
-        cal.add('method', 'PUBLISH')
-        cal.add('x-wr-calname', calendar_name)
-        # Add timezone information for Europe/Berlin (CEST/CET)
-        cal.add('x-wr-timezone', 'Europe/Berlin')
+        # Sidecars first, so the plain file is replaced last
+        sidecar_compressions = available_compressions(compressions)
+        paths = [sidecar_path(output_file, c) for c in sidecar_compressions] + [output_file]
+        
+        # Write to temporary files first so a failure halfway through never
+        # leaves a truncated calendar in place of the previous one
+        temp_files = [f"{path}.tmp" for path in paths]
+        try:
+            with ExitStack() as stack:
+                streams = []
+                for temp_file, compression in zip(temp_files, sidecar_compressions + [None]):
+                    f = stack.enter_context(open(temp_file, 'wb'))
+                    if compression:
+                        f = CompressedWriter(f, compression)
+                        # Runs before the file is closed
+                        stack.callback(f.close)
+                    streams.append(f)
+                
+                count = self.write_ics(
+                    streams[0] if len(streams) == 1 else TeeWriter(streams),
+                    events, calendar_name, include_details, title_length_limit, render_cache,
+                    collapse_recurring
+                )
+                self.last_event_count = count
+            kept = keep_existing is not None and keep_existing()
+            for temp_file, path in zip(temp_files, paths):
+                if kept:
+                    os.remove(temp_file)
+                else:
+                    os.replace(temp_file, path)
+        except BaseException:
+            for temp_file in temp_files:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            raise
+        
+        if render_cache is not None:
+            logger.info(f"Rendered {render_cache.misses} events, reused {render_cache.hits} cached events")
+            render_cache.save()
+        
+        if kept:
+            logger.info(f"ICS file {output_file} is up to date, keeping it")
+            return output_file
+        
+        logger.info(f"ICS file with {count} events generated at {output_file}")
+        for path in paths[:-1]:
+            logger.info(f"Compressed sidecar {path}: {os.path.getsize(path)} bytes "
+                        f"({os.path.getsize(path) / max(os.path.getsize(output_file), 1):.1%} of the ICS file)")
+        return output_file
+
+    def write_ics(
+        self,
+        stream: BinaryIO,
+        events: Iterable[Union[CalendarEvent, Dict]],
+        calendar_name: str = "Exported Calendar",
+        include_details: bool = False,
+        title_length_limit: int = 36,
+        render_cache: Optional[VEventCache] = None,
+        collapse_recurring: bool = False
+    ) -> int:
+        """
+        Serialize events as an ICS document to a binary stream.
+        
+        The VCALENDAR header and VTIMEZONE are written first, then each VEVENT as
+        its event arrives from the iterable. The output is byte-identical to
+        adding every event to one Calendar and calling to_ical(), without ever
+        holding the whole document in memory.
+        
+        With collapse_recurring, occurrences of recurring events are held back
+        and written after all other events, each series as one master VEVENT
+        with RRULE and EXDATE plus a VEVENT with RECURRENCE-ID per moved or
+        edited occurrence. Series that cannot be collapsed exactly are written
+        as individual occurrences. Collapsed series bypass the render cache.
+        
+        Args:
+            stream: Binary file-like object to write to
+            events: CalendarEvent objects (or event dictionaries)
+            calendar_name: Name to use for the calendar in the ICS file
+            include_details: Whether to include description and location details
+            title_length_limit: Maximum length for event titles (0 for unlimited)
+            render_cache: Optional cache of serialized VEVENTs to reuse and fill
+            collapse_recurring: Write each recurring series as one event with an RRULE
+            
+        Returns:
+            int: Number of events written, counting each occurrence of a collapsed series
+        """
+        stream.write(self._calendar_header(calendar_name))
         
         # Add a VTIMEZONE component for Europe/Berlin
-        tz = self._create_timezone_component()
-        cal.add_component(tz)
+        stream.write(self._create_timezone_component().to_ical())
         
-        # Add events to calendar
+        count = 0
+        series: Dict[str, List[CalendarEvent]] = {}
         for event_data in events:
+            if collapse_recurring:
+                occurrence = self._as_occurrence(event_data)
+                if occurrence is not None:
+                    series.setdefault(occurrence.event_id, []).append(occurrence)
+                    continue
+            if self._write_event(stream, event_data, include_details, title_length_limit, render_cache):
+                count += 1
+        
+        collapsed = 0
+        for occurrences in series.values():
+            written = self._write_series(stream, occurrences, include_details, title_length_limit)
+            if written:
+                count += written
+                collapsed += 1
+            else:
+                for occurrence in occurrences:
+                    if self._write_event(stream, occurrence, include_details, title_length_limit, render_cache):
+                        count += 1
+        if series:
+            logger.info(f"Collapsed {collapsed} of {len(series)} recurring events into RRULE series")
+        
+        stream.write(CALENDAR_END)
+        return count
+
+    def _write_event(
+        self,
+        stream: BinaryIO,
+        event_data: Union[CalendarEvent, Dict],
+        include_details: bool,
+        title_length_limit: int,
+        render_cache: Optional[VEventCache]
+    ) -> bool:
+        """
+        Serialize one event as a VEVENT to a binary stream.
+        
+        Args:
+            stream: Binary file-like object to write to
+            event_data: CalendarEvent, or an event dictionary from the EventKit helper
+            include_details: Whether to include description and location details
+            title_length_limit: Maximum length for event titles (0 for unlimited)
+            render_cache: Optional cache of serialized VEVENTs to reuse and fill
+            
+        Returns:
+            bool: True if the event was written, False if it could not be created
+        """
+        if render_cache is not None:
+            data = self._render_cached(event_data, include_details, title_length_limit, render_cache)
+        else:
             event = self._create_event_from_dict(event_data, include_details, title_length_limit)
-            if event:
-                cal.add_component(event)
+            data = event.to_ical() if event else None
+        if data:
+            stream.write(data)
+            return True
+        return False
+
+    def _write_series(
+        self,
+        stream: BinaryIO,
+        occurrences: List[CalendarEvent],
+        include_details: bool,
+        title_length_limit: int
+    ) -> int:
+        """
+        Serialize the occurrences of a recurring event as one RRULE series.
         
-        # Determine output file
-        if output_file is None:
-            fd, output_file = tempfile.mkstemp(suffix='.ics')
-            os.close(fd)
+        Args:
+            stream: Binary file-like object to write to
+            occurrences: Occurrences sharing an event_id
+            include_details: Whether to include description and location details
+            title_length_limit: Maximum length for event titles (0 for unlimited)
+            
+        Returns:
+            int: Number of occurrences written, 0 if the series could not be
+            collapsed and nothing was written
+        """
+        series = collapse_series(occurrences)
+        if series is None:
+            return 0
         
-        # Write calendar to file
-        with open(output_file, 'wb') as f:
-            f.write(cal.to_ical())
+        master = self._create_event_from_dict(series.master, include_details, title_length_limit,
+                                              uid=series.master.event_id)
+        if not master:
+            return 0
+        master.add('rrule', vRecur.from_ical(series.rrule))
+        if series.exdates:
+            # Dates need an explicit value type, unlike datetimes
+            parameters = {} if isinstance(series.exdates[0], datetime) else {'VALUE': 'DATE'}
+            master.add('exdate', series.exdates, parameters=parameters)
         
-        # Post-process the file to ensure titles are correctly truncated
-        if title_length_limit > 0:
-            self._post_process_ics_file(output_file, title_length_limit)
+        components = [master]
+        for occurrence in series.overrides:
+            override = self._create_event_from_dict(occurrence, include_details, title_length_limit,
+                                                    uid=series.master.event_id)
+            if not override:
+                return 0
+            override.add('recurrence-id', occurrence.occurrence_start)
+            components.append(override)
         
-        logger.info(f"ICS file generated at {output_file}")
-        return output_file
-    
-    def _post_process_ics_file(self, file_path: str, title_length_limit: int) -> None:
+        for component in components:
+            stream.write(component.to_ical())
+        logger.debug(f"Collapsed {series.occurrence_count} occurrences of {series.master.title} "
+                     f"into one series with {len(series.exdates)} exceptions and {len(series.overrides)} overrides")
+        return series.occurrence_count
+
+    @staticmethod
+    def _as_occurrence(event_data: Union[CalendarEvent, Dict]) -> Optional[CalendarEvent]:
         """
-        Post-process the ICS file to ensure titles are correctly truncated.
+        Return an event as a CalendarEvent if it is an occurrence of a recurring series.
         
         Args:
-            file_path: Path to the ICS file
-            title_length_limit: Maximum length for event titles
+            event_data: CalendarEvent, or an event dictionary from the EventKit helper
+            
+        Returns:
+            Optional[CalendarEvent]: The occurrence, or None for other events and
+            dictionaries that cannot be parsed (these take the regular path)
         """
-        try:
-            # Read the file with explicit UTF-8 encoding
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+        if not isinstance(event_data, CalendarEvent):
+            if not event_data.get('occurrence_date'):
+                return None
+            try:
+                event_data = CalendarEvent.from_dict(event_data)
+            except (KeyError, ValueError):
+                return None
+        return event_data if is_occurrence(event_data) else None
+
+    def _render_cached(
+        self,
+        event_data: Union[CalendarEvent, Dict],
+        include_details: bool,
+        title_length_limit: int,
+        render_cache: VEventCache
+    ) -> Optional[bytes]:
+        """
+        Serialize an event as a VEVENT, reusing a cached rendering if available.
+        
+        Args:
+            event_data: CalendarEvent, or an event dictionary from the EventKit helper
+            include_details: Whether to include description and location details
+            title_length_limit: Maximum length for event titles (0 for unlimited)
+            render_cache: Cache of serialized VEVENTs
             
-            # Process lines
-            for i, line in enumerate(lines):
-                if line.startswith('SUMMARY:'):
-                    title = line[len('SUMMARY:'):].strip()
-                    if len(title) > title_length_limit:
-                        # Use three periods for ellipsis to ensure compatibility
-                        truncated = title[:title_length_limit] + '...'
-                        lines[i] = f'SUMMARY:{truncated}\n'
-                        logger.debug(f"Post-processing truncated: '{title}' → '{truncated}'")
+        Returns:
+            Optional[bytes]: Serialized VEVENT, or None if the event could not be created
+        """
+        if not isinstance(event_data, CalendarEvent):
+            try:
+                event_data = CalendarEvent.from_dict(event_data)
+            except (KeyError, ValueError) as e:
+                logger.error(f"Failed to parse event {event_data.get('title', 'unknown')}: {e}")
+                return None
+        
+        key = render_cache.render_key(event_data, include_details, title_length_limit)
+        data = render_cache.get(key)
+        if data is None:
+            event = self._create_event_from_dict(event_data, include_details, title_length_limit)
+            if not event:
+                return None
+            data = event.to_ical()
+            render_cache.put(key, data)
+        return data
+
+    def _calendar_header(self, calendar_name: str) -> bytes:
+        """
+        Serialize the VCALENDAR properties that precede its subcomponents.
+        
+        Args:
+            calendar_name: Name to use for the calendar in the ICS file
             
-            # Write back to file with explicit UTF-8 encoding
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-                
-            logger.info(f"Post-processed {file_path} to ensure title lengths are limited to {title_length_limit} characters")
-        except Exception as e:
-            logger.error(f"Error post-processing ICS file: {e}")
+        Returns:
+            bytes: BEGIN:VCALENDAR and calendar property lines
+        """
+        # Create calendar
+        cal = Calendar()
+        cal.add('prodid', '-//macOS Calendar Exporter//mac-calendar-exporter//EN')
+        cal.add('version', '2.0')
+        cal.add('calscale', 'GREGORIAN')
+        cal.add('method', 'PUBLISH')
+        cal.add('x-wr-calname', calendar_name)
+        # Add timezone information for Europe/Berlin (CEST/CET)
+        cal.add('x-wr-timezone', 'Europe/Berlin')
+        
+        # Without subcomponents, the serialized calendar is the header followed by its END line
+        return cal.to_ical()[:-len(CALENDAR_END)]
 
-    def _create_event_from_dict(self, event_data: Dict, include_details: bool = False, title_length_limit: int = 0) -> Optional[Event]:
+    def _create_event_from_dict(
+        self,
+        event_data: Union[CalendarEvent, Dict],
+        include_details: bool = False,
+        title_length_limit: int = 0,
+        uid: Optional[str] = None
+    ) -> Optional[Event]:
         """
-        Create an iCalendar Event from an event dictionary.
+        Create an iCalendar Event from a calendar event.
         
         Args:
-            event_data: Dictionary with event data from MacOSCalendarAccess
+            event_data: CalendarEvent, or an event dictionary from the EventKit helper
             include_details: Whether to include description and location details
             title_length_limit: Maximum length for event titles (0 for unlimited)
+            uid: UID to use instead of one unique to the occurrence, e.g. for the
+                 events of a collapsed recurring series
             
         Returns:
             Optional[Event]: iCalendar Event object or None if creation fails
         """
         try:
+            if not isinstance(event_data, CalendarEvent):
+                try:
+                    event_data = CalendarEvent.from_dict(event_data)
+                except ValueError as e:
+                    logger.error(f"Failed to parse dates for event {event_data.get('title', 'unknown')}: {e}")
+                    return None
+            
             event = Event()
             
             # Basic event properties
-            title = event_data['title']
-            original_title = title
+            title = event_data.title
             
             # Apply title length limit if specified
             if title_length_limit > 0 and len(title) > title_length_limit:
-                truncated_title = title[:title_length_limit] + '…'  # Using proper ellipsis character
-                logger.info(f"Truncated title: '{original_title}' → '{truncated_title}'")
-                
-                # Replace the title in the event_data to ensure consistency
-                event_data['title'] = truncated_title
+                # Use three periods for ellipsis to ensure compatibility
+                truncated_title = title[:title_length_limit] + '...'
+                logger.debug(f"Truncated title: '{title}' → '{truncated_title}'")
                 
                 # Use the truncated title directly
                 event.add('summary', truncated_title)
             else:
                 event.add('summary', title)
             
-            # Generate unique UID for each event occurrence
-            # This solves the issue with recurring events having the same UID
-            original_uid = event_data['event_id']
-            
-            # Create a unique UID by combining the original event ID with start date/time
-            # This ensures each occurrence of a recurring event gets a unique UID
-            start_date_str = event_data['start_date'].replace(' ', 'T').replace(':', '')
-            unique_uid = f"{original_uid}-{start_date_str}"
-            
-            event.add('uid', unique_uid)
-            logger.debug(f"Generated unique UID: {unique_uid} for event: {title}")
-            
-            # Handle start and end dates
-            try:
-                # MacOS Calendar returns dates in a format like: 
-                # "date Saturday, November 13, 2021 at 9:00:00 AM"
-                # We need to parse this format
-                start_date = self._parse_macos_date(event_data['start_date'])
-                end_date = self._parse_macos_date(event_data['end_date'])
+            if uid is not None:
+                event.add('uid', uid)
+            else:
+                # Generate unique UID for each event occurrence
+                # This solves the issue with recurring events having the same UID
+                original_uid = event_data.event_id
                 
-                if event_data.get('all_day', False):
-                    event.add('dtstart', start_date.date())
-                    event.add('dtend', end_date.date())
+                # Create a unique UID by combining the original event ID with start date/time
+                # This ensures each occurrence of a recurring event gets a unique UID
+                if isinstance(event_data.start, datetime):
+                    start_date_str = event_data.start.strftime('%Y-%m-%dT%H%M%S')
                 else:
-                    event.add('dtstart', start_date)
-                    event.add('dtend', end_date)
-            except Exception as e:
-                logger.error(f"Failed to parse dates for event {event_data['title']}: {e}")
-                return None
+                    start_date_str = event_data.start.strftime('%Y-%m-%dT000000')
+                unique_uid = f"{original_uid}-{start_date_str}"
+                
+                event.add('uid', unique_uid)
+                logger.debug(f"Generated unique UID: {unique_uid} for event: {title}")
+            
+            # Dates are already native date (all-day) or datetime values
+            event.add('dtstart', event_data.start)
+            event.add('dtend', event_data.end)
             
             # Optional event properties - only include if requested
             if include_details:
-                if event_data.get('description'):
-                    event.add('description', event_data['description'])
+                if event_data.description:
+                    event.add('description', event_data.description)
                     
-                if event_data.get('location'):
-                    event.add('location', event_data['location'])
+                if event_data.location:
+                    event.add('location', event_data.location)
             
             # Add calendar name as category
-            if event_data.get('calendar_name'):
-                event.add('categories', event_data['calendar_name'])
+            if event_data.calendar_name:
+                event.add('categories', event_data.calendar_name)
             
             return event
         except Exception as e:
-            logger.error(f"Failed to create event {event_data.get('title', 'unknown')}: {e}")
+            logger.error(f"Failed to create event {getattr(event_data, 'title', 'unknown')}: {e}")
             return None
     
     def _parse_macos_date(self, date_string: str) -> datetime:
@@ -199,35 +446,8 @@ class ICSGenerator:
             
         Returns:
             datetime: Parsed datetime object
-            
-        Example input: "date Saturday, November 13, 2021 at 9:00:00 AM"
         """
-        # Remove the "date " prefix if present
-        if date_string.startswith("date "):
-            date_string = date_string[5:]
-            
-        # Try multiple date formats that might be returned by AppleScript
-        formats = [
-            "%A, %B %d, %Y at %I:%M:%S %p",  # Saturday, November 13, 2021 at 9:00:00 AM
-            "%Y-%m-%d %H:%M:%S %z",          # 2021-11-13 09:00:00 +0100
-            "%Y-%m-%dT%H:%M:%S%z",           # 2021-11-13T09:00:00+0100
-            "%Y-%m-%d %H:%M:%S",             # 2021-11-13 09:00:00
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_string, fmt)
-            except ValueError:
-                continue
-        
-        # If none of the formats match, try a more flexible approach
-        # This handles formats like "Saturday, November 13, 2021 at 9:00:00 AM"
-        try:
-            import dateutil.parser
-            return dateutil.parser.parse(date_string)
-        except:
-            logger.error(f"Failed to parse date: {date_string}")
-            raise ValueError(f"Cannot parse date format: {date_string}")
+        return parse_event_date(date_string)
             
     def _create_timezone_component(self):
         """
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Recurring Event Collapse Module.
+
+EventKit returns every occurrence of a recurring event separately. This module
+turns the occurrences of one series back into a single master event with an
+RRULE bounded to the exported date range, EXDATEs for deleted occurrences and
+overrides for occurrences that were moved or edited. The rule is expanded and
+checked against the occurrences EventKit returned, so a series is only collapsed
+if the result describes exactly the same occurrences.
+"""
+
+import logging
+from datetime import date, datetime, time
+from typing import List, Optional, Union
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# RRULE parts that end a series; the collapsed series ends with the exported range instead
+END_PARTS = ("UNTIL", "COUNT")
+
+# Fields an occurrence must share with the master event to be described by the rule alone
+INSTANCE_FIELDS = ("calendar_name", "title", "all_day", "location", "description", "url")
+
+
+class CollapsedSeries:
+    """A recurring series as one master event, its excluded dates and its overrides."""
+
+    def __init__(
+        self,
+        master: CalendarEvent,
+        rrule: str,
+        exdates: List[Union[datetime, date]],
+        overrides: List[CalendarEvent],
+        occurrence_count: int
+    ):
+        """
+        Initialize the CollapsedSeries.
+
+        Args:
+            master: Event describing every regular occurrence, starting at the first one
+            rrule: RRULE value including an UNTIL at the last occurrence
+            exdates: Starts of occurrences the rule produces that were deleted
+            overrides: Occurrences that differ from the master, identified by occurrence_start
+            occurrence_count: Number of occurrences the series stands for
+        """
+        self.master = master
+        self.rrule = rrule
+        self.exdates = exdates
+        self.overrides = overrides
+        self.occurrence_count = occurrence_count
+
+
+def is_occurrence(event: CalendarEvent) -> bool:
+    """
+    Check whether an event is an occurrence of a recurring series.
+
+    Args:
+        event: Event from the EventKit helper
+
+    Returns:
+        bool: True if the event carries the original start of its occurrence
+    """
+    return event.occurrence_start is not None
+
+
+def collapse_series(occurrences: List[CalendarEvent]) -> Optional[CollapsedSeries]:
+    """
+    Collapse the occurrences of one recurring series.
+
+    Args:
+        occurrences: Occurrences sharing an event_id, in any order
+
+    Returns:
+        Optional[CollapsedSeries]: The collapsed series, or None if the occurrences
+        must be written individually (too few, no usable rule, or a rule that does
+        not reproduce them)
+    """
+    if len(occurrences) < 2:
+        return None
+
+    rules = {event.recurrence_rule for event in occurrences if event.recurrence_rule}
+    regular = [event for event in occurrences if not event.detached]
+    if len(rules) != 1 or not regular:
+        return None
+    # Dates and datetimes cannot be mixed in one series
+    if len({event.all_day for event in occurrences}) != 1:
+        return None
+    rule = _without_end(rules.pop())
+
+    occurrences = sorted(occurrences, key=lambda event: event.occurrence_start)
+    starts = [event.occurrence_start for event in occurrences]
+    if len(set(starts)) != len(starts):
+        return None
+    first, last = starts[0], starts[-1]
+
+    expected = _expand(rule, first, last)
+    if not expected or expected[0] != first or not set(starts) <= set(expected):
+        logger.debug(f"Rule {rule} does not reproduce the occurrences of {occurrences[0].event_id}, "
+                     f"writing them individually")
+        return None
+
+    template = min(regular, key=lambda event: event.occurrence_start)
+    duration = template.end - template.start
+    master = CalendarEvent(
+        event_id=template.event_id,
+        calendar_name=template.calendar_name,
+        title=template.title,
+        start=first,
+        end=first + duration,
+        all_day=template.all_day,
+        location=template.location,
+        description=template.description,
+        url=template.url,
+        recurrence_rule=rule,
+        occurrence_start=first,
+    )
+
+    overrides = [event for event in occurrences if event.detached or not _matches_master(event, master, duration)]
+    exdates = sorted(set(expected) - set(starts))
+    return CollapsedSeries(master, f"{rule};UNTIL={_format_until(last)}", exdates, overrides, len(occurrences))
+
+
+def _without_end(rule: str) -> str:
+    """Remove UNTIL and COUNT from an RRULE value."""
+    parts = [part for part in rule.split(";") if part and part.split("=", 1)[0].upper() not in END_PARTS]
+    return ";".join(parts)
+
+
+def _expand(rule: str, first: Union[datetime, date], last: Union[datetime, date]) -> Optional[list]:
+    """
+    List the occurrence starts a rule produces from first to last inclusive.
+
+    Args:
+        rule: RRULE value without an end
+        first: Start of the first occurrence (DTSTART)
+        last: Start of the last occurrence
+
+    Returns:
+        Optional[list]: Occurrence starts (dates for all-day series), or None if
+        the rule cannot be parsed
+    """
+    from dateutil.rrule import rrulestr
+
+    all_day = not isinstance(first, datetime)
+    start = datetime.combine(first, time()) if all_day else first
+    end = datetime.combine(last, time()) if all_day else last
+    try:
+        recurrence = rrulestr(rule, dtstart=start)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Cannot parse recurrence rule {rule}: {e}")
+        return None
+
+    dates = recurrence.between(start, end, inc=True)
+    return [value.date() for value in dates] if all_day else dates
+
+
+def _matches_master(event: CalendarEvent, master: CalendarEvent, duration) -> bool:
+    """Check whether an occurrence is exactly the master event moved to its occurrence start."""
+    return (event.start == event.occurrence_start and event.end - event.start == duration
+            and all(getattr(event, name) == getattr(master, name) for name in INSTANCE_FIELDS))
+
+
+def _format_until(value: Union[datetime, date]) -> str:
+    """Format an UNTIL value of the same type as DTSTART (floating local time)."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y%m%dT%H%M%S")
+    return value.strftime("%Y%m%d")
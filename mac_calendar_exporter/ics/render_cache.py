@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+VEVENT Render Cache Module.
+
+This module caches serialized VEVENT components on disk, keyed by a hash of the
+event's fields and the render options. When only a few events change between
+exports, the ICS file is assembled from cached fragments and only new or changed
+events are rendered.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import icalendar
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# Bump when the VEVENT rendering changes for the same event and options
+CACHE_VERSION = 1
+
+# Default maximum number of cached VEVENTs
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class VEventCache:
+    """Size-bounded LRU cache of serialized VEVENTs, persisted as a JSON file."""
+
+    def __init__(self, path: str, settings: Dict[str, Any], max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the VEventCache and load any entries saved with the same settings.
+
+        Args:
+            path: Path of the cache file
+            settings: Generator settings the cached VEVENTs were rendered with. If
+                      they differ from the saved ones, the cache starts empty.
+            max_entries: Maximum number of VEVENTs kept when saving
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.settings = self._versioned(settings)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._load()
+
+    @staticmethod
+    def _versioned(settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the cache format and icalendar versions to generator settings."""
+        return dict(settings, cache_version=CACHE_VERSION, icalendar=icalendar.__version__)
+
+    def matches(self, path: str, settings: Dict[str, Any]) -> bool:
+        """
+        Check whether this cache is the one for a cache file and generator settings.
+
+        Args:
+            path: Path of the cache file
+            settings: Generator settings
+
+        Returns:
+            bool: True if the cache can be reused for these settings
+        """
+        return self.path == path and self.settings == self._versioned(settings)
+
+    @staticmethod
+    def render_key(event: CalendarEvent, include_details: bool, title_length_limit: int) -> str:
+        """
+        Compute the cache key of an event rendered with the given options.
+
+        Args:
+            event: Event to render
+            include_details: Whether description and location are included
+            title_length_limit: Maximum length for event titles
+
+        Returns:
+            str: Hex-encoded SHA-256 key
+        """
+        key_data = {
+            "event": event.to_dict(),
+            "include_details": include_details,
+            "title_length_limit": title_length_limit,
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached VEVENT and mark it as recently used.
+
+        Args:
+            key: Cache key from render_key
+
+        Returns:
+            Optional[bytes]: Serialized VEVENT, or None if not cached
+        """
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data.encode("utf-8")
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store a serialized VEVENT.
+
+        Args:
+            key: Cache key from render_key
+            data: Serialized VEVENT
+        """
+        self._entries[key] = data.decode("utf-8")
+        self._entries.move_to_end(key)
+
+    def save(self) -> bool:
+        """
+        Evict the least recently used entries beyond max_entries and save the cache.
+
+        Returns:
+            bool: True if the cache was saved, False otherwise
+        """
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"settings": self.settings, "entries": self._entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            logger.debug(f"Saved {len(self._entries)} cached VEVENTs to {self.path} "
+                         f"({self.hits} hits, {self.misses} misses)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save VEVENT cache {self.path}: {e}")
+            return False
+
+    def _load(self) -> None:
+        """Load saved entries if they were rendered with the current settings."""
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable VEVENT cache {self.path}: {e}")
+            return
+
+        if cache.get("settings") != self.settings:
+            logger.info("ICS generator settings changed, discarding VEVENT cache")
+            return
+
+        self._entries = OrderedDict(cache.get("entries", {}))
@@ -8,16 +8,66 @@ which exports calendar events to ICS files and uploads them to an SFTP server.
 
 import os
 import sys
+import time
 import logging
 import argparse
+import itertools
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
 from mac_calendar_exporter.calendar.mock_calendar import MockCalendarData  # Keeping mock data for fallback
-from mac_calendar_exporter.ics.ics_generator import ICSGenerator
-from mac_calendar_exporter.sftp.sftp_uploader import SFTPUploader
+from mac_calendar_exporter.ics.compression import SIDECAR_SUFFIXES, available_compressions, sidecar_path
 from mac_calendar_exporter.config.config_manager import ConfigManager
+from mac_calendar_exporter.utils.export_state import EventFingerprint, ExportState, compute_destinations_digest
+from mac_calendar_exporter.utils.metrics import RunMetrics
+from mac_calendar_exporter.utils.run_report import RunReport
+
+
+class _FetchedEvents:
+    """Events on their way from the calendar to the ICS file, fingerprinted and counted as they pass."""
+    
+    def __init__(self, events: Iterable[CalendarEvent], fingerprint: EventFingerprint, report: RunReport):
+        """
+        Initialize the _FetchedEvents.
+        
+        Args:
+            events: Events from the calendar, e.g. a stream from iter_events
+            fingerprint: Fingerprint each event is added to
+            report: Report receiving the fetch and fingerprint times and event counts
+        """
+        self._events = events
+        self.fingerprint = fingerprint
+        self.report = report
+        # Exception raised by the calendar, to tell a failed fetch from a failed generation
+        self.error = None
+    
+    def __iter__(self) -> Iterator[CalendarEvent]:
+        events = iter(self._events)
+        fingerprint = self.fingerprint
+        per_calendar = self.report.events_per_calendar
+        fetch_time = fingerprint_time = 0.0
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    event = next(events)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    self.error = e
+                    raise
+                fetched = time.monotonic()
+                fingerprint.add(event)
+                per_calendar[event.calendar_name] = per_calendar.get(event.calendar_name, 0) + 1
+                self.report.events_fetched += 1
+                fetch_time += fetched - started
+                fingerprint_time += time.monotonic() - fetched
+                yield event
+        finally:
+            self.report.add_stage_time('fetch', fetch_time)
+            self.report.add_stage_time('fingerprint', fingerprint_time)
 
 
 class MacCalendarExporter:
@@ -42,6 +92,27 @@ class MacCalendarExporter:
             self.config.update(config)
             
         self.logger = logging.getLogger(__name__)
+        
+        # State of the last export, used to skip unchanged regenerations and uploads
+        self.export_state = None
+        self.export_unchanged = False
+        self.export_error = None
+        self.upload_results = []
+        
+        # Metrics of the current or last run, and cumulative metrics of all runs
+        self.report = None
+        self._metrics = None
+        
+        # Compressions of the sidecar files written next to the ICS file
+        self.compressions = []
+        
+        # Kept between runs of a long-lived exporter (daemon and serve modes)
+        self._calendar_accessor = None
+        self._render_cache = None
+        
+        # SFTP connections kept open between uploads and runs, created on first upload
+        self._sftp_pool = None
+        
         self.logger.info("macOS Calendar Exporter initialized")
         
     def _setup_logging(self):
@@ -57,26 +128,106 @@ class MacCalendarExporter:
         """
         Get the calendar accessor using EventKit.
         
+        The accessor is created once and reused by later exports. With the
+        'persistent_helper' option, it keeps one helper process running between
+        exports until close() is called.
+        
         Returns:
             An EventKitCalendarAccess instance
         """
+        if self._calendar_accessor is not None:
+            return self._calendar_accessor
+        
         self.logger.info("Using Swift EventKit for calendar access")
         try:
-            return EventKitCalendarAccess()
+            self._calendar_accessor = EventKitCalendarAccess(
+                persistent=self.config.get('persistent_helper', False),
+                max_concurrency=self.config.get('fetch_concurrency', 1)
+            )
+            return self._calendar_accessor
         except Exception as e:
             self.logger.error(f"Failed to initialize EventKit calendar accessor: {e}")
             return None
+    
+    def _get_sftp_pool(self):
+        """
+        Get the SFTP connection pool shared by all uploads of this exporter.
+        
+        Returns:
+            SFTPConnectionPool: The connection pool
+        """
+        if self._sftp_pool is None:
+            # paramiko is slow to import, so load it only when uploading
+            from mac_calendar_exporter.sftp.connection_pool import (
+                DEFAULT_IDLE_TIMEOUT,
+                DEFAULT_KEEPALIVE_INTERVAL,
+                SFTPConnectionPool,
+            )
+            sftp_config = self.config.get('sftp', {})
+            self._sftp_pool = SFTPConnectionPool(
+                idle_timeout=sftp_config.get('pool_idle_timeout', DEFAULT_IDLE_TIMEOUT),
+                keepalive_interval=sftp_config.get('keepalive_interval', DEFAULT_KEEPALIVE_INTERVAL)
+            )
+        return self._sftp_pool
+    
+    def _get_render_cache(self, output_file: str, include_details: bool, title_length_limit: int):
+        """
+        Get the VEVENT render cache for the output file and generation settings.
+        
+        The loaded cache is kept in memory and reused by later exports with the
+        same settings, so a long-lived exporter reads the cache file only once.
+        
+        Args:
+            output_file: Path of the ICS file
+            include_details: Whether description and location are included
+            title_length_limit: Maximum length for event titles
+            
+        Returns:
+            VEventCache: The render cache
+        """
+        from mac_calendar_exporter.ics.render_cache import DEFAULT_MAX_ENTRIES, VEventCache
+        
+        path = f"{output_file}.cache"
+        settings = {
+            'include_details': include_details,
+            'title_length_limit': title_length_limit
+        }
+        max_entries = self.config.get('render_cache_max_entries', DEFAULT_MAX_ENTRIES)
+        
+        cache = self._render_cache
+        if cache is None or not cache.matches(path, settings):
+            cache = VEventCache(path, settings=settings, max_entries=max_entries)
+            self._render_cache = cache
+        cache.max_entries = max_entries
+        cache.hits = 0
+        cache.misses = 0
+        return cache
 
     def export_calendar(self):
         """
         Export calendar events to an ICS file.
         
+        Events are streamed from the helper into the ICS generator and
+        fingerprinted and counted on the way, so they are not all held in memory
+        at once. If incremental export is enabled and the events and generation
+        settings match the previous export, the newly written file is discarded,
+        the existing one kept and self.export_unchanged set. Metrics are
+        collected in a new self.report, and the reason of a failed export in
+        self.export_error.
+        
         Returns:
             str: Path to the generated ICS file, or None if export failed
         """
+        self.export_unchanged = False
+        self.export_error = None
+        report = self.report = RunReport()
+        calendar_accessor = None
+        fetched = None
         try:
             # Get calendar accessor
             calendar_accessor = self._get_calendar_accessor()
+            processes_started = calendar_accessor.processes_started if calendar_accessor else 0
+            requests_sent = calendar_accessor.requests_sent if calendar_accessor else 0
             
             # Get calendar configuration
             calendar_names = self.config.get('calendar_names', ['Calendar'])
@@ -93,8 +244,20 @@ class MacCalendarExporter:
                            f"{end_date.strftime('%Y-%m-%d')} ({days_behind} days behind, {days_ahead} days ahead) "
                            f"for calendars: {', '.join(calendar_names)}")
             
+            calendar_name = self.config.get('ics_calendar_name', 'Exported Calendar')
+            include_details = self.config.get('include_details', False)
+            title_length_limit = self.config.get('title_length_limit', 36)
+            collapse_recurring = self.config.get('collapse_recurring', False)
+            self.compressions = available_compressions(self.config.get('ics_compression', []))
+            fingerprint = EventFingerprint({
+                'calendar_name': calendar_name,
+                'include_details': include_details,
+                'title_length_limit': title_length_limit,
+                'compressions': self.compressions,
+                'collapse_recurring': collapse_recurring
+            })
+            
             # Get events
-            events = []
             if calendar_accessor is None:
                 # Use mock data
                 self.logger.info("Using mock calendar data")
@@ -104,89 +267,228 @@ class MacCalendarExporter:
                     end_date=end_date
                 )
             else:
-                # Get events from real calendar
-                events = calendar_accessor.get_events(
+                # Stream events from real calendar
+                events = calendar_accessor.iter_events(
                     calendar_names=calendar_names,
                     start_date=start_date,
                     end_date=end_date
                 )
+            fetched = _FetchedEvents(events, fingerprint, report)
+            events = iter(fetched)
+            # Fetching and fingerprinting happen while generating and are timed as their own stages
+            started = time.monotonic()
+            streamed = report.stages.get('fetch', 0.0) + report.stages.get('fingerprint', 0.0)
             
-            self.logger.info(f"Retrieved {len(events)} events")
-            
-            # Generate ICS file
-            if events:
-                ics_generator = ICSGenerator()
-                calendar_name = self.config.get('ics_calendar_name', 'Exported Calendar')
-                include_details = self.config.get('include_details', False)
-                title_length_limit = self.config.get('title_length_limit', 36)
-                ics_file = ics_generator.generate_ics(
-                    events=events,
-                    calendar_name=calendar_name,
-                    output_file=output_file,
-                    include_details=include_details,
-                    title_length_limit=title_length_limit
-                )
-                self.logger.info(f"Generated ICS file: {ics_file}")
-                return ics_file
-            else:
+            # Wait for the first event, so an empty calendar does not replace the file
+            first_event = next(events, None)
+            if first_event is None:
                 self.logger.warning("No events found, skipping ICS generation")
                 return None
+            
+            # Keep the existing file if nothing changed since the last export
+            self.export_state = ExportState(output_file)
+            
+            def is_unchanged() -> bool:
+                self.export_unchanged = (
+                    self.config.get('incremental_export', True)
+                    and self.export_state.is_current(fingerprint.hexdigest())
+                    and all(os.path.isfile(sidecar_path(output_file, c)) for c in self.compressions)
+                )
+                return self.export_unchanged
+            
+            # Reuse VEVENTs rendered by previous exports for unchanged events
+            render_cache = None
+            if self.config.get('render_cache', True):
+                render_cache = self._get_render_cache(output_file, include_details, title_length_limit)
+            
+            from mac_calendar_exporter.ics.ics_generator import ICSGenerator
+            ics_generator = ICSGenerator()
+            ics_file = ics_generator.generate_ics(
+                events=itertools.chain([first_event], events),
+                calendar_name=calendar_name,
+                output_file=output_file,
+                include_details=include_details,
+                title_length_limit=title_length_limit,
+                render_cache=render_cache,
+                compressions=self.compressions,
+                collapse_recurring=collapse_recurring,
+                keep_existing=is_unchanged
+            )
+            streamed = report.stages.get('fetch', 0.0) + report.stages.get('fingerprint', 0.0) - streamed
+            report.add_stage_time('generate', time.monotonic() - started - streamed)
+            self.logger.info(f"Retrieved {report.events_fetched} events")
+            
+            report.ics_file = ics_file
+            report.events_written = ics_generator.last_event_count
+            # Events the generator could not convert are dropped from the file
+            report.events_dropped = report.events_fetched - report.events_written
+            if render_cache is not None:
+                report.render_cache_hits = render_cache.hits
+                report.render_cache_misses = render_cache.misses
+            
+            if self.export_unchanged:
+                self.logger.info(f"Events unchanged since last export, keeping {output_file}")
+                report.export_unchanged = True
+                return ics_file
+            
+            self.export_state.record_generated(fingerprint.hexdigest())
+            report.bytes_written = os.path.getsize(ics_file) + sum(
+                os.path.getsize(sidecar_path(ics_file, c)) for c in self.compressions
+            )
+            self.logger.info(f"Generated ICS file: {ics_file}")
+            return ics_file
                 
         except Exception as e:
-            self.logger.error(f"Failed to export calendar: {e}", exc_info=True)
+            if fetched is not None and fetched.error is not None:
+                # A helper that failed must not pass for a calendar without events
+                self.export_error = f"Failed to fetch events: {fetched.error}"
+                self.logger.error(self.export_error)
+            else:
+                self.export_error = f"Failed to export calendar: {e}"
+                self.logger.error(self.export_error, exc_info=True)
+            return None
+        finally:
+            if calendar_accessor is not None:
+                report.helper_processes = calendar_accessor.processes_started - processes_started
+                report.helper_requests = calendar_accessor.requests_sent - requests_sent
+            
+    def _get_sftp_destinations(self) -> Optional[List[Dict]]:
+        """
+        Build the list of SFTP destinations from the configuration.
+        
+        The 'sftp' section describes a single destination, unless it contains a
+        'destinations' list. The list then replaces that destination, and each
+        entry of it inherits any setting it does not define from the 'sftp' section.
+        
+        Returns:
+            Optional[List[Dict]]: Destinations for FanOutUploader, or None if the
+            configuration is incomplete
+        """
+        from mac_calendar_exporter.sftp.fanout import DEFAULT_TIMEOUT
+        from mac_calendar_exporter.sftp.sftp_uploader import DEFAULT_REQUEST_SIZE
+        
+        sftp_config = self.config.get('sftp', {})
+        if not sftp_config:
+            self.logger.error("SFTP configuration not provided")
             return None
+        
+        defaults = {key: value for key, value in sftp_config.items() if key != 'destinations'}
+        entries = sftp_config.get('destinations') or [{}]
+        
+        destinations = []
+        for entry in entries:
+            settings = dict(defaults, **entry)
+            # The config uses 'host' but SFTPUploader expects 'hostname'
+            hostname = settings.get('host') or settings.get('hostname')
+            username = settings.get('username')
+            
+            if not hostname or not username:
+                self.logger.error("SFTP host and username are required")
+                return None
+                
+            # Get password or key file
+            password = settings.get('password')
+            key_file = settings.get('key_file')
+            
+            if not password and not key_file:
+                self.logger.error(f"Either SFTP password or key file is required for {hostname}")
+                return None
+            
+            destinations.append({
+                'hostname': hostname,
+                'port': settings.get('port', 22),
+                'username': username,
+                'password': password,
+                'key_file': key_file,
+                'key_passphrase': settings.get('key_passphrase'),
+                'remote_path': settings.get('remote_path', '/'),
+                'create_dirs': settings.get('create_dirs', True),
+                'atomic_upload': settings.get('atomic_upload', True),
+                'timeout': settings.get('timeout', DEFAULT_TIMEOUT),
+                'window_size': settings.get('window_size'),
+                'max_packet_size': settings.get('max_packet_size'),
+                'request_size': settings.get('request_size', DEFAULT_REQUEST_SIZE)
+            })
+        return destinations
             
+    def _get_destinations_digest(self) -> Optional[str]:
+        """
+        Get a digest of the configured SFTP destinations, to tell whether the
+        last upload went to the same places.
+        
+        Returns:
+            Optional[str]: Digest of the destinations, or None if the configuration is incomplete
+        """
+        destinations = self._get_sftp_destinations()
+        if not destinations:
+            return None
+        sftp_config = self.config.get('sftp', {})
+        return compute_destinations_digest(destinations, {
+            'upload_compressed': sftp_config.get('upload_compressed', True)
+        })
+    
     def upload_to_sftp(self, file_path: str):
         """
-        Upload a file to an SFTP server.
+        Upload a file to all configured SFTP destinations.
+        
+        The result of each destination is kept in self.upload_results and
+        counted in self.report.
         
         Args:
             file_path: Path to the file to upload
             
         Returns:
-            bool: True if upload succeeded, False otherwise
+            bool: True if the upload to every destination succeeded, False otherwise
         """
+        self.upload_results = []
+        if self.report is None:
+            self.report = RunReport()
+        report = self.report
         if not file_path or not os.path.exists(file_path):
             self.logger.error(f"File does not exist: {file_path}")
             return False
             
         try:
-            # Get SFTP configuration
-            sftp_config = self.config.get('sftp', {})
-            if not sftp_config:
-                self.logger.error("SFTP configuration not provided")
+            destinations = self._get_sftp_destinations()
+            if not destinations:
                 return False
-                
-            hostname = sftp_config.get('host')  # The config uses 'host' but SFTPUploader expects 'hostname'
-            port = sftp_config.get('port', 22)
-            username = sftp_config.get('username')
-            remote_path = sftp_config.get('remote_path', '/')
             
-            if not hostname or not username:
-                self.logger.error("SFTP host and username are required")
-                return False
-                
-            # Get password or key file
-            password = sftp_config.get('password')
-            key_file = sftp_config.get('key_file')
+            from mac_calendar_exporter.sftp.fanout import (
+                DEFAULT_MAX_CONCURRENT_UPLOADS,
+                DEFAULT_RETRIES,
+                FanOutUploader,
+            )
             
-            if not password and not key_file:
-                self.logger.error("Either SFTP password or key file is required")
-                return False
-                
-            # Upload file
-            uploader = SFTPUploader(
-                hostname=hostname,
-                port=port,
-                username=username,
-                password=password,
-                key_file=key_file
+            sftp_config = self.config.get('sftp', {})
+            pool = self._get_sftp_pool()
+            uploader = FanOutUploader(
+                pool=pool,
+                max_concurrent_uploads=sftp_config.get('max_concurrent_uploads', DEFAULT_MAX_CONCURRENT_UPLOADS),
+                retries=sftp_config.get('retries', DEFAULT_RETRIES)
             )
+            # Publish compressed sidecars next to the ICS file
+            sidecar_suffixes = []
+            if sftp_config.get('upload_compressed', True):
+                sidecar_suffixes = [SIDECAR_SUFFIXES[c] for c in self.compressions
+                                    if os.path.isfile(sidecar_path(file_path, c))]
+            
+            connections_opened = pool.connections_opened
+            connections_reused = pool.connections_reused
+            with report.stage('upload'):
+                self.upload_results = uploader.upload(file_path, destinations, sidecar_suffixes)
             
-            success = uploader.upload_file(file_path, remote_path)
+            report.sftp_connections_opened += pool.connections_opened - connections_opened
+            report.sftp_connections_reused += pool.connections_reused - connections_reused
+            report.uploads = [result.to_dict() for result in self.upload_results]
+            upload_size = os.path.getsize(file_path) + sum(
+                os.path.getsize(f"{file_path}{suffix}") for suffix in sidecar_suffixes
+            )
+            report.bytes_uploaded += upload_size * sum(
+                1 for result in self.upload_results if result.success and not result.skipped
+            )
             
-            if success:
-                self.logger.info(f"Successfully uploaded {file_path} to {hostname}:{remote_path}")
+            if all(result.success for result in self.upload_results):
+                self.logger.info(f"Successfully uploaded {file_path} to {len(destinations)} SFTP destination(s)")
                 return True
             else:
                 self.logger.error(f"Failed to upload {file_path}")
@@ -196,12 +498,15 @@ class MacCalendarExporter:
             self.logger.error(f"Failed to upload to SFTP: {e}", exc_info=True)
             return False
             
-    def run(self):
+    def run(self) -> RunReport:
         """
         Run the export and upload process.
         
+        The report is truthy if the run succeeded, so callers may treat it as a
+        bool. With the 'run_report_file' option, it is also written as JSON.
+        
         Returns:
-            bool: True if the process succeeded, False otherwise
+            RunReport: Stage durations and counters of the run
         """
         try:
             # Export calendar to ICS file
@@ -209,25 +514,98 @@ class MacCalendarExporter:
             
             if not ics_file:
                 self.logger.error("Calendar export failed")
-                return False
+                return self._finish_report(False, self.export_error or "Calendar export failed")
                 
             # Check if SFTP upload is enabled
             if self.config.get('enable_sftp', False):
+                # An unchanged export already uploaded to the same destinations needs no new upload
+                destinations_digest = self._get_destinations_digest()
+                if self.export_unchanged and self.export_state.is_uploaded(destinations_digest):
+                    self.logger.info("ICS file unchanged since last upload, skipping SFTP upload")
+                    self.report.upload_skipped = True
+                    return self._finish_report(True)
+                
                 # Upload ICS file to SFTP server
-                return self.upload_to_sftp(ics_file)
+                success = self.upload_to_sftp(ics_file)
+                if success and self.export_state is not None:
+                    self.export_state.record_uploaded(destinations_digest)
+                return self._finish_report(success, None if success else "SFTP upload failed")
             else:
                 self.logger.info("SFTP upload disabled")
-                return True
+                return self._finish_report(True)
                 
         except Exception as e:
             self.logger.error(f"Failed to run export process: {e}", exc_info=True)
-            return False
+            return self._finish_report(False, str(e))
+    
+    def _finish_report(self, success: bool, error: Optional[str] = None) -> RunReport:
+        """
+        Finish the report of the current run, log it and write it if configured.
+        
+        Args:
+            success: Whether the run succeeded
+            error: Reason the run failed
+            
+        Returns:
+            RunReport: The finished report
+        """
+        if self.report is None:
+            self.report = RunReport()
+        report = self.report.finish(success, error)
+        self.logger.info(report.summary())
+        
+        report_file = self.config.get('run_report_file')
+        if report_file:
+            report.save(os.path.expanduser(report_file))
+        
+        metrics_file = self.config.get('metrics_file')
+        if metrics_file or self._metrics is not None:
+            metrics = self.get_metrics()
+            metrics.record(report)
+            if metrics_file:
+                metrics.save()
+                metrics.write_textfile(os.path.expanduser(metrics_file),
+                                       openmetrics=self.config.get('metrics_format') == 'openmetrics')
+        return report
+    
+    def get_metrics(self) -> RunMetrics:
+        """
+        Get the cumulative metrics of this exporter's runs, created on first use.
+        
+        With the 'metrics_file' option, cumulative values are kept in
+        '<metrics_file>.state.json', so they continue across processes.
+        
+        Returns:
+            RunMetrics: The run metrics
+        """
+        if self._metrics is None:
+            metrics_file = self.config.get('metrics_file')
+            state_file = f"{os.path.expanduser(metrics_file)}.state.json" if metrics_file else None
+            self._metrics = RunMetrics(state_file)
+        return self._metrics
+    
+    def close(self):
+        """Stop the calendar helper and close pooled SFTP connections."""
+        if self._calendar_accessor is not None:
+            self._calendar_accessor.close()
+            self._calendar_accessor = None
+        if self._sftp_pool is not None:
+            self._sftp_pool.close()
+            self._sftp_pool = None
 
 
 def main():
     """Run the macOS Calendar exporter from the command line."""
     parser = argparse.ArgumentParser(description="Export calendar events to ICS and upload to SFTP")
     parser.add_argument("--config", help="Path to custom config file")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Profile the run with cProfile and write the statistics to this .pstats file")
+    parser.add_argument("--profile-top", type=int, default=25,
+                        help="Number of functions listed in the profile summary (default: 25)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Also report peak memory and allocation sites with tracemalloc (slow)")
+    parser.add_argument("--profile-sampling", action="store_true",
+                        help="Profile with the pyinstrument sampling profiler instead of cProfile, if installed")
     args = parser.parse_args()
     
     config = None
@@ -240,7 +618,17 @@ def main():
             return 1
     
     exporter = MacCalendarExporter(config=config)
-    success = exporter.run()
+    try:
+        if args.profile:
+            from mac_calendar_exporter.utils.profiling import PipelineProfiler
+            with PipelineProfiler(args.profile, top=args.profile_top, memory=args.profile_memory,
+                                  sampling=args.profile_sampling) as profiler:
+                success = exporter.run()
+            print(profiler.summary)
+        else:
+            success = exporter.run()
+    finally:
+        exporter.close()
     
     return 0 if success else 1
 
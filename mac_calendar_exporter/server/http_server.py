@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+ICS HTTP Server Module.
+
+This module serves the latest exported ICS file over HTTP. The export runs in the
+background on a fixed interval and the served bytes are held in memory, so the
+calendar is exported once per interval no matter how often clients poll. Responses
+carry strong ETag and Last-Modified headers and conditional requests are answered
+with 304 Not Modified. Clients that accept gzip get the compressed body.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from mac_calendar_exporter.ics.compression import sidecar_path
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between background exports
+DEFAULT_REFRESH_INTERVAL = 900
+
+
+class ICSSnapshot:
+    """Immutable in-memory copy of an exported ICS file and its validators."""
+
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag", "last_modified")
+
+    def __init__(self, body: bytes, gzip_body: bytes, last_modified: datetime):
+        """
+        Initialize the ICSSnapshot.
+
+        Args:
+            body: ICS document
+            gzip_body: Gzip-compressed ICS document
+            last_modified: Time the ICS content last changed (UTC)
+        """
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.body = body
+        self.gzip_body = gzip_body
+        # Each representation needs its own strong validator
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.last_modified = last_modified.replace(microsecond=0)
+
+    @classmethod
+    def from_file(cls, ics_file: str) -> "ICSSnapshot":
+        """
+        Load a snapshot of an ICS file, reusing its gzip sidecar if it is current.
+
+        Args:
+            ics_file: Path of the ICS file
+
+        Returns:
+            ICSSnapshot: Snapshot of the file
+        """
+        with open(ics_file, "rb") as f:
+            body = f.read()
+        mtime = os.path.getmtime(ics_file)
+
+        gzip_file = sidecar_path(ics_file, "gzip")
+        gzip_body = None
+        if os.path.isfile(gzip_file) and os.path.getmtime(gzip_file) >= mtime:
+            with open(gzip_file, "rb") as f:
+                gzip_body = f.read()
+        if gzip_body is None:
+            gzip_body = gzip.compress(body, mtime=0)
+
+        return cls(body, gzip_body, datetime.fromtimestamp(mtime, tz=timezone.utc))
+
+
+class ICSServer:
+    """HTTP server publishing the ICS file produced by a periodic export."""
+
+    def __init__(
+        self,
+        export: Callable[[], Optional[str]],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        path: str = "/calendar.ics",
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        """
+        Initialize the ICSServer.
+
+        Args:
+            export: Runs an export and returns the path of the ICS file, or None on failure
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            path: URL path the calendar is served at
+            refresh_interval: Seconds between background exports
+        """
+        self.export = export
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.snapshot: Optional[ICSSnapshot] = None
+        self._stopped = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+
+    def refresh(self) -> bool:
+        """
+        Run the export and swap in a new snapshot if the ICS file changed.
+
+        Returns:
+            bool: True if a current snapshot is available
+        """
+        try:
+            ics_file = self.export()
+            if not ics_file:
+                logger.error("Export failed, continuing to serve the previous calendar")
+                return self.snapshot is not None
+
+            snapshot = ICSSnapshot.from_file(ics_file)
+            if self.snapshot is not None and self.snapshot.etag == snapshot.etag:
+                # Keep the old snapshot so Last-Modified stays stable
+                logger.info("Calendar unchanged, keeping the served snapshot")
+                return True
+
+            # Replacing the reference is atomic; requests in flight keep the old snapshot
+            self.snapshot = snapshot
+            logger.info(f"Serving new calendar snapshot ({len(self.snapshot.body)} bytes, "
+                        f"{len(self.snapshot.gzip_body)} gzipped, ETag {self.snapshot.etag})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh the served calendar: {e}", exc_info=True)
+            return self.snapshot is not None
+
+    def start(self) -> "ICSServer":
+        """Run the first export and start the background refresh thread."""
+        self.refresh()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="ics-refresh", daemon=True)
+        self._refresh_thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Handle requests until shutdown() is called."""
+        logger.info(f"Serving calendar at http://{self.host}:{self.port}{self.path}")
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving requests and the background refresh."""
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _refresh_loop(self) -> None:
+        """Refresh the snapshot every refresh_interval seconds until stopped."""
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh()
+
+    def _make_handler(self):
+        """Create the request handler class bound to this server."""
+        server = self
+
+        class Handler(ICSRequestHandler):
+            ics_server = server
+
+        return Handler
+
+
+class ICSRequestHandler(BaseHTTPRequestHandler):
+    """Answer GET and HEAD requests for the calendar path."""
+
+    ics_server: ICSServer = None
+    protocol_version = "HTTP/1.1"
+    server_version = "mac-calendar-exporter"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        """Send the calendar, a 304, or an error status."""
+        if self.path.split("?", 1)[0] != self.ics_server.path:
+            self._send_status(HTTPStatus.NOT_FOUND)
+            return
+
+        snapshot = self.ics_server.snapshot
+        if snapshot is None:
+            self._send_status(HTTPStatus.SERVICE_UNAVAILABLE)
+            return
+
+        use_gzip = self._accepts_gzip()
+        etag = snapshot.gzip_etag if use_gzip else snapshot.etag
+        body = snapshot.gzip_body if use_gzip else snapshot.body
+
+        if self._not_modified(snapshot, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(snapshot, etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/calendar; charset=utf-8")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self._send_validators(snapshot, etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_validators(self, snapshot: ICSSnapshot, etag: str) -> None:
+        """Send the headers shared by 200 and 304 responses."""
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", format_datetime(snapshot.last_modified, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _send_status(self, status: HTTPStatus) -> None:
+        """Send an empty response with the given status."""
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _not_modified(self, snapshot: ICSSnapshot, etag: str) -> bool:
+        """
+        Evaluate If-None-Match, or If-Modified-Since if no entity tags were sent.
+
+        Args:
+            snapshot: Snapshot being served
+            etag: Entity tag of the selected representation
+
+        Returns:
+            bool: True if the client's copy is current
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # Weak comparison, as required for If-None-Match
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            if "*" in tags:
+                return True
+            return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return snapshot.last_modified <= since
+        return False
+
+    def _accepts_gzip(self) -> bool:
+        """Check whether the Accept-Encoding header allows gzip."""
+        for coding in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = coding.strip().partition(";")
+            if name.strip().lower() in ("gzip", "x-gzip", "*"):
+                quality = params.strip().lower()
+                return not quality.startswith("q=") or _quality(quality[2:]) > 0
+        return False
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def _quality(value: str) -> float:
+    """Parse an Accept-Encoding quality value, treating garbage as 0."""
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
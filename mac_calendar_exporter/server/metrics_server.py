@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Metrics HTTP Server Module.
+
+This module serves the run metrics of a long-lived exporter on a local HTTP
+port for Prometheus to scrape. Clients that accept OpenMetrics get the
+OpenMetrics text format, everyone else the Prometheus text format 0.0.4.
+"""
+
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from mac_calendar_exporter.utils.metrics import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE, RunMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsServer:
+    """HTTP server exposing RunMetrics at /metrics on a background thread."""
+
+    def __init__(self, metrics: RunMetrics, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics"):
+        """
+        Initialize the MetricsServer.
+
+        Args:
+            metrics: Metrics to serve
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            path: URL path the metrics are served at
+        """
+        self.metrics = metrics
+        self.path = path
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+
+    def start(self) -> "MetricsServer":
+        """Start serving requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving metrics at http://{self.host}:{self.port}{self.path}")
+        return self
+
+    def shutdown(self) -> None:
+        """Stop serving requests."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _make_handler(self):
+        """Create the request handler class bound to this server."""
+        server = self
+
+        class Handler(MetricsRequestHandler):
+            metrics_server = server
+
+        return Handler
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Answer GET and HEAD requests for the metrics path."""
+
+    metrics_server: MetricsServer = None
+    protocol_version = "HTTP/1.1"
+    server_version = "mac-calendar-exporter"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        """Send the metrics in the format the client accepts, or a 404."""
+        if self.path.split("?", 1)[0] != self.metrics_server.path:
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.metrics_server.metrics.render(openmetrics).encode("utf-8")
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
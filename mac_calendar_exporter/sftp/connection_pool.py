@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+SFTP Connection Pool Module.
+
+This module keeps authenticated SFTP connections open between uploads, keyed by
+server, credentials and transport settings, so repeated uploads to the same destination skip the SSH
+handshake. Pooled transports send keepalives, are health-checked before reuse,
+and are closed once they have been idle longer than a timeout.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+# Default seconds an unused connection is kept open
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Default seconds between SSH keepalive packets on pooled transports
+DEFAULT_KEEPALIVE_INTERVAL = 30
+
+PoolKey = Tuple[str, int, str, str, Optional[int], Optional[int]]
+Connection = Tuple[paramiko.Transport, paramiko.SFTPClient]
+
+
+def connection_key(
+    hostname: str,
+    port: int,
+    username: str,
+    password: Optional[str] = None,
+    key_file: Optional[str] = None,
+    key_passphrase: Optional[str] = None,
+    window_size: Optional[int] = None,
+    max_packet_size: Optional[int] = None,
+) -> PoolKey:
+    """
+    Build the pool key of a destination.
+
+    The credentials are hashed, so the key identifies the authentication used
+    without keeping another copy of the password in the pool. The window and
+    packet sizes are fixed when a connection is opened, so destinations tuned
+    differently never share a connection.
+
+    Args:
+        hostname: SFTP server hostname
+        port: SFTP server port
+        username: Username for authentication
+        password: Password for password authentication
+        key_file: Path to SSH private key
+        key_passphrase: Passphrase for encrypted SSH private key
+        window_size: SSH channel window size in bytes (None for paramiko's default)
+        max_packet_size: Maximum SSH packet size in bytes (None for paramiko's default)
+
+    Returns:
+        PoolKey: (hostname, port, username, auth digest, window size, max packet size)
+    """
+    auth = hashlib.sha256("\0".join([password or "", key_file or "", key_passphrase or ""]).encode("utf-8"))
+    return (hostname, port, username or "", auth.hexdigest(), window_size or None, max_packet_size or None)
+
+
+class _PooledConnection:
+    """An idle connection and the time it was returned to the pool."""
+
+    __slots__ = ("transport", "sftp", "released_at")
+
+    def __init__(self, transport: paramiko.Transport, sftp: paramiko.SFTPClient):
+        self.transport = transport
+        self.sftp = sftp
+        self.released_at = time.monotonic()
+
+
+class SFTPConnectionPool:
+    """Thread-safe pool of idle SFTP connections, keyed by destination, credentials and transport settings."""
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        keepalive_interval: int = DEFAULT_KEEPALIVE_INTERVAL,
+    ):
+        """
+        Initialize the SFTPConnectionPool.
+
+        Args:
+            idle_timeout: Seconds an unused connection is kept open
+            keepalive_interval: Seconds between SSH keepalives on pooled transports (0 disables them)
+        """
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self._idle: Dict[PoolKey, List[_PooledConnection]] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def acquire(self, key: PoolKey, connect: Callable[[], Connection]) -> Connection:
+        """
+        Get a live connection for a destination, opening a new one if none is idle.
+
+        Idle connections are checked with an SFTP round trip before they are handed
+        out; dead ones are closed and skipped.
+
+        Args:
+            key: Pool key from connection_key
+            connect: Opens and authenticates a new (transport, sftp) connection
+
+        Returns:
+            Connection: (transport, sftp) owned by the caller until released
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                pooled = idle.pop() if idle else None
+            if pooled is None:
+                break
+            if self._is_healthy(pooled.transport, pooled.sftp):
+                with self._lock:
+                    self.connections_reused += 1
+                logger.debug(f"Reusing pooled SFTP connection to {key[0]}:{key[1]}")
+                return pooled.transport, pooled.sftp
+            logger.debug(f"Discarding dead pooled SFTP connection to {key[0]}:{key[1]}")
+            self._close_connection(pooled.transport, pooled.sftp)
+
+        transport, sftp = connect()
+        if self.keepalive_interval:
+            transport.set_keepalive(self.keepalive_interval)
+        with self._lock:
+            self.connections_opened += 1
+        return transport, sftp
+
+    def release(self, key: PoolKey, transport: paramiko.Transport, sftp: paramiko.SFTPClient) -> None:
+        """
+        Return a connection to the pool, or close it if it is no longer usable.
+
+        Args:
+            key: Pool key the connection was acquired with
+            transport: Transport of the connection
+            sftp: SFTP client of the connection
+        """
+        if self._closed.is_set() or not transport.is_active():
+            self._close_connection(transport, sftp)
+            return
+
+        with self._lock:
+            self._idle.setdefault(key, []).append(_PooledConnection(transport, sftp))
+        self._start_reaper()
+
+    def close_idle(self, max_idle: Optional[float] = None) -> int:
+        """
+        Close connections that have been idle longer than max_idle seconds.
+
+        Args:
+            max_idle: Idle time limit, defaults to the pool's idle timeout
+
+        Returns:
+            int: Number of connections closed
+        """
+        if max_idle is None:
+            max_idle = self.idle_timeout
+        deadline = time.monotonic() - max_idle
+
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                keep = []
+                for pooled in self._idle[key]:
+                    (expired if pooled.released_at <= deadline else keep).append(pooled)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+        for pooled in expired:
+            self._close_connection(pooled.transport, pooled.sftp)
+        if expired:
+            logger.debug(f"Closed {len(expired)} idle SFTP connection(s)")
+        return len(expired)
+
+    def close(self) -> None:
+        """Close all pooled connections. Connections released afterwards are closed too."""
+        self._closed.set()
+        self.close_idle(max_idle=-1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_reaper(self) -> None:
+        """Start the background thread that closes idle connections, if not running."""
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap, name="sftp-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        """Close expired connections periodically until the pool is closed or empty."""
+        interval = max(1.0, min(self.idle_timeout / 2, 60.0))
+        while not self._closed.wait(interval):
+            self.close_idle()
+            with self._lock:
+                if not self._idle:
+                    self._reaper = None
+                    return
+
+    @staticmethod
+    def _is_healthy(transport: paramiko.Transport, sftp: paramiko.SFTPClient) -> bool:
+        """
+        Check that a connection is still usable with a cheap SFTP round trip.
+
+        Args:
+            transport: Transport of the connection
+            sftp: SFTP client of the connection
+
+        Returns:
+            bool: True if the server answered
+        """
+        if not transport.is_active():
+            return False
+        try:
+            sftp.normalize(".")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_connection(transport: paramiko.Transport, sftp: paramiko.SFTPClient) -> None:
+        """Close a connection, ignoring errors from an already broken transport."""
+        try:
+            sftp.close()
+        except Exception:
+            pass
+        try:
+            transport.close()
+        except Exception:
+            pass
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+SFTP Fan-Out Upload Module.
+
+This module publishes one file to several SFTP destinations concurrently, with a
+bounded number of parallel uploads, per-destination retries and timeouts, and a
+result for every destination.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from mac_calendar_exporter.sftp.connection_pool import SFTPConnectionPool
+from mac_calendar_exporter.sftp.sftp_uploader import DEFAULT_REQUEST_SIZE, SFTPUploader
+
+logger = logging.getLogger(__name__)
+
+# Default number of destinations uploaded to at the same time
+DEFAULT_MAX_CONCURRENT_UPLOADS = 4
+
+# Default number of retries after a failed upload to one destination
+DEFAULT_RETRIES = 2
+
+# Default seconds to wait for a connection and for each SFTP operation
+DEFAULT_TIMEOUT = 30
+
+
+class UploadResult:
+    """Outcome of uploading a file to one destination."""
+
+    def __init__(
+        self,
+        destination: str,
+        success: bool,
+        skipped: bool = False,
+        attempts: int = 0,
+        duration: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        """
+        Initialize the UploadResult.
+
+        Args:
+            destination: Destination label, "user@host:port:remote_path"
+            success: Whether the file is published at the destination
+            skipped: Whether the transfer was skipped because the remote copy is current
+            attempts: Number of upload attempts made
+            duration: Seconds spent on all attempts, including retry delays
+            error: Error of the last failed attempt, if the upload failed
+        """
+        self.destination = destination
+        self.success = success
+        self.skipped = skipped
+        self.attempts = attempts
+        self.duration = duration
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the result to a dictionary.
+
+        Returns:
+            Dict[str, Any]: Result fields
+        """
+        return {
+            "destination": self.destination,
+            "success": self.success,
+            "skipped": self.skipped,
+            "attempts": self.attempts,
+            "duration": round(self.duration, 3),
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return (f"UploadResult(destination={self.destination!r}, success={self.success!r}, "
+                f"skipped={self.skipped!r}, attempts={self.attempts!r})")
+
+
+class FanOutUploader:
+    """Upload a file to several SFTP destinations in parallel."""
+
+    def __init__(
+        self,
+        pool: Optional[SFTPConnectionPool] = None,
+        max_concurrent_uploads: int = DEFAULT_MAX_CONCURRENT_UPLOADS,
+        retries: int = DEFAULT_RETRIES,
+        retry_delay: float = 2.0,
+        timeout: int = DEFAULT_TIMEOUT,
+    ):
+        """
+        Initialize the FanOutUploader.
+
+        Args:
+            pool: Connection pool shared by all destinations
+            max_concurrent_uploads: Maximum number of destinations uploaded to at once
+            retries: Number of retries after a failed attempt at one destination
+            retry_delay: Seconds before the first retry, doubled for each further retry
+            timeout: Seconds to wait for a connection and for each SFTP operation
+        """
+        self.pool = pool
+        self.max_concurrent_uploads = max(1, max_concurrent_uploads)
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+
+    def upload(
+        self,
+        local_file: str,
+        destinations: List[Dict[str, Any]],
+        sidecar_suffixes: Iterable[str] = (),
+    ) -> List[UploadResult]:
+        """
+        Upload a file, and any sidecar files next to it, to all destinations.
+
+        Each destination is a dictionary with the SFTPUploader arguments "hostname",
+        "port", "username", "password", "key_file" and "key_passphrase", plus
+        "remote_path" and optionally "create_dirs", "atomic_upload", "timeout",
+        "window_size", "max_packet_size" and "request_size".
+
+        Args:
+            local_file: Path to the local file to upload
+            destinations: Destinations to upload to
+            sidecar_suffixes: Suffixes of sidecar files (e.g. ".gz"), uploaded from
+                              local_file + suffix to remote_path + suffix before the file
+
+        Returns:
+            List[UploadResult]: One result per destination, in destination order
+        """
+        if not destinations:
+            return []
+        sidecar_suffixes = list(sidecar_suffixes)
+
+        workers = min(self.max_concurrent_uploads, len(destinations))
+        if workers == 1:
+            results = [self._upload_one(local_file, destination, sidecar_suffixes) for destination in destinations]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sftp-upload") as executor:
+                results = list(executor.map(lambda d: self._upload_one(local_file, d, sidecar_suffixes), destinations))
+
+        failed = [result for result in results if not result.success]
+        logger.info(f"Uploaded {local_file} to {len(results) - len(failed)} of {len(results)} destination(s)")
+        for result in failed:
+            logger.error(f"Upload to {result.destination} failed after {result.attempts} attempt(s): {result.error}")
+        return results
+
+    def _upload_one(self, local_file: str, destination: Dict[str, Any], sidecar_suffixes: List[str]) -> UploadResult:
+        """
+        Upload a file and its sidecars to one destination, retrying failed attempts.
+
+        The sidecars are published before the file itself, so a client that sees
+        the new file also finds matching sidecars. A sidecar that fails to upload
+        fails the attempt before the file is touched. A retry uploads all files
+        again; files that already arrived are skipped as unchanged.
+
+        Args:
+            local_file: Path to the local file to upload
+            destination: Destination dictionary, see upload
+            sidecar_suffixes: Suffixes of sidecar files to upload before the file
+
+        Returns:
+            UploadResult: Outcome of the upload
+        """
+        remote_path = destination["remote_path"]
+        label = f"{destination.get('username')}@{destination['hostname']}:{destination.get('port', 22)}:{remote_path}"
+        uploader = SFTPUploader(
+            hostname=destination["hostname"],
+            port=destination.get("port", 22),
+            username=destination.get("username"),
+            password=destination.get("password"),
+            key_file=destination.get("key_file"),
+            key_passphrase=destination.get("key_passphrase"),
+            timeout=destination.get("timeout", self.timeout),
+            pool=self.pool,
+            window_size=destination.get("window_size"),
+            max_packet_size=destination.get("max_packet_size"),
+            request_size=destination.get("request_size", DEFAULT_REQUEST_SIZE),
+        )
+
+        files = [(local_file + suffix, remote_path + suffix) for suffix in sidecar_suffixes]
+        files.append((local_file, remote_path))
+
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            skipped = True
+            for local_path, remote in files:
+                success = uploader.upload_file(
+                    local_path,
+                    remote,
+                    create_dirs=destination.get("create_dirs", True),
+                    atomic=destination.get("atomic_upload", True),
+                )
+                if not success:
+                    # Stop at the first failure, so the file is never published without its sidecars
+                    break
+                skipped = skipped and uploader.last_upload_skipped
+            # Do not return a connection that just failed to the pool
+            uploader.disconnect(discard=not success)
+
+            if success or attempts > self.retries:
+                break
+
+            delay = self.retry_delay * 2 ** (attempts - 1)
+            logger.warning(f"Upload to {label} failed ({uploader.last_error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        return UploadResult(
+            destination=label,
+            success=success,
+            skipped=success and skipped,
+            attempts=attempts,
+            duration=time.monotonic() - started,
+            error=None if success else uploader.last_error,
+        )
@@ -3,16 +3,37 @@
 SFTP Upload Module.
 
 This module handles uploading files to an SFTP server using paramiko.
+Uploads of files that are unchanged since their last upload are skipped, based
+on a local record of each upload confirmed by a remote stat. Files are published
+atomically by uploading to a temporary name and renaming it into place.
+Connections can be borrowed from an SFTPConnectionPool to reuse them across uploads.
+Files are written with pipelined requests of a configurable size, and the SSH
+window and packet sizes can be tuned for high-latency links.
 """
 
+import hashlib
+import json
 import logging
 import os
+import posixpath
+import socket
+import threading
+import time
+import uuid
 from typing import Dict, Optional, Tuple, Union
 
 import paramiko
 
+from mac_calendar_exporter.sftp.connection_pool import PoolKey, SFTPConnectionPool, connection_key
+
 logger = logging.getLogger(__name__)
 
+# Default size of SFTP write requests, the largest size every server must accept
+DEFAULT_REQUEST_SIZE = 32768
+
+# Serializes updates of upload records shared by concurrent uploads of one file
+_records_lock = threading.Lock()
+
 
 class SFTPUploader:
     """Upload files to an SFTP server."""
@@ -26,6 +47,10 @@ class SFTPUploader:
         key_file: str = None,
         key_passphrase: str = None,
         timeout: int = 30,
+        pool: Optional[SFTPConnectionPool] = None,
+        window_size: Optional[int] = None,
+        max_packet_size: Optional[int] = None,
+        request_size: int = DEFAULT_REQUEST_SIZE,
     ):
         """
         Initialize the SFTP uploader.
@@ -37,7 +62,15 @@ class SFTPUploader:
             password: Password for password authentication
             key_file: Path to SSH private key for key-based authentication
             key_passphrase: Passphrase for encrypted SSH private key
-            timeout: Connection timeout in seconds
+            timeout: Seconds to wait for the connection and for each SFTP
+                     operation before giving up
+            pool: Connection pool to borrow the connection from and return it to
+                  on disconnect (a dedicated connection is opened if None)
+            window_size: SSH channel window size in bytes (paramiko's default if None)
+            max_packet_size: Maximum SSH packet size in bytes (paramiko's default if None)
+            request_size: Size of each pipelined SFTP write request in bytes. Larger
+                          requests cut per-request overhead but must be accepted by
+                          the server (OpenSSH accepts 128 KB).
         """
         self.hostname = hostname
         self.port = port
@@ -46,18 +79,64 @@ class SFTPUploader:
         self.key_file = key_file
         self.key_passphrase = key_passphrase
         self.timeout = timeout
+        self.pool = pool
+        self.window_size = window_size
+        self.max_packet_size = max_packet_size
+        self.request_size = request_size
         self._transport = None
         self._sftp = None
+        self.last_upload_skipped = False
+        self.last_error = None
 
     def connect(self) -> bool:
         """
-        Connect to the SFTP server.
+        Connect to the SFTP server, reusing a pooled connection if available.
         
         Returns:
             bool: True if connection was successful, False otherwise
         """
         try:
-            transport = paramiko.Transport((self.hostname, self.port))
+            if self.pool is not None:
+                self._transport, self._sftp = self.pool.acquire(self.connection_key(), self._open_connection)
+            else:
+                self._transport, self._sftp = self._open_connection()
+            self._sftp.get_channel().settimeout(self.timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to SFTP server {self.hostname}: {e}")
+            self.last_error = f"Connection failed: {e}"
+            return False
+
+    def connection_key(self) -> PoolKey:
+        """
+        Get the pool key of this uploader's destination, credentials and transport settings.
+        
+        Returns:
+            PoolKey: Key from connection_key
+        """
+        return connection_key(self.hostname, self.port, self.username, self.password,
+                              self.key_file, self.key_passphrase, self.window_size, self.max_packet_size)
+
+    def _open_connection(self) -> Tuple[paramiko.Transport, paramiko.SFTPClient]:
+        """
+        Open and authenticate a new SFTP connection.
+        
+        Returns:
+            Tuple[paramiko.Transport, paramiko.SFTPClient]: The connection
+            
+        Raises:
+            Exception: If connecting or authenticating fails
+        """
+        sock = socket.create_connection((self.hostname, self.port), timeout=self.timeout)
+        transport_options = {}
+        if self.window_size:
+            transport_options["default_window_size"] = self.window_size
+        if self.max_packet_size:
+            transport_options["default_max_packet_size"] = self.max_packet_size
+        transport = paramiko.Transport(sock, **transport_options)
+        try:
+            transport.banner_timeout = self.timeout
+            transport.auth_timeout = self.timeout
             transport.connect(
                 username=self.username,
                 password=self.password,
@@ -76,24 +155,38 @@ class SFTPUploader:
                     if not self.password:
                         raise
 
-            self._transport = transport
-            self._sftp = paramiko.SFTPClient.from_transport(transport)
-            
-            logger.info(f"Successfully connected to SFTP server {self.hostname}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to SFTP server {self.hostname}: {e}")
-            return False
+            sftp = paramiko.SFTPClient.from_transport(
+                transport, window_size=self.window_size, max_packet_size=self.max_packet_size
+            )
+        except Exception:
+            transport.close()
+            raise
+        
+        logger.info(f"Successfully connected to SFTP server {self.hostname}")
+        return transport, sftp
 
-    def disconnect(self) -> None:
-        """Close the SFTP connection."""
-        if self._sftp:
-            self._sftp.close()
+    def disconnect(self, discard: bool = False) -> None:
+        """
+        Close the SFTP connection, or return it to the pool.
+        
+        Args:
+            discard: If True, close a pooled connection instead of returning it,
+                     e.g. after a failure that may have left it in a bad state
+        """
+        if self._sftp is None or self._transport is None:
+            return
+        
+        if self.pool is not None and not discard:
+            self.pool.release(self.connection_key(), self._transport, self._sftp)
             self._sftp = None
-            
-        if self._transport:
-            self._transport.close()
             self._transport = None
+            logger.debug(f"Returned SFTP connection to {self.hostname} to the pool")
+            return
+        
+        self._sftp.close()
+        self._sftp = None
+        self._transport.close()
+        self._transport = None
             
         logger.info("Disconnected from SFTP server")
 
@@ -101,7 +194,9 @@ class SFTPUploader:
         self, 
         local_file: str, 
         remote_path: str, 
-        create_dirs: bool = True
+        create_dirs: bool = True,
+        skip_unchanged: bool = True,
+        atomic: bool = True
     ) -> bool:
         """
         Upload a file to the SFTP server.
@@ -110,10 +205,17 @@ class SFTPUploader:
             local_file: Path to the local file to upload
             remote_path: Path on the SFTP server to upload the file to
             create_dirs: If True, create remote directories if they don't exist
+            skip_unchanged: If True, skip the transfer when the file matches the
+                            record of its last upload and the remote copy still
+                            has the recorded size and modification time
+            atomic: If True, upload to a temporary file in the same directory and
+                    rename it over remote_path, so readers never see a partial file
             
         Returns:
-            bool: True if upload was successful, False otherwise
+            bool: True if upload was successful (or skipped), False otherwise
         """
+        self.last_upload_skipped = False
+        self.last_error = None
         if not self._sftp:
             if not self.connect():
                 return False
@@ -122,8 +224,18 @@ class SFTPUploader:
             # Check if local file exists
             if not os.path.isfile(local_file):
                 logger.error(f"Local file does not exist: {local_file}")
+                self.last_error = f"Local file does not exist: {local_file}"
                 return False
 
+            local_size = os.path.getsize(local_file)
+            local_hash = self._file_digest(local_file)
+            record_key = f"{self.username}@{self.hostname}:{self.port}:{remote_path}"
+            
+            if skip_unchanged and self._is_unchanged(local_file, record_key, remote_path, local_size, local_hash):
+                logger.info(f"{local_file} unchanged since last upload to {remote_path}, skipping transfer")
+                self.last_upload_skipped = True
+                return True
+
             # Create remote directories if needed
             if create_dirs:
                 remote_dir = os.path.dirname(remote_path)
@@ -132,18 +244,217 @@ class SFTPUploader:
                         self._create_remote_directory(remote_dir)
                     except Exception as e:
                         logger.error(f"Failed to create remote directory {remote_dir}: {e}")
+                        self.last_error = f"Failed to create remote directory {remote_dir}: {e}"
                         return False
             
             # Upload the file
-            self._sftp.put(local_file, remote_path)
+            if atomic:
+                self._put_atomic(local_file, remote_path)
+            else:
+                self._put(local_file, remote_path)
             logger.info(f"Successfully uploaded {local_file} to {remote_path}")
+            
+            self._record_upload(local_file, record_key, remote_path, local_size, local_hash)
             return True
         except Exception as e:
             logger.error(f"Failed to upload file {local_file} to {remote_path}: {e}")
+            self.last_error = f"Upload failed: {e}"
             return False
         finally:
             # Keep the connection open for potential future uploads
             pass
+
+    def _put(self, local_file: str, remote_path: str) -> None:
+        """
+        Write a file to the server with pipelined requests and log the throughput.
+        
+        Unlike SFTPClient.put, which always writes 32 KB requests, the request
+        size follows self.request_size.
+        
+        Args:
+            local_file: Path to the local file to upload
+            remote_path: Path on the SFTP server to write to
+            
+        Raises:
+            IOError: If the remote file size does not match after the transfer
+        """
+        started = time.monotonic()
+        size = 0
+        with open(local_file, "rb") as src, self._sftp.open(remote_path, "wb") as dst:
+            # Send write requests without waiting for each acknowledgement
+            dst.set_pipelined(True)
+            dst.MAX_REQUEST_SIZE = self.request_size
+            for chunk in iter(lambda: src.read(self.request_size), b""):
+                dst.write(chunk)
+                size += len(chunk)
+        
+        remote_size = self._sftp.stat(remote_path).st_size
+        if remote_size != size:
+            raise IOError(f"size mismatch in put! {remote_size} != {size}")
+        
+        elapsed = time.monotonic() - started
+        rate = size / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+        logger.info(f"Transferred {size} bytes to {remote_path} in {elapsed:.2f}s ({rate:.2f} MB/s)")
+
+    def _put_atomic(self, local_file: str, remote_path: str) -> None:
+        """
+        Upload a file to a temporary name and rename it over the target.
+        
+        Uses the posix-rename extension, which replaces the target atomically. If
+        the server does not support it, the target is removed and the temporary
+        file renamed with a standard rename, which leaves a short window without
+        the file but never exposes a partial one.
+        
+        Args:
+            local_file: Path to the local file to upload
+            remote_path: Path on the SFTP server to publish the file at
+        """
+        remote_dir, remote_name = posixpath.split(remote_path)
+        temp_path = posixpath.join(remote_dir, f".{remote_name}.{uuid.uuid4().hex[:12]}.tmp")
+        
+        try:
+            self._put(local_file, temp_path)
+            try:
+                self._sftp.posix_rename(temp_path, remote_path)
+            except IOError as e:
+                logger.debug(f"posix-rename not available ({e}), falling back to remove and rename")
+                try:
+                    self._sftp.remove(remote_path)
+                except IOError:
+                    # Target did not exist yet
+                    pass
+                self._sftp.rename(temp_path, remote_path)
+        except Exception:
+            # The connection may be dead too; the upload error is the one to report
+            try:
+                self._sftp.remove(temp_path)
+            except Exception as e:
+                logger.debug(f"Failed to remove temporary file {temp_path}: {e}")
+            raise
+
+    def _is_unchanged(
+        self,
+        local_file: str,
+        record_key: str,
+        remote_path: str,
+        local_size: int,
+        local_hash: str
+    ) -> bool:
+        """
+        Check whether the remote copy is identical to the local file.
+        
+        The local file must match the recorded size and hash of its last upload,
+        and a remote stat must still show the recorded size and modification time.
+        
+        Args:
+            local_file: Path to the local file
+            record_key: Key of the upload record for this destination
+            remote_path: Path on the SFTP server
+            local_size: Size of the local file in bytes
+            local_hash: SHA-256 of the local file
+            
+        Returns:
+            bool: True if the transfer can be skipped
+        """
+        record = self._load_upload_records(local_file).get(record_key)
+        if not record or record.get("size") != local_size or record.get("sha256") != local_hash:
+            return False
+        
+        try:
+            remote_stat = self._sftp.stat(remote_path)
+        except IOError:
+            # Remote file is gone
+            return False
+        
+        return remote_stat.st_size == local_size and remote_stat.st_mtime == record.get("mtime")
+
+    def _record_upload(
+        self,
+        local_file: str,
+        record_key: str,
+        remote_path: str,
+        local_size: int,
+        local_hash: str
+    ) -> None:
+        """
+        Persist the size, hash and remote modification time of a finished upload.
+        
+        Args:
+            local_file: Path to the uploaded local file
+            record_key: Key of the upload record for this destination
+            remote_path: Path on the SFTP server
+            local_size: Size of the local file in bytes
+            local_hash: SHA-256 of the local file
+        """
+        try:
+            remote_mtime = self._sftp.stat(remote_path).st_mtime
+            with _records_lock:
+                records = self._load_upload_records(local_file)
+                records[record_key] = {
+                    "size": local_size,
+                    "sha256": local_hash,
+                    "mtime": remote_mtime
+                }
+                
+                records_file = self._upload_records_path(local_file)
+                temp_file = f"{records_file}.tmp"
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(records, f, indent=2)
+                os.replace(temp_file, records_file)
+        except Exception as e:
+            # A missing record only costs a redundant upload next time
+            logger.warning(f"Failed to record upload of {local_file}: {e}")
+
+    @staticmethod
+    def _upload_records_path(local_file: str) -> str:
+        """
+        Get the path of the file holding upload records for a local file.
+        
+        Args:
+            local_file: Path to the local file
+            
+        Returns:
+            str: Path of the upload records file
+        """
+        return f"{local_file}.uploads.json"
+
+    def _load_upload_records(self, local_file: str) -> Dict[str, Dict]:
+        """
+        Load the upload records of a local file, keyed by destination.
+        
+        Args:
+            local_file: Path to the local file
+            
+        Returns:
+            Dict[str, Dict]: Upload records, empty if none could be read
+        """
+        records_file = self._upload_records_path(local_file)
+        if not os.path.isfile(records_file):
+            return {}
+        
+        try:
+            with open(records_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable upload records {records_file}: {e}")
+            return {}
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        """
+        Compute the SHA-256 of a file without reading it into memory at once.
+        
+        Args:
+            path: Path to the file
+            
+        Returns:
+            str: Hex-encoded SHA-256
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
             
     def _create_remote_directory(self, directory: str) -> None:
         """
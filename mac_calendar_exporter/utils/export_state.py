@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Export State Module.
+
+This module fingerprints the normalized set of exported events together with the
+ICS generation settings, and persists the fingerprint of the last export next to
+the output file. When the fingerprint of a new run matches, the existing ICS file
+is known to be up to date and is kept, and its upload can be skipped. The upload
+is only skipped if it went to the same destinations, which are recorded as a digest.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# Bump when the ICS output changes for the same events and settings
+FINGERPRINT_VERSION = 2
+
+# Destination settings that decide where a file is uploaded; credentials are left out
+DESTINATION_KEYS = ("hostname", "port", "username", "remote_path")
+
+
+def compute_fingerprint(events: Iterable[CalendarEvent], settings: Dict[str, Any]) -> str:
+    """
+    Compute a content fingerprint of an event set and the generation settings.
+
+    Args:
+        events: Events to be exported
+        settings: Settings that affect the generated ICS file
+
+    Returns:
+        str: Hex-encoded SHA-256 fingerprint, see EventFingerprint
+    """
+    fingerprint = EventFingerprint(settings)
+    for event in events:
+        fingerprint.add(event)
+    return fingerprint.hexdigest()
+
+
+class EventFingerprint:
+    """
+    Content fingerprint of an event set, built one event at a time.
+
+    Each event is normalized to canonical JSON and hashed, and the hashes are
+    summed modulo 2**256. The fingerprint therefore does not depend on the order
+    in which the helper returned the events, and events can be fingerprinted
+    while they stream to the ICS writer without being kept in memory.
+    """
+
+    def __init__(self, settings: Dict[str, Any]):
+        """
+        Initialize the EventFingerprint.
+
+        Args:
+            settings: Settings that affect the generated ICS file
+        """
+        self.settings = settings
+        self.count = 0
+        self._sum = 0
+
+    def add(self, event: CalendarEvent) -> None:
+        """
+        Add an event to the fingerprint.
+
+        Args:
+            event: Event to be exported
+        """
+        key = json.dumps(event.to_dict(), sort_keys=True, ensure_ascii=False)
+        self._sum = (self._sum + int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest(), "big")) % (1 << 256)
+        self.count += 1
+
+    def hexdigest(self) -> str:
+        """
+        Get the fingerprint of the events added so far.
+
+        Returns:
+            str: Hex-encoded SHA-256 fingerprint
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"version": FINGERPRINT_VERSION, "settings": self.settings,
+                                  "count": self.count}, sort_keys=True).encode("utf-8"))
+        digest.update(self._sum.to_bytes(32, "big"))
+        return digest.hexdigest()
+
+
+def compute_destinations_digest(destinations: List[Dict[str, Any]], settings: Dict[str, Any]) -> str:
+    """
+    Compute a digest of the SFTP destinations a file is uploaded to.
+
+    Args:
+        destinations: Resolved destinations, as passed to FanOutUploader
+        settings: Upload settings that change what is uploaded
+
+    Returns:
+        str: Hex-encoded SHA-256 digest, independent of the destination order
+    """
+    targets = sorted(
+        json.dumps({key: destination.get(key) for key in DESTINATION_KEYS}, sort_keys=True)
+        for destination in destinations
+    )
+    data = json.dumps({"destinations": targets, "settings": settings}, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ExportState:
+    """Fingerprint and upload status of the last export, stored next to the output file."""
+
+    def __init__(self, output_file: str):
+        """
+        Initialize the ExportState and load any previously saved state.
+
+        Args:
+            output_file: Path of the generated ICS file
+        """
+        self.output_file = output_file
+        self.path = f"{output_file}.fingerprint"
+        self.fingerprint = None
+        self.uploaded = False
+        self.destinations = None
+        self.load()
+
+    def load(self) -> None:
+        """Load the saved state, treating a missing or unreadable file as no state."""
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.fingerprint = state.get("fingerprint")
+            self.uploaded = bool(state.get("uploaded", False))
+            self.destinations = state.get("destinations")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable export state {self.path}: {e}")
+            self.fingerprint = None
+            self.uploaded = False
+            self.destinations = None
+
+    def save(self) -> bool:
+        """
+        Save the state next to the output file.
+
+        Returns:
+            bool: True if the state was saved, False otherwise
+        """
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "fingerprint": self.fingerprint,
+                    "uploaded": self.uploaded,
+                    "destinations": self.destinations,
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                }, f, indent=2)
+            os.replace(temp_path, self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save export state {self.path}: {e}")
+            return False
+
+    def is_current(self, fingerprint: str) -> bool:
+        """
+        Check whether the output file was generated from the given fingerprint.
+
+        Args:
+            fingerprint: Fingerprint of the events about to be exported
+
+        Returns:
+            bool: True if the output file exists and matches the fingerprint
+        """
+        return self.fingerprint == fingerprint and os.path.isfile(self.output_file)
+
+    def record_generated(self, fingerprint: str) -> None:
+        """
+        Record a newly generated output file, which has not been uploaded yet.
+
+        Args:
+            fingerprint: Fingerprint of the exported events
+        """
+        self.fingerprint = fingerprint
+        self.uploaded = False
+        self.destinations = None
+        self.save()
+
+    def is_uploaded(self, destinations: Optional[str]) -> bool:
+        """
+        Check whether the current output file was uploaded to the given destinations.
+
+        Args:
+            destinations: Digest from compute_destinations_digest (None never matches)
+
+        Returns:
+            bool: True if the last upload of this file went to the same destinations
+        """
+        return self.uploaded and destinations is not None and self.destinations == destinations
+
+    def record_uploaded(self, destinations: Optional[str] = None) -> None:
+        """
+        Record that the current output file was uploaded.
+
+        Args:
+            destinations: Digest of the destinations it was uploaded to
+        """
+        self.uploaded = True
+        self.destinations = destinations
+        self.save()
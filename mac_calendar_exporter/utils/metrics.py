@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Run Metrics Module.
+
+This module turns run reports into Prometheus metrics: run and failure counters,
+stage latency histograms, event counts per calendar, upload bytes and durations,
+and the time of the last successful run. Counters and histograms accumulate
+across runs. Because every launchd or cron run is a new process, the cumulative
+values are persisted in a JSON state file next to the metrics file.
+
+Metrics are rendered in the OpenMetrics text format, or in the Prometheus text
+format 0.0.4 read by node_exporter's textfile collector. The two differ only in
+how counters are named in TYPE lines and in the closing "# EOF" line.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from mac_calendar_exporter.utils.run_report import RunReport
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every metric name
+METRIC_PREFIX = "mac_calendar_exporter"
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Bump when the state file layout changes; older state is discarded
+STATE_VERSION = 1
+
+# Content types of the two text formats
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text formats."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, keeping integers free of a decimal point."""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Format a label set, e.g. {stage="fetch"}."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels) + "}"
+
+
+class RunMetrics:
+    """Cumulative metrics of export runs, optionally persisted between processes."""
+
+    def __init__(self, state_file: Optional[str] = None):
+        """
+        Initialize the RunMetrics and load any previously saved state.
+
+        Args:
+            state_file: JSON file keeping cumulative values between processes
+                        (None to keep them in memory only)
+        """
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._state = self._empty_state()
+        if state_file:
+            self.load()
+
+    @staticmethod
+    def _empty_state() -> Dict:
+        """Return the state before the first run."""
+        return {
+            "version": STATE_VERSION,
+            "runs": {"success": 0, "failure": 0},
+            "stage_durations": {},
+            "run_duration": None,
+            "last_run": None,
+            "last_success": None,
+            "calendar_events": {},
+            "events_written": 0,
+            "events_dropped": 0,
+            "ics_bytes": 0,
+            "upload_bytes": 0,
+            "upload_durations": {},
+            "upload_failures": {},
+            "helper_processes": 0,
+            "render_cache_hits": 0,
+            "render_cache_misses": 0,
+            "exports_unchanged": 0,
+        }
+
+    def load(self) -> None:
+        """Load the saved state, treating a missing or unreadable file as no state."""
+        if not os.path.isfile(self.state_file):
+            return
+
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != STATE_VERSION:
+                logger.warning(f"Discarding metrics state {self.state_file} of another version")
+                return
+            self._state = dict(self._empty_state(), **state)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metrics state {self.state_file}: {e}")
+
+    def save(self) -> bool:
+        """
+        Save the cumulative state.
+
+        Returns:
+            bool: True if the state was saved, False otherwise
+        """
+        if not self.state_file:
+            return False
+        with self._lock:
+            data = json.dumps(self._state, indent=2)
+        return self._write_atomic(self.state_file, data)
+
+    def record(self, report: RunReport) -> None:
+        """
+        Add a finished run to the metrics.
+
+        Args:
+            report: Report of the run
+        """
+        now = time.time()
+        with self._lock:
+            state = self._state
+            state["runs"]["success" if report.success else "failure"] += 1
+            state["last_run"] = now
+            if report.success:
+                state["last_success"] = now
+
+            for stage, seconds in report.stages.items():
+                state["stage_durations"][stage] = self._observe(state["stage_durations"].get(stage), seconds)
+            state["run_duration"] = self._observe(state["run_duration"], report.duration)
+
+            # Event counts describe the last run; the calendar set may change between runs
+            state["calendar_events"] = dict(report.events_per_calendar)
+            # An unchanged export keeps the file, and with it the last written counts
+            if report.bytes_written:
+                state["events_written"] = report.events_written
+                state["ics_bytes"] = report.bytes_written
+            state["events_dropped"] += report.events_dropped
+
+            state["upload_bytes"] += report.bytes_uploaded
+            for upload in report.uploads:
+                destination = upload["destination"]
+                state["upload_durations"][destination] = upload["duration"]
+                if not upload["success"]:
+                    state["upload_failures"][destination] = state["upload_failures"].get(destination, 0) + 1
+                else:
+                    state["upload_failures"].setdefault(destination, 0)
+
+            state["helper_processes"] += report.helper_processes
+            state["render_cache_hits"] += report.render_cache_hits
+            state["render_cache_misses"] += report.render_cache_misses
+            state["exports_unchanged"] += int(report.export_unchanged)
+
+    @staticmethod
+    def _observe(histogram: Optional[Dict], value: float) -> Dict:
+        """Add an observation to a histogram state, creating it if needed."""
+        if histogram is None or len(histogram["buckets"]) != len(LATENCY_BUCKETS):
+            histogram = {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+        return histogram
+
+    def render(self, openmetrics: bool = True) -> str:
+        """
+        Render all metrics in a text exposition format.
+
+        Args:
+            openmetrics: OpenMetrics text format if True, Prometheus text format 0.0.4 otherwise
+
+        Returns:
+            str: Metrics text
+        """
+        with self._lock:
+            families = self._families(self._state)
+
+        lines = []
+        for name, metric_type, help_text, samples in families:
+            full_name = f"{METRIC_PREFIX}_{name}"
+            # OpenMetrics names the counter family without the _total suffix of its samples
+            type_name = full_name if openmetrics or metric_type != "counter" else f"{full_name}_total"
+            lines.append(f"# HELP {type_name} {help_text}")
+            lines.append(f"# TYPE {type_name} {metric_type}")
+            for suffix, labels, value in samples:
+                lines.append(f"{full_name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str, openmetrics: bool = False) -> bool:
+        """
+        Write the metrics file atomically, as the textfile collector requires.
+
+        Args:
+            path: Metrics file, e.g. ".../textfile_collector/mac_calendar_exporter.prom"
+            openmetrics: Write the OpenMetrics format instead of the Prometheus text format
+
+        Returns:
+            bool: True if the file was written, False otherwise
+        """
+        return self._write_atomic(path, self.render(openmetrics))
+
+    @staticmethod
+    def _write_atomic(path: str, data: str) -> bool:
+        """Write a file via a temporary file and rename, so readers never see partial content."""
+        try:
+            # The collector only reads *.prom files, so the temporary file is ignored
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write metrics file {path}: {e}")
+            return False
+
+    @staticmethod
+    def _families(state: Dict) -> List[Tuple[str, str, str, List[Tuple[str, tuple, float]]]]:
+        """Build the metric families as (name, type, help, [(suffix, labels, value)])."""
+        def counter(name, help_text, samples):
+            return name, "counter", help_text, [("_total", labels, value) for labels, value in samples]
+
+        def gauge(name, help_text, samples):
+            return name, "gauge", help_text, [("", labels, value) for labels, value in samples]
+
+        def histogram_samples(histogram, labels):
+            samples = []
+            for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                samples.append(("_bucket", labels + (("le", repr(float(bound))),), count))
+            samples.append(("_bucket", labels + (("le", "+Inf"),), histogram["count"]))
+            samples.append(("_count", labels, histogram["count"]))
+            samples.append(("_sum", labels, histogram["sum"]))
+            return samples
+
+        stage_samples = []
+        for stage, histogram in sorted(state["stage_durations"].items()):
+            stage_samples.extend(histogram_samples(histogram, (("stage", stage),)))
+        run_samples = histogram_samples(state["run_duration"], ()) if state["run_duration"] else []
+
+        families = [
+            counter("runs", "Export runs by result",
+                    [((("result", result),), count) for result, count in sorted(state["runs"].items())]),
+            ("stage_duration_seconds", "histogram", "Duration of each stage of an export run", stage_samples),
+            ("run_duration_seconds", "histogram", "Duration of export runs", run_samples),
+        ]
+        if state["last_run"] is not None:
+            families.append(gauge("last_run_timestamp_seconds", "Unix time of the last run",
+                                  [((), state["last_run"])]))
+        if state["last_success"] is not None:
+            families.append(gauge("last_success_timestamp_seconds", "Unix time of the last successful run",
+                                  [((), state["last_success"])]))
+        families.extend([
+            gauge("calendar_events", "Events fetched per calendar in the last run",
+                  [((("calendar", name),), count) for name, count in sorted(state["calendar_events"].items())]),
+            gauge("events_written", "Events written to the ICS file by the last generation",
+                  [((), state["events_written"])]),
+            counter("events_dropped", "Events dropped because they could not be converted",
+                    [((), state["events_dropped"])]),
+            gauge("ics_bytes", "Bytes written by the last generation, including compressed copies",
+                  [((), state["ics_bytes"])]),
+            counter("upload_bytes", "Bytes uploaded to SFTP destinations",
+                    [((), state["upload_bytes"])]),
+            gauge("upload_duration_seconds", "Duration of the last upload to each destination",
+                  [((("destination", name),), seconds)
+                   for name, seconds in sorted(state["upload_durations"].items())]),
+            counter("upload_failures", "Failed uploads per destination",
+                    [((("destination", name),), count) for name, count in sorted(state["upload_failures"].items())]),
+            counter("helper_processes", "EventKit helper processes started",
+                    [((), state["helper_processes"])]),
+            counter("render_cache_hits", "Events reused from the render cache",
+                    [((), state["render_cache_hits"])]),
+            counter("render_cache_misses", "Events rendered because they were not cached",
+                    [((), state["render_cache_misses"])]),
+            counter("exports_unchanged", "Runs that kept the ICS file because the events were unchanged",
+                    [((), state["exports_unchanged"])]),
+        ])
+        return families
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Pipeline Profiling Module.
+
+This module runs a block of code, typically one export run, under cProfile and
+writes a .pstats file plus a text summary of the functions taking the most time.
+Threads started while profiling (parallel helper runs, SFTP fan-out uploads) are
+profiled too and merged into the same statistics. Optionally, tracemalloc reports
+the peak memory and the largest allocation sites, and pyinstrument (if installed)
+can be used as a low-overhead sampling profiler instead of cProfile.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+# Number of functions listed in the summary
+DEFAULT_TOP = 25
+
+# Functions of the export pipeline that always get their own section in the summary
+PIPELINE_FUNCTIONS = (
+    "_run_script",
+    "_stream_script",
+    "_helper_request",
+    "_stream_helper",
+    "_create_event_from_dict",
+    "to_ical",
+    "upload_file",
+)
+
+# Number of allocation sites listed in the memory report
+MEMORY_TOP = 10
+
+# Before Python 3.12, cProfile only sees the thread that enabled it. From 3.12 on it
+# uses the interpreter-wide sys.monitoring, which sees every thread but allows only
+# one active profiler.
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+class PipelineProfiler:
+    """Context manager profiling the code it wraps and writing the results on exit."""
+
+    def __init__(self, output: str, top: int = DEFAULT_TOP, memory: bool = False, sampling: bool = False):
+        """
+        Initialize the PipelineProfiler.
+
+        Args:
+            output: Path of the .pstats file; the summary is written to "<output>.txt"
+            top: Number of functions listed in the summary
+            memory: Also trace memory allocations with tracemalloc (slows the run down)
+            sampling: Use the pyinstrument sampling profiler if installed; it writes
+                      only the text summary, no .pstats file
+        """
+        self.output = output
+        self.summary_file = f"{output}.txt"
+        self.top = top
+        self.memory = memory
+        self.sampling = sampling
+        if sampling and pyinstrument is None:
+            logger.warning("pyinstrument is not installed, profiling with cProfile instead")
+            self.sampling = False
+
+        self.summary = ""
+        self._profile: Optional[cProfile.Profile] = None
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._started = 0.0
+
+    def __enter__(self) -> "PipelineProfiler":
+        if self.memory:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+
+        if self.sampling:
+            self._sampler = pyinstrument.Profiler()
+            self._sampler.start()
+        else:
+            if PER_THREAD_PROFILERS:
+                # Every thread started from now on gets its own profiler, merged on exit
+                threading.setprofile(self._profile_thread)
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if self.sampling:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+            if PER_THREAD_PROFILERS:
+                threading.setprofile(None)
+        elapsed = time.perf_counter() - self._started
+
+        memory_section = None
+        if self.memory:
+            # Before building the statistics, which allocate memory of their own
+            try:
+                memory_section = self._memory_section()
+            finally:
+                tracemalloc.stop()
+
+        sections = [f"Profile of {elapsed:.3f}s"]
+        if self.sampling:
+            sections.append(self._sampler.output_text(unicode=True, color=False))
+        else:
+            sections.extend(self._cprofile_sections())
+        if memory_section:
+            sections.append(memory_section)
+
+        self.summary = "\n\n".join(sections) + "\n"
+        try:
+            with open(self.summary_file, "w", encoding="utf-8") as f:
+                f.write(self.summary)
+            if self.sampling:
+                logger.info(f"Profile summary written to {self.summary_file}")
+            else:
+                logger.info(f"Profile written to {self.output}, summary to {self.summary_file}")
+        except OSError as e:
+            logger.error(f"Failed to write profile summary {self.summary_file}: {e}")
+        return False
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        """Start a profiler in a newly started thread (installed via threading.setprofile)."""
+        profile = cProfile.Profile()
+        try:
+            # Replaces this hook for the rest of the thread
+            profile.enable()
+        except ValueError as e:
+            # Another profiler is active; raising here would kill the thread before its target runs
+            sys.setprofile(None)
+            logger.debug(f"Not profiling thread {threading.current_thread().name}: {e}")
+            return
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def _cprofile_sections(self) -> List[str]:
+        """Merge the profiles of all threads, dump them and format the summary sections."""
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buffer)
+        with self._lock:
+            thread_profiles = list(self._thread_profiles)
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # A thread that made no calls has no statistics
+                pass
+        stats.dump_stats(self.output)
+
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(self.top)
+        threads = f"{len(thread_profiles)} worker thread(s)" if PER_THREAD_PROFILERS else "all threads"
+        top_section = (f"Top {self.top} functions by cumulative time, {threads} included:\n"
+                       + buffer.getvalue().strip("\n"))
+
+        buffer.seek(0)
+        buffer.truncate()
+        stats.print_stats("|".join(PIPELINE_FUNCTIONS))
+        pipeline_section = "Export pipeline functions:\n" + buffer.getvalue().strip("\n")
+        return [top_section, pipeline_section]
+
+    @staticmethod
+    def _memory_section() -> str:
+        """Format the peak traced memory and the largest live allocation sites."""
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: peak {peak / (1024 * 1024):.1f} MB, "
+                 f"{current / (1024 * 1024):.1f} MB still allocated at the end"]
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        lines.append(f"Top {MEMORY_TOP} allocation sites still allocated at the end:")
+        for statistic in snapshot.statistics("lineno")[:MEMORY_TOP]:
+            lines.append(f"  {statistic}")
+        return "\n".join(lines)
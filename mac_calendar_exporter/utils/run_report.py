@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Run Report Module.
+
+This module collects structured metrics of one export run: how long each stage
+took, how many events were fetched, written and dropped, how many bytes were
+written and uploaded, how many helper processes were started and how well the
+caches did. The report is returned by MacCalendarExporter.run() and can be
+written as JSON for monitoring.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when fields are renamed or removed, so consumers can detect the change
+REPORT_VERSION = 1
+
+
+class RunReport:
+    """Metrics of one export run. Truthy if the run succeeded."""
+
+    def __init__(self):
+        """Initialize an empty RunReport, starting its clock."""
+        self.started_at = datetime.now()
+        self.success = False
+        self.error: Optional[str] = None
+        self.ics_file: Optional[str] = None
+
+        # Seconds per stage: fetch, fingerprint, generate, upload
+        self.stages: Dict[str, float] = {}
+        self.duration = 0.0
+
+        self.events_fetched = 0
+        self.events_written = 0
+        self.events_dropped = 0
+        self.events_per_calendar: Dict[str, int] = {}
+        self.bytes_written = 0
+        self.bytes_uploaded = 0
+
+        # Helper processes launched and requests sent during the run
+        self.helper_processes = 0
+        self.helper_requests = 0
+
+        self.export_unchanged = False
+        self.upload_skipped = False
+        self.render_cache_hits = 0
+        self.render_cache_misses = 0
+        self.sftp_connections_opened = 0
+        self.sftp_connections_reused = 0
+        self.uploads: List[Dict[str, Any]] = []
+
+        self._started = time.monotonic()
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage of the run, adding to any earlier time of the same stage.
+
+        Args:
+            name: Stage name
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.monotonic() - started)
+
+    def add_stage_time(self, name: str, seconds: float) -> None:
+        """
+        Add time to a stage, e.g. for stages that interleave with others.
+
+        Args:
+            name: Stage name
+            seconds: Seconds to add
+        """
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def finish(self, success: bool, error: Optional[str] = None) -> "RunReport":
+        """
+        Record the outcome and total duration of the run.
+
+        Args:
+            success: Whether the run succeeded
+            error: Reason the run failed
+
+        Returns:
+            RunReport: This report
+        """
+        self.success = success
+        self.error = error
+        self.duration = time.monotonic() - self._started
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the report to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: Report data, durations in seconds
+        """
+        return {
+            "version": REPORT_VERSION,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "success": self.success,
+            "error": self.error,
+            "ics_file": self.ics_file,
+            "duration": round(self.duration, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "events": {
+                "fetched": self.events_fetched,
+                "written": self.events_written,
+                "dropped": self.events_dropped,
+                "per_calendar": self.events_per_calendar,
+            },
+            "bytes": {
+                "written": self.bytes_written,
+                "uploaded": self.bytes_uploaded,
+            },
+            "helper": {
+                "processes": self.helper_processes,
+                "requests": self.helper_requests,
+            },
+            "cache": {
+                "export_unchanged": self.export_unchanged,
+                "upload_skipped": self.upload_skipped,
+                "render_hits": self.render_cache_hits,
+                "render_misses": self.render_cache_misses,
+                "sftp_connections_opened": self.sftp_connections_opened,
+                "sftp_connections_reused": self.sftp_connections_reused,
+            },
+            "uploads": self.uploads,
+        }
+
+    def save(self, path: str) -> bool:
+        """
+        Write the report as JSON, replacing the file atomically.
+
+        Args:
+            path: Output file
+
+        Returns:
+            bool: True if the report was written, False otherwise
+        """
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write run report {path}: {e}")
+            return False
+
+    def summary(self) -> str:
+        """
+        Summarize the report in one line for the log.
+
+        Returns:
+            str: Outcome, stage durations and counts
+        """
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.stages.items())
+        return (f"Run {'succeeded' if self.success else 'failed'} in {self.duration:.2f}s ({stages}); "
+                f"{self.events_fetched} events fetched, {self.events_written} written, "
+                f"{self.events_dropped} dropped; {self.bytes_written} bytes written, "
+                f"{self.bytes_uploaded} uploaded; {self.helper_processes} helper process(es)")
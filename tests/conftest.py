@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures of the tests.
+
+EventKit is only available on macOS, so tests talk to stand-in helpers: the fake
+helper from the benchmarks, which replays canned events, or small scripts that
+misbehave on demand. Uploads go to the local SFTP server stand-in from the
+benchmarks, serving a temporary directory.
+"""
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from fake_eventkit_helper import DATA_ENV, write_canned_events  # noqa: E402
+from sftp_server import LocalSFTPServer  # noqa: E402
+
+
+@pytest.fixture
+def make_helper(tmp_path):
+    """Return a function writing an executable helper script from Python source."""
+    def make(source: str, name: str = "helper") -> str:
+        path = tmp_path / name
+        path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(source))
+        path.chmod(0o755)
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def fake_helper(tmp_path, monkeypatch, make_helper):
+    """Return the path of the fake EventKit helper, replaying 200 canned events."""
+    data_file = tmp_path / "events.ndjson"
+    write_canned_events(str(data_file), 200, seed=1)
+    monkeypatch.setenv(DATA_ENV, str(data_file))
+    return make_helper(f"""
+        import runpy, sys
+        sys.argv[0] = {os.path.join(BENCHMARKS_DIR, "fake_eventkit_helper.py")!r}
+        runpy.run_path(sys.argv[0], run_name="__main__")
+    """, name="fake_helper")
+
+
+@pytest.fixture
+def sftp_server(tmp_path):
+    """Start a local SFTP server serving a temporary directory, available as server.root."""
+    root = tmp_path / "sftp-root"
+    root.mkdir()
+    with LocalSFTPServer(str(root)) as server:
+        yield server
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent EventKit helper process.
+
+In persistent mode one helper process serves every request. A helper that
+crashes is restarted, and one that stops answering is stopped after the
+timeout, so the next request always gets a fresh process that works.
+"""
+
+import os
+
+import pytest
+
+from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
+
+# Serve-mode helper that misbehaves on demand: each request takes the next
+# fault from the "faults" file next to it ("crash", "hang" or "crash-mid-stream")
+FAULTY_HELPER = """
+    import json, os, sys, time
+
+    FAULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "faults")
+
+    def next_fault():
+        if not os.path.exists(FAULTS):
+            return None
+        with open(FAULTS) as f:
+            faults = f.read().split()
+        with open(FAULTS, "w") as f:
+            f.write("\\n".join(faults[1:]))
+        return faults[0] if faults else None
+
+    def send(response):
+        print(json.dumps(response), flush=True)
+
+    send({"status": "ready"})
+    for line in sys.stdin:
+        request = json.loads(line)
+        request_id = request["id"]
+        fault = next_fault()
+        if fault == "crash":
+            sys.exit(1)
+        if fault == "hang":
+            time.sleep(60)
+        if request["operation"] == "calendars":
+            send({"id": request_id, "calendars": [{"title": "Work", "id": "W1", "type": 1, "source": "Stub"}]})
+            continue
+        for day in range(1, 4):
+            send({"id": request_id, "type": "event", "event_id": f"E{day}", "calendar_name": "Work",
+                  "title": f"Event {day}", "start_date": f"2025-03-0{day} 09:00:00",
+                  "end_date": f"2025-03-0{day} 10:00:00", "all_day": False})
+            if fault == "crash-mid-stream":
+                sys.exit(1)
+        send({"id": request_id, "type": "end", "count": 3})
+"""
+
+
+@pytest.fixture
+def faulty_helper(make_helper):
+    return make_helper(FAULTY_HELPER)
+
+
+def set_faults(helper: str, *faults: str) -> None:
+    with open(os.path.join(os.path.dirname(helper), "faults"), "w") as f:
+        f.write("\n".join(faults))
+
+
+def calendar_titles(access: EventKitCalendarAccess):
+    return [calendar["title"] for calendar in access.list_calendars()]
+
+
+def test_persistent_helper_serves_every_request(fake_helper):
+    access = EventKitCalendarAccess(helper_path=fake_helper, persistent=True)
+    try:
+        assert sorted(calendar_titles(access)) == ["Family", "Personal", "Work"]
+        assert len(list(access.iter_events())) == 200
+        assert len(access.get_events()) == 200
+
+        assert access.processes_started == 1
+        assert access.requests_sent == 3
+    finally:
+        access.close()
+
+
+def test_helper_crashing_on_a_request_is_restarted(faulty_helper):
+    set_faults(faulty_helper, "crash")
+    access = EventKitCalendarAccess(helper_path=faulty_helper, persistent=True)
+    try:
+        assert calendar_titles(access) == ["Work"]
+        assert access.processes_started == 2
+        assert access.requests_sent == 2
+
+        assert calendar_titles(access) == ["Work"]
+        assert access.processes_started == 2
+    finally:
+        access.close()
+
+
+def test_helper_exiting_between_requests_is_restarted(faulty_helper):
+    access = EventKitCalendarAccess(helper_path=faulty_helper, persistent=True)
+    try:
+        assert calendar_titles(access) == ["Work"]
+        crashed = access._helper
+        crashed.kill()
+        crashed.wait()
+
+        assert calendar_titles(access) == ["Work"]
+        assert access.processes_started == 2
+        assert access._helper is not crashed
+    finally:
+        access.close()
+
+
+def test_helper_crashing_mid_stream_fails_the_fetch(faulty_helper):
+    set_faults(faulty_helper, "crash-mid-stream")
+    access = EventKitCalendarAccess(helper_path=faulty_helper, persistent=True)
+    try:
+        events = []
+        with pytest.raises(RuntimeError, match="ended unexpectedly after 1 events"):
+            for event in access.iter_events():
+                events.append(event)
+        assert len(events) == 1
+        assert access._helper is None
+
+        assert [event.event_id for event in access.iter_events()] == ["E1", "E2", "E3"]
+        assert access.processes_started == 2
+    finally:
+        access.close()
+
+
+def test_hanging_helper_is_stopped_after_the_timeout(faulty_helper):
+    set_faults(faulty_helper, "hang")
+    access = EventKitCalendarAccess(helper_path=faulty_helper, persistent=True, timeout=2)
+    try:
+        assert calendar_titles(access) == []
+        assert access._helper is None
+
+        assert calendar_titles(access) == ["Work"]
+        assert access.processes_started == 2
+    finally:
+        access.close()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the export run of MacCalendarExporter.
+
+Events are streamed from a stand-in helper into the ICS file. A helper that
+fails mid-stream must fail the run as a fetch failure and leave the previous
+file in place, rather than pass for a calendar without events.
+"""
+
+import pytest
+
+from mac_calendar_exporter.calendar.eventkit_calendar import EventKitCalendarAccess
+from mac_calendar_exporter.main import MacCalendarExporter
+
+CRASHING_HELPER = """
+    import json, sys
+    for day in range(1, 4):
+        print(json.dumps({"type": "event", "event_id": f"E{day}", "calendar_name": "Work",
+                          "title": f"Event {day}", "start_date": f"2025-03-0{day} 09:00:00",
+                          "end_date": f"2025-03-0{day} 10:00:00", "all_day": False}), flush=True)
+    sys.exit(1)
+"""
+
+
+@pytest.fixture
+def output_file(tmp_path):
+    return tmp_path / "calendar.ics"
+
+
+def make_exporter(helper: str, output_file) -> MacCalendarExporter:
+    exporter = MacCalendarExporter(config={
+        'calendar_names': [],
+        'ics_file': str(output_file),
+        'ics_compression': [],
+        'enable_sftp': False,
+        'incremental_export': True,
+        'render_cache': True,
+        'collapse_recurring': False,
+    })
+    exporter._calendar_accessor = EventKitCalendarAccess(helper_path=helper)
+    return exporter
+
+
+def test_export_streams_helper_events_into_the_ics_file(fake_helper, output_file):
+    exporter = make_exporter(fake_helper, output_file)
+
+    report = exporter.run()
+
+    assert report.success
+    assert report.events_fetched == 200
+    assert report.events_written == 200
+    assert sum(report.events_per_calendar.values()) == 200
+    assert report.helper_processes == 1
+    assert {'fetch', 'fingerprint', 'generate'} <= set(report.stages)
+    assert output_file.read_bytes().count(b"BEGIN:VEVENT") == 200
+
+
+def test_unchanged_export_keeps_the_existing_file(fake_helper, output_file):
+    exporter = make_exporter(fake_helper, output_file)
+    assert exporter.run().success
+    content = output_file.read_bytes()
+    modified = output_file.stat().st_mtime_ns
+
+    report = exporter.run()
+
+    assert report.success
+    assert report.export_unchanged
+    assert report.bytes_written == 0
+    assert output_file.read_bytes() == content
+    assert output_file.stat().st_mtime_ns == modified
+    assert not (output_file.parent / "calendar.ics.tmp").exists()
+
+
+def test_helper_failing_mid_stream_fails_the_run(fake_helper, make_helper, output_file):
+    assert make_exporter(fake_helper, output_file).run().success
+    content = output_file.read_bytes()
+    exporter = make_exporter(make_helper(CRASHING_HELPER), output_file)
+
+    report = exporter.run()
+
+    assert not report.success
+    assert report.error.startswith("Failed to fetch events:")
+    assert report.events_fetched == 3
+    assert output_file.read_bytes() == content
+    assert not (output_file.parent / "calendar.ics.tmp").exists()
+
+
+def test_empty_calendar_is_not_a_fetch_failure(make_helper, output_file):
+    exporter = make_exporter(make_helper('print(\'{"type": "end", "count": 0}\')'), output_file)
+
+    report = exporter.run()
+
+    assert not report.success
+    assert report.error == "Calendar export failed"
+    assert not output_file.exists()
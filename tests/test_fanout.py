@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for publishing the ICS file and its compressed sidecars with FanOutUploader.
+
+The sidecars are uploaded before the file itself, so a client that sees a new
+file finds matching sidecars, and a sidecar that cannot be published fails the
+destination without the file being replaced.
+"""
+
+import os
+
+import pytest
+
+from mac_calendar_exporter.sftp.fanout import FanOutUploader
+from mac_calendar_exporter.sftp.sftp_uploader import SFTPUploader
+
+
+@pytest.fixture
+def ics_file(tmp_path):
+    """Local ICS file with .gz and .zst sidecars next to it."""
+    path = tmp_path / "calendar.ics"
+    for suffix in ("", ".gz", ".zst"):
+        (tmp_path / f"calendar.ics{suffix}").write_bytes(f"new{suffix}".encode())
+    return str(path)
+
+
+def destination(server):
+    return {"hostname": server.host, "port": server.port, "username": "test", "password": "test",
+            "remote_path": "/calendar.ics"}
+
+
+def remote_content(server, name):
+    with open(os.path.join(server.root, name), "rb") as f:
+        return f.read()
+
+
+def test_sidecars_are_published_before_the_file(sftp_server, ics_file, monkeypatch):
+    uploaded = []
+    upload_file = SFTPUploader.upload_file
+
+    def record_upload(self, local_file, remote_path, *args, **kwargs):
+        uploaded.append(remote_path)
+        return upload_file(self, local_file, remote_path, *args, **kwargs)
+
+    monkeypatch.setattr(SFTPUploader, "upload_file", record_upload)
+
+    results = FanOutUploader(retries=0).upload(ics_file, [destination(sftp_server)], [".gz", ".zst"])
+
+    assert [result.success for result in results] == [True]
+    assert uploaded == ["/calendar.ics.gz", "/calendar.ics.zst", "/calendar.ics"]
+    for suffix in ("", ".gz", ".zst"):
+        assert remote_content(sftp_server, f"calendar.ics{suffix}") == f"new{suffix}".encode()
+
+
+def test_failed_sidecar_fails_the_destination(sftp_server, ics_file):
+    with open(os.path.join(sftp_server.root, "calendar.ics"), "wb") as f:
+        f.write(b"old")
+    # A directory in the way makes publishing the .zst sidecar fail on the server
+    os.mkdir(os.path.join(sftp_server.root, "calendar.ics.zst"))
+
+    results = FanOutUploader(retries=1, retry_delay=0).upload(ics_file, [destination(sftp_server)], [".gz", ".zst"])
+
+    assert len(results) == 1
+    assert not results[0].success
+    assert results[0].attempts == 2
+    assert results[0].error
+    assert remote_content(sftp_server, "calendar.ics") == b"old"
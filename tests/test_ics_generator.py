@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming ICS writer.
+
+The VEVENTs written by ICSGenerator.write_ics must be byte-identical to adding
+the same events to one icalendar.Calendar and serializing it with to_ical(),
+which is how the file was generated before it was streamed.
+"""
+
+import io
+from datetime import date, datetime
+
+import pytest
+from icalendar import Calendar
+
+from mac_calendar_exporter.calendar.calendar_event import CalendarEvent
+from mac_calendar_exporter.ics.ics_generator import ICSGenerator
+from mac_calendar_exporter.ics.render_cache import VEventCache
+
+CALENDAR_NAME = "Team, Projects; Ops"
+
+EVENTS = [
+    CalendarEvent(
+        event_id="A1B2C3",
+        calendar_name="Work",
+        title="Weekly planning",
+        start=datetime(2025, 3, 3, 9, 0),
+        end=datetime(2025, 3, 3, 10, 30),
+        location="Room 4.12",
+        description="Agenda:\n- Roadmap\n- Hiring",
+    ),
+    CalendarEvent(
+        event_id="D4E5F6",
+        calendar_name="Work",
+        title="Quarterly business review with the regional sales teams and partners",
+        start=datetime(2025, 3, 4, 14, 0),
+        end=datetime(2025, 3, 4, 16, 0),
+        location="Konferenzraum Süd, Gebäude B",
+        description="A long description that is folded over several lines of the ICS file, "
+                    "because it is longer than seventy-five octets: " + "x" * 120,
+    ),
+    CalendarEvent(
+        event_id="G7H8I9",
+        calendar_name="Personal",
+        title="Urlaub – Österreich 🏔",
+        start=date(2025, 3, 10),
+        end=date(2025, 3, 15),
+        all_day=True,
+    ),
+    CalendarEvent(
+        event_id="J0K1L2",
+        calendar_name="",
+        title="Call; notes, follow-up",
+        start=datetime(2025, 3, 31, 23, 30),
+        end=datetime(2025, 4, 1, 0, 15),
+        url="https://example.com/meeting",
+    ),
+]
+
+
+def reference_ics(generator: ICSGenerator, events, include_details: bool, title_length_limit: int) -> bytes:
+    """Serialize the events the pre-streaming way, as one Calendar tree."""
+    cal = Calendar()
+    cal.add('prodid', '-//macOS Calendar Exporter//mac-calendar-exporter//EN')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('method', 'PUBLISH')
+    cal.add('x-wr-calname', CALENDAR_NAME)
+    cal.add('x-wr-timezone', 'Europe/Berlin')
+    cal.add_component(generator._create_timezone_component())
+    for event_data in events:
+        event = generator._create_event_from_dict(event_data, include_details, title_length_limit)
+        if event:
+            cal.add_component(event)
+    return cal.to_ical()
+
+
+@pytest.mark.parametrize("title_length_limit", [0, 36])
+@pytest.mark.parametrize("include_details", [False, True])
+def test_write_ics_matches_calendar_to_ical(include_details, title_length_limit):
+    generator = ICSGenerator()
+    stream = io.BytesIO()
+
+    count = generator.write_ics(stream, iter(EVENTS), CALENDAR_NAME, include_details, title_length_limit)
+
+    assert count == len(EVENTS)
+    assert stream.getvalue() == reference_ics(generator, EVENTS, include_details, title_length_limit)
+
+
+@pytest.mark.parametrize("title_length_limit", [0, 36])
+def test_write_ics_with_render_cache_matches_calendar_to_ical(tmp_path, title_length_limit):
+    generator = ICSGenerator()
+    expected = reference_ics(generator, EVENTS, True, title_length_limit)
+    settings = {'include_details': True, 'title_length_limit': title_length_limit}
+    cache_file = str(tmp_path / "calendar.ics.cache")
+
+    # Cold cache renders every event, the reloaded cache renders none
+    for expected_misses in (len(EVENTS), 0):
+        cache = VEventCache(cache_file, settings=settings)
+        stream = io.BytesIO()
+        generator.write_ics(stream, EVENTS, CALENDAR_NAME, True, title_length_limit, cache)
+        cache.save()
+
+        assert cache.misses == expected_misses
+        assert stream.getvalue() == expected
+
+
+def test_write_ics_accepts_event_dictionaries():
+    generator = ICSGenerator()
+    stream = io.BytesIO()
+
+    generator.write_ics(stream, [event.to_dict() for event in EVENTS], CALENDAR_NAME, True, 36)
+
+    assert stream.getvalue() == reference_ics(generator, EVENTS, True, 36)
+
+
+def test_generate_ics_writes_the_streamed_document(tmp_path):
+    generator = ICSGenerator()
+    output_file = tmp_path / "calendar.ics"
+
+    generator.generate_ics(EVENTS, CALENDAR_NAME, str(output_file), include_details=True, title_length_limit=36)
+
+    assert output_file.read_bytes() == reference_ics(generator, EVENTS, True, 36)
+    assert generator.last_event_count == len(EVENTS)
+    assert not (tmp_path / "calendar.ics.tmp").exists()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for the seeded synthetic calendar used for scale testing.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from mac_calendar_exporter.calendar.mock_calendar import SyntheticCalendar
+
+START = datetime(2025, 3, 1)
+
+
+def titles(calendar: SyntheticCalendar, limit: int = 200):
+    return [event.title for event in calendar.events(START, limit=limit)]
+
+
+def test_same_seed_gives_the_same_events():
+    assert titles(SyntheticCalendar(seed=7)) == titles(SyntheticCalendar(seed=7))
+    assert titles(SyntheticCalendar(seed=7)) != titles(SyntheticCalendar(seed=8))
+
+
+def test_long_titles_longer_than_the_default_text():
+    calendar = SyntheticCalendar(seed=1, long_title_ratio=1.0, recurring_ratio=0, long_title_length=100_000)
+
+    assert {len(title) for title in titles(calendar, limit=5)} == {100_000}
+
+
+def test_negative_long_title_length_is_rejected():
+    with pytest.raises(ValueError, match="long_title_length"):
+        SyntheticCalendar(long_title_length=-1)
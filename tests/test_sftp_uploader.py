@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for atomic SFTP uploads against the local SFTP server stand-in.
+
+A published file is written to a temporary name and renamed over the target,
+so readers only ever see a complete old or new file, and a failed upload
+leaves neither a partial target nor its temporary file behind.
+"""
+
+import os
+import threading
+
+import paramiko
+import pytest
+
+from mac_calendar_exporter.sftp.sftp_uploader import SFTPUploader
+
+# Large enough to take many write requests
+FILE_SIZE = 2 * 1024 * 1024
+
+
+@pytest.fixture
+def uploader(sftp_server):
+    uploader = SFTPUploader(sftp_server.host, sftp_server.port, username="test", password="test",
+                            request_size=16384)
+    assert uploader.connect()
+    yield uploader
+    uploader.disconnect()
+
+
+@pytest.fixture
+def versions(tmp_path):
+    """Two local files of the same size and different content."""
+    paths = []
+    for name, fill in (("a.ics", b"A"), ("b.ics", b"B")):
+        path = tmp_path / name
+        path.write_bytes(fill * FILE_SIZE)
+        paths.append(str(path))
+    return paths
+
+
+def remote_files(server):
+    return sorted(os.listdir(server.root))
+
+
+class FailingFile:
+    """Remote file wrapper whose writes fail once a number of bytes went through."""
+
+    def __init__(self, remote_file, fail_after: int, on_failure=None):
+        self._file = remote_file
+        self._written = 0
+        self._fail_after = fail_after
+        self._on_failure = on_failure
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+    def write(self, data):
+        if self._written + len(data) > self._fail_after:
+            if self._on_failure:
+                self._on_failure()
+            raise IOError("Simulated failure halfway through the upload")
+        self._written += len(data)
+        return self._file.write(data)
+
+
+def fail_writes(uploader, monkeypatch, on_failure=None):
+    """Make every file the uploader opens fail halfway through being written."""
+    sftp_open = uploader._sftp.open
+    monkeypatch.setattr(uploader._sftp, "open",
+                        lambda path, mode="r", *args: FailingFile(sftp_open(path, mode, *args), FILE_SIZE // 2,
+                                                                  on_failure))
+
+
+def test_target_is_never_partially_written(uploader, sftp_server, versions, monkeypatch):
+    target = os.path.join(sftp_server.root, "calendar.ics")
+    assert uploader.upload_file(versions[0], "/calendar.ics", skip_unchanged=False)
+
+    opened = []
+    sftp_open = uploader._sftp.open
+
+    def record_open(path, mode="r", *args):
+        opened.append(path)
+        return sftp_open(path, mode, *args)
+
+    monkeypatch.setattr(uploader._sftp, "open", record_open)
+
+    complete = {b"A" * FILE_SIZE, b"B" * FILE_SIZE}
+    torn_reads = []
+    reads = 0
+    stopped = threading.Event()
+
+    def read_target():
+        nonlocal reads
+        while not stopped.is_set():
+            with open(target, "rb") as f:
+                content = f.read()
+            reads += 1
+            if content not in complete:
+                torn_reads.append(len(content))
+
+    reader = threading.Thread(target=read_target)
+    reader.start()
+    try:
+        for i in range(6):
+            assert uploader.upload_file(versions[i % 2 == 0], "/calendar.ics", skip_unchanged=False)
+    finally:
+        stopped.set()
+        reader.join()
+
+    assert reads > 0
+    assert torn_reads == []
+    assert "/calendar.ics" not in opened
+    assert all(path.startswith("/.calendar.ics.") and path.endswith(".tmp") for path in opened)
+    assert remote_files(sftp_server) == ["calendar.ics"]
+
+
+def test_failed_upload_removes_the_temporary_file(uploader, sftp_server, versions, monkeypatch):
+    assert uploader.upload_file(versions[0], "/calendar.ics", skip_unchanged=False)
+    fail_writes(uploader, monkeypatch)
+
+    assert not uploader.upload_file(versions[1], "/calendar.ics", skip_unchanged=False)
+
+    assert "Simulated failure" in uploader.last_error
+    assert remote_files(sftp_server) == ["calendar.ics"]
+    with open(os.path.join(sftp_server.root, "calendar.ics"), "rb") as f:
+        assert f.read() == b"A" * FILE_SIZE
+
+
+@pytest.mark.parametrize("cleanup_error", [paramiko.SSHException("Server connection dropped"), EOFError()])
+def test_cleanup_failure_does_not_hide_the_upload_error(uploader, versions, monkeypatch, cleanup_error):
+    def remove(path):
+        raise cleanup_error
+
+    fail_writes(uploader, monkeypatch)
+    monkeypatch.setattr(uploader._sftp, "remove", remove)
+
+    assert not uploader.upload_file(versions[1], "/calendar.ics", skip_unchanged=False)
+
+    assert "Simulated failure" in uploader.last_error
+
+
+def test_rename_fallback_without_posix_rename(uploader, sftp_server, versions, monkeypatch):
+    def posix_rename(oldpath, newpath):
+        raise IOError("Operation unsupported")
+
+    monkeypatch.setattr(uploader._sftp, "posix_rename", posix_rename)
+
+    # First upload renames onto a free name, the second has to remove the old target
+    for version, fill in ((versions[0], b"A"), (versions[1], b"B")):
+        assert uploader.upload_file(version, "/calendar.ics", skip_unchanged=False)
+
+        assert remote_files(sftp_server) == ["calendar.ics"]
+        with open(os.path.join(sftp_server.root, "calendar.ics"), "rb") as f:
+            assert f.read() == fill * FILE_SIZE